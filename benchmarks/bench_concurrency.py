@@ -0,0 +1,94 @@
+"""Eşzamanlı ödünç alma/iade verimi: iş parçacığı sayısına göre saniyedeki işlem
+ve işlem başına gecikmenin p50/p99 değerleri.
+
+Her iş parçacığı kendi kitaplarını ödünç alıp iade eder; değişiklikler günlüğe
+group commit ile yazılır. Tek bir genel kilit olsaydı verim iş parçacığı sayısıyla
+artmaz, fsync'ler sıraya girerdi. --write-behind verilirse değişiklikler arka
+planda yazılır (Library(write_behind=...)); gecikmeye fsync girmez.
+
+Kullanım:
+    python -m benchmarks.bench_concurrency --threads 1 4 16
+    python -m benchmarks.bench_concurrency --threads 16 --write-behind 50
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Member
+
+from .synthetic import make_books
+
+BOOKS_PER_THREAD = 4
+
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def measure(threads: int, ops_per_thread: int, write_behind: float = None) -> dict:
+    """`threads` iş parçacığıyla saniyedeki ödünç alma + iade işlemi sayısı ve
+    işlem gecikmesinin yüzdelikleri (ms). Süreye son flush() dahildir."""
+    latencies = []
+    with tempfile.TemporaryDirectory() as tmp:
+        library = Library(name="Eşzamanlılık", data_file=os.path.join(tmp, "library.json"),
+                          journal=True, group_commit_window=0, write_behind=write_behind)
+        books = list(make_books(threads * BOOKS_PER_THREAD))
+        with library.batch():
+            for book in books:
+                library.add_book(book)
+            for member_id in range(threads):
+                library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+
+        def worker(member_id: int):
+            own = books[member_id * BOOKS_PER_THREAD:(member_id + 1) * BOOKS_PER_THREAD]
+            timings = []
+            for i in range(ops_per_thread // 2):
+                isbn = own[i % len(own)].isbn
+                start = time.perf_counter()
+                library.borrow_book(member_id=member_id, book_isbn=isbn)
+                middle = time.perf_counter()
+                library.return_book(member_id=member_id, book_isbn=isbn)
+                timings += [middle - start, time.perf_counter() - middle]
+            latencies.extend(timings)
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        library.flush()
+        elapsed = time.perf_counter() - start
+        library.close()
+    return {"ops_per_second": threads * ops_per_thread / elapsed,
+            "p50_ms": percentile(latencies, 0.5) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3}
+
+
+def run(thread_counts, ops_per_thread: int, write_behind: float = None) -> dict:
+    results = {"benchmark": "concurrent_loans", "ops_per_thread": ops_per_thread,
+               "write_behind_ms": None if write_behind is None else write_behind * 1e3}
+    for threads in thread_counts:
+        for name, value in measure(threads, ops_per_thread, write_behind).items():
+            results[f"{name}_{threads}_threads"] = round(value, 3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=400, help="İş parçacığı başına işlem")
+    parser.add_argument("--write-behind", type=float, metavar="MS",
+                        help="Değişiklikleri arka planda en geç bu sürede yaz")
+    args = parser.parse_args()
+    write_behind = None if args.write_behind is None else args.write_behind / 1000
+    print(json.dumps(run(args.threads, args.ops, write_behind), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
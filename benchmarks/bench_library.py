@@ -0,0 +1,202 @@
+"""Library işlemleri ve API liste uç noktaları için ölçek benchmark'ı.
+
+Her boyut için o kadar kitap ve üyeden oluşan sentetik bir katalog yazılır ve
+şunlar ölçülür: yükleme (_load_data), tam kaydetme (_save_data), find_book,
+find_member, add_book, borrow_book + return_book ve TestClient üzerinden liste
+uç noktaları. Her ölçüm ısınma turlarından sonra birkaç kez tekrarlanır ve
+medyanı alınır; tekrarlar arasındaki göreli yayılım (MAD / medyan) da "noise"
+altında yazılır. Sonuçlar JSON olarak yazılır; --baseline verilirse her ölçüm
+kayıtlı temel değerle karşılaştırılır ve eşiği aşan gerileme varsa çıkış kodu 1
+olur. Eşik, iki taraftan gürültülü olanın yayılımı kadar genişletilir; tek bir
+şanssız ölçüm gerileme sayılmaz.
+
+Kullanım:
+    python -m benchmarks.bench_library --sizes 1000 100000 1000000 --output sonuc.json
+    python -m benchmarks.bench_library --baseline benchmarks/baseline.json
+    python -m benchmarks.bench_library --sizes 1000 100000 --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Tuple
+
+from fastapi.testclient import TestClient
+
+from kutuphane_yonetim.api.main import app, get_library
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book
+from kutuphane_yonetim.core.storage import JSONStorage
+
+from .bench_startup import write_catalogue
+
+DEFAULT_SIZES = [1_000, 100_000]
+# Arama ölçümlerinde rastgele seçilen anahtar sayısı
+LOOKUPS = 10_000
+# Yazma ölçümlerinde (her biri günlüğe fsync'li bir kayıt) işlem sayısı
+WRITES = 200
+API_REQUESTS = 50
+REPEAT = 7
+WARMUP = 1
+# Baz değerden bu orandan fazla yavaşlama gerileme sayılır (0.25 = %25).
+DEFAULT_THRESHOLD = 0.25
+# Eşiğe, iki taraftan gürültülü olanın göreli yayılımının bu katı eklenir.
+NOISE_FACTOR = 3
+
+
+def measure(function: Callable[[], object], repeat: int = REPEAT, warmup: int = WARMUP) -> Tuple[float, float]:
+    """function()'ı önce `warmup` kez ölçmeden, sonra `repeat` kez ölçerek çalıştırır.
+
+    Medyan süreyi (sn) ve tekrarların medyana göre göreli yayılımını (medyan
+    mutlak sapma / medyan) döndürür. En kısa süre yerine medyan, tek bir
+    şanslı veya şanssız turun sonucu belirlemesini önler.
+    """
+    for _ in range(warmup):
+        function()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    spread = statistics.median(abs(t - median) for t in times) / median if median else 0.0
+    return median, spread
+
+
+def open_library(path: str, **storage_options) -> Library:
+    return Library(name="Benchmark", storage=JSONStorage(path, journal=True, **storage_options))
+
+
+def measure_size(n: int, tmp: str) -> dict:
+    """n kitap ve n üyelik katalog üzerindeki ölçümler (süreler ms/µs cinsinden)
+    ve her ölçümün göreli yayılımı: (ölçümler, yayılımlar)."""
+    path = os.path.join(tmp, f"library_{n}.json")
+    write_catalogue(path, n, members=n)
+    results, noise = {}, {}
+    rng = random.Random(n)
+    # Milyonluk katalogda yükleme ve kaydetme saniyeler sürer; tek tur yeterlidir.
+    slow_repeat, slow_warmup = (1, 0) if n >= 1_000_000 else (3, 1)
+
+    def record(name: str, function, scale: float, **options):
+        median, spread = measure(function, **options)
+        results[name], noise[name] = median * scale, spread
+
+    # Library'nin print çıktıları ölçümleri ve sonuç çıktısını bozmasın.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        record("load_json_ms", lambda: open_library(path, binary_snapshot=False), 1e3,
+               repeat=slow_repeat, warmup=slow_warmup)
+        open_library(path)  # ikili anlık görüntüyü oluşturur
+        record("load_ms", lambda: open_library(path), 1e3, repeat=slow_repeat, warmup=slow_warmup)
+        library = open_library(path)
+        record("save_ms", library._save_data, 1e3, repeat=slow_repeat, warmup=slow_warmup)
+
+        isbns = rng.sample(list(library._books), min(LOOKUPS, n))
+        member_ids = rng.sample(list(library._members), min(LOOKUPS, n))
+        record("find_book_us", lambda: [library.find_book(isbn=isbn) for isbn in isbns], 1e6 / len(isbns))
+        record("find_member_us", lambda: [library.find_member(i) for i in member_ids], 1e6 / len(member_ids))
+
+        new_isbns = iter(range(9790000000000, 9800000000000))
+
+        def add_books():
+            for _ in range(WRITES):
+                library.add_book(Book(title="Yeni Kitap", author="Benchmark", isbn=str(next(new_isbns)),
+                                      publication_year=2024))
+
+        record("add_book_us", add_books, 1e6 / WRITES)
+
+        loans = list(zip(rng.sample(list(library._members), WRITES), rng.sample(isbns, WRITES)))
+
+        def borrow_and_return():
+            for member_id, isbn in loans:
+                library.borrow_book(member_id=member_id, book_isbn=isbn)
+                library.return_book(member_id=member_id, book_isbn=isbn)
+
+        record("borrow_return_us", borrow_and_return, 1e6 / WRITES)
+
+        app.dependency_overrides[get_library] = lambda: library
+        try:
+            client = TestClient(app)
+            middle = sorted(isbns)[len(isbns) // 2]
+            for name, url in [("api_list_books_ms", "/books/?limit=100"),
+                              ("api_list_books_cursor_ms", f"/books/?limit=100&cursor={middle}"),
+                              ("api_list_members_ms", "/members/?limit=100"),
+                              ("api_member_summary_ms", "/members/summary?limit=100")]:
+                assert client.get(url).status_code == 200
+                record(name, lambda: [client.get(url) for _ in range(API_REQUESTS)], 1e3 / API_REQUESTS)
+        finally:
+            app.dependency_overrides.clear()
+        library.close()
+    return ({name: round(value, 3) for name, value in results.items()},
+            {name: round(value, 3) for name, value in noise.items()})
+
+
+def run(sizes) -> dict:
+    results = {"benchmark": "library", "python": platform.python_version(), "repeat": REPEAT,
+               "sizes": {}, "noise": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            results["sizes"][str(n)], results["noise"][str(n)] = measure_size(n, tmp)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            noise_factor: float = NOISE_FACTOR) -> list:
+    """Baz değere göre izin verilen orandan fazla yavaşlayan ölçümleri
+    (boyut, ölçüm, baz, şimdiki) dörtlüleri olarak döndürür.
+
+    İzin verilen oran `threshold` artı iki taraftan büyük olan göreli yayılımın
+    `noise_factor` katıdır; yayılımı kaydedilmemiş (eski) baz değerlerde 0
+    sayılır. Tüm ölçümlerde küçük değer daha iyidir; yalnızca iki tarafta da
+    bulunanlar karşılaştırılır.
+    """
+    regressions = []
+    for size, metrics in results["sizes"].items():
+        for name, value in metrics.items():
+            base = baseline.get("sizes", {}).get(size, {}).get(name)
+            spread = max(results.get("noise", {}).get(size, {}).get(name, 0),
+                         baseline.get("noise", {}).get(size, {}).get(name, 0))
+            if base and value > base * (1 + threshold + noise_factor * spread):
+                regressions.append((size, name, base, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak baz sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="İzin verilen yavaşlama oranı (varsayılan 0.25)")
+    parser.add_argument("--noise-factor", type=float, default=NOISE_FACTOR,
+                        help="Eşiğe eklenen göreli yayılım katı (varsayılan 3)")
+    parser.add_argument("--save-baseline", help="Sonuçları yeni baz değer olarak bu dosyaya yaz")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    print(text)
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.noise_factor)
+        for size, name, base, value in regressions:
+            print(f"GERİLEME: {size} / {name}: {base} -> {value} (+{(value / base - 1) * 100:.0f}%)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Kitap başına bellek kullanımı: varsayılan sözlük katalog ile kompakt katalog.
+
+Kullanım:
+    python -m benchmarks.bench_memory --books 100000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from kutuphane_yonetim.core.compact import CompactCatalogue
+
+from .synthetic import make_books
+
+
+def measure(store, n: int) -> float:
+    """Boş `store` içine n kitap ekler ve kitap başına ayrılan baytı döndürür."""
+    gc.collect()
+    tracemalloc.start()
+    for book in make_books(n):
+        store[book.isbn] = book
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / n
+
+
+def run(n: int) -> dict:
+    dict_bytes = measure({}, n)
+    compact_bytes = measure(CompactCatalogue(), n)
+    return {
+        "benchmark": "memory_per_book",
+        "books": n,
+        "dict_bytes_per_book": round(dict_bytes, 1),
+        "compact_bytes_per_book": round(compact_bytes, 1),
+        "reduction": round(1 - compact_bytes / dict_bytes, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.books), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
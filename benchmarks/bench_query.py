@@ -0,0 +1,74 @@
+"""Filtreli kitap sorguları: ISBN sırasıyla tam tarama ve ikincil indeksli plan.
+
+Her sorgu hem iter_books() taramasıyla hem query() ile çalıştırılır; sonuçların
+aynı olduğu doğrulanır ve sorgu başına süreler ile seçilen plan raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_query --books 100000
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from itertools import islice
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import BookStatus
+from kutuphane_yonetim.core.storage import JSONStorage
+
+from .bench_startup import write_catalogue
+
+REPEAT = 20
+
+QUERIES = {
+    "author": dict(author="Yazar 42"),
+    "author_audiobook_years": dict(author="Yazar 42", book_type="audiobook", year_from=1930, year_to=1960),
+    "audiobook_years": dict(status=BookStatus.AVAILABLE, book_type="audiobook", year_from=1950, year_to=1980),
+    "borrowed": dict(status=BookStatus.BORROWED),
+    "available_first_page": dict(status=BookStatus.AVAILABLE, limit=100),
+}
+
+
+def per_query_ms(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(books: int, repeat: int) -> dict:
+    results = {"benchmark": "query", "books": books}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.json")
+        write_catalogue(path, books, members=100)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            library = Library(name="Sorgu", storage=JSONStorage(path, journal=True))
+            for i, isbn in enumerate(islice(library._books, 0, books, max(1, books // 500))):
+                library.borrow_book(member_id=i % 100 + 1, book_isbn=isbn)
+        library.query()  # indeksleri kur
+        for name, query in QUERIES.items():
+            filters = {key: value for key, value in query.items() if key != "limit"}
+            limit = query.get("limit")
+            scanned = list(islice(library.iter_books(**filters), limit))
+            assert library.query(limit=limit, **filters) == scanned
+            scan_ms = per_query_ms(lambda: list(islice(library.iter_books(**filters), limit)), repeat)
+            query_ms = per_query_ms(lambda: library.query(limit=limit, **filters), repeat)
+            results[name] = {"matches": len(scanned), "plan": library.explain(limit=limit, **filters).index,
+                             "scan_ms": round(scan_ms, 3), "query_ms": round(query_ms, 3),
+                             "speedup": round(scan_ms / query_ms, 1)}
+        library.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args()
+    print(json.dumps(run(args.books, args.repeat), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
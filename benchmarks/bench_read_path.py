@@ -0,0 +1,82 @@
+"""Okuma yolu verimi: yanıt önbelleği kapalıyken ve açıkken saniyedeki istek.
+
+n kitaplık (varsayılan 100k) sentetik bir katalog üzerinde liste ve kitap uç
+noktalarına ASGI üzerinden (ağ ve iş parçacığı köprüsü olmadan) art arda istek
+gönderilir. Önbellek kapalıyken her istek sayfayı okuyup gövdeyi yeniden
+kodlar; açıkken ilk istekten sonra gövde hazır baytlardan verilir.
+
+Kullanım:
+    python -m benchmarks.bench_read_path --books 100000
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from kutuphane_yonetim.api import main as api
+from kutuphane_yonetim.api.response_cache import ResponseCache, orjson
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.storage import JSONStorage
+
+from .bench_startup import write_catalogue
+
+REQUESTS = 500
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, count: int) -> float:
+    assert (await client.get(url)).status_code == 200
+    start = time.perf_counter()
+    for _ in range(count):
+        await client.get(url)
+    return count / (time.perf_counter() - start)
+
+
+async def measure(library: Library, count: int) -> dict:
+    middle = sorted(library._books)[len(library._books) // 2]
+    urls = {"list_books_100": "/books/?limit=100",
+            "list_books_1000": "/books/?limit=1000",
+            "list_members_100": "/members/?limit=100",
+            "get_book": f"/books/{middle}"}
+    results = {}
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode, max_bytes in [("uncached", 0), ("cached", 64 * 1024 * 1024)]:
+            api._response_caches[library] = ResponseCache(max_bytes=max_bytes)
+            for name, url in urls.items():
+                results[f"{name}_{mode}_rps"] = round(await requests_per_second(client, url, count), 1)
+    for name in urls:
+        results[f"{name}_speedup"] = round(results[f"{name}_cached_rps"] / results[f"{name}_uncached_rps"], 2)
+    return results
+
+
+def run(books: int, count: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.json")
+        write_catalogue(path, books, members=books)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            library = Library(name="Okuma", storage=JSONStorage(path, journal=True))
+        api.app.dependency_overrides[api.get_library] = lambda: library
+        try:
+            results = asyncio.run(measure(library, count))
+        finally:
+            api.app.dependency_overrides.clear()
+            api._response_caches.pop(library, None)
+            library.close()
+    return {"benchmark": "read_path", "books": books, "encoder": "orjson" if orjson else "json", **results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=REQUESTS)
+    args = parser.parse_args()
+    print(json.dumps(run(args.books, args.requests), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Parçalı depolama: işçi sayısına göre açılış süresi ve tek değişiklikte yazma.
+
+Sentetik bir library.json yazılır ve `admin reshard` ile parçalara bölünür.
+Açılış, tek dosyalı JSON'dan (ikili anlık görüntü kapalı) ve parçalı dizinden
+her işçi sayısı için ölçülür; paralel okuma yalnızca o kadar çekirdek varsa
+hızlanır (`cpu_count` sonuçta yazılır). Ardından journal kapalıyken tek bir
+ödünç işleminin yazdığı bayt ve süre iki düzende karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.bench_sharded --books 1000000 --shards 16 --workers 1 2 4 8
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import tempfile
+import time
+
+from kutuphane_yonetim.admin import reshard
+from kutuphane_yonetim.core import metrics
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.sharded import ShardedStorage
+from kutuphane_yonetim.core.storage import JSONStorage
+
+from .bench_startup import write_catalogue
+
+
+def timed_open(storage, compact: bool):
+    gc.collect()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        library = Library(name="Parçalı", storage=storage, compact=compact)
+    return library, time.perf_counter() - start
+
+
+def borrow_cost(library: Library, label: str) -> dict:
+    """Tek bir ödünç işleminin süresi ve depolamanın yazdığı bayt."""
+    isbn = next(iter(library._books))
+    before = metrics.BYTES_WRITTEN.value(label)
+    start = time.perf_counter()
+    library.borrow_book(member_id=1, book_isbn=isbn)
+    return {"seconds": round(time.perf_counter() - start, 3),
+            "bytes": int(metrics.BYTES_WRITTEN.value(label) - before)}
+
+
+def run(books: int, shards: int, workers: list, compact: bool) -> dict:
+    results = {"benchmark": "sharded", "books": books, "shards": shards, "compact": compact,
+               "cpu_count": os.cpu_count()}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "library.json")
+        shard_dir = os.path.join(tmp, "library.shards")
+        write_catalogue(json_file, books, members=100)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            reshard(json_file, shard_dir, shards)
+
+        library, results["json_load_seconds"] = timed_open(JSONStorage(json_file, binary_snapshot=False), compact)
+        results["json_borrow"] = borrow_cost(library, "json")
+        library.close()
+        for count in workers:
+            library, seconds = timed_open(ShardedStorage(shard_dir, workers=count), compact)
+            results[f"sharded_load_seconds_{count}_workers"] = round(seconds, 3)
+            library.close()
+        library, _ = timed_open(ShardedStorage(shard_dir, workers=1), compact)
+        results["sharded_borrow"] = borrow_cost(library, "shards")
+        library.close()
+    results["json_load_seconds"] = round(results["json_load_seconds"], 3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dict", action="store_true", help="Kompakt katalog yerine model sözlüğü kullan")
+    args = parser.parse_args()
+    print(json.dumps(run(args.books, args.shards, args.workers, compact=not args.dict), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Açılış süresi: JSON dosyasından ve ikili anlık görüntüden Library oluşturma.
+
+Kullanım:
+    python -m benchmarks.bench_startup --books 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.storage import JSONStorage, book_to_dict
+
+from .synthetic import make_books
+
+
+def write_catalogue(path: str, n: int, members: int):
+    """n kitaplık bir library.json dosyasını Library'ye yüklemeden, akış halinde yazar."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"books": [')
+        isbns = []
+        for i, book in enumerate(make_books(n)):
+            if i:
+                f.write(",")
+            f.write(json.dumps(book_to_dict(book), ensure_ascii=False))
+            isbns.append(book.isbn)
+        f.write('], "members": ')
+        json.dump([{"name": f"Üye {i}", "member_id": i, "borrowed_isbns": []}
+                   for i in range(1, members + 1)], f, ensure_ascii=False)
+        # Her kitap API'den tek tek eklenmiş gibi kendi sürümünü taşır.
+        f.write(', "versions": ')
+        json.dump({"version": n + members, "book": {isbn: i + 1 for i, isbn in enumerate(isbns)},
+                   "member": {str(i): n + i for i in range(1, members + 1)}, "deleted_book": {}}, f)
+        f.write("}")
+
+
+def time_startup(path: str, binary_snapshot: bool, compact: bool) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    library = Library(name="Açılış", storage=JSONStorage(path, binary_snapshot=binary_snapshot), compact=compact)
+    elapsed = time.perf_counter() - start
+    assert library.total_books > 0
+    del library
+    return elapsed
+
+
+def run(n: int, members: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.json")
+        write_catalogue(path, n, members)
+        results = {"benchmark": "startup", "books": n, "members": members}
+        results["json_seconds"] = round(time_startup(path, binary_snapshot=False, compact=False), 3)
+        # İlk açılış JSON'u okur ve ikili anlık görüntüyü yazar.
+        results["json_and_write_snapshot_seconds"] = round(time_startup(path, binary_snapshot=True, compact=True), 3)
+        results["snapshot_seconds"] = round(time_startup(path, binary_snapshot=True, compact=False), 3)
+        results["snapshot_compact_seconds"] = round(time_startup(path, binary_snapshot=True, compact=True), 3)
+        results["snapshot_bytes"] = os.path.getsize(path + ".snap")
+        results["json_bytes"] = os.path.getsize(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--members", type=int, default=1_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.books, args.members), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
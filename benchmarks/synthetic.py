@@ -0,0 +1,33 @@
+"""Benchmark'lar için tekrarlanabilir sentetik katalog üretimi."""
+import random
+from typing import Iterator, Union
+
+from kutuphane_yonetim.core.models import AudioBook, Book, EBook, Member
+
+# Gerçek kataloglardaki gibi yazar sayısı kitap sayısından çok daha azdır.
+AUTHORS = 5_000
+
+
+def make_book(i: int, rng: random.Random = None) -> Union[Book, EBook, AudioBook]:
+    """i. sentetik kitabı oluşturur; her 10 kitaptan biri e-kitap, biri sesli kitaptır."""
+    rng = rng or random.Random(i)
+    # Dizgeler her kitap için yeniden oluşturulur (JSON'dan okunmuş gibi ayrı nesneler).
+    fields = dict(title=f"Kitap {i} {rng.choice(['Cilt', 'Baskı', 'Seri'])}",
+                  author=f"Yazar {i % AUTHORS}", isbn=str(9780000000000 + i),
+                  publication_year=1900 + i % 125)
+    if i % 10 == 1:
+        return EBook(file_format=rng.choice(["EPUB", "PDF"]), **fields)
+    if i % 10 == 2:
+        return AudioBook(duration_in_minutes=60 + i % 600, **fields)
+    return Book(**fields)
+
+
+def make_books(n: int, seed: int = 0) -> Iterator[Union[Book, EBook, AudioBook]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        yield make_book(i, rng)
+
+
+def make_members(n: int) -> Iterator[Member]:
+    for i in range(1, n + 1):
+        yield Member(name=f"Üye {i}", member_id=i)
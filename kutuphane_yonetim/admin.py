@@ -0,0 +1,76 @@
+"""Kütüphane verileri için bakım komutları.
+
+Kullanım:
+    python -m kutuphane_yonetim.admin migrate-sqlite data/library.json data/library.db
+    python -m kutuphane_yonetim.admin reshard data/library.json data/library.shards --shards 16
+"""
+import argparse
+import os
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.sharded import MANIFEST, ShardedStorage
+from kutuphane_yonetim.core.storage import JSONStorage, SQLiteStorage
+
+
+def migrate_json_to_sqlite(json_file: str, sqlite_file: str) -> Library:
+    """Mevcut bir JSON veri dosyasını (varsa günlüğüyle birlikte) SQLite veritabanına aktarır."""
+    source = Library(name="Kaynak", storage=JSONStorage(json_file, journal=True))
+    target = SQLiteStorage(sqlite_file)
+    try:
+        target.save_all(source)
+    finally:
+        target.close()
+        source.storage.close()
+    return source
+
+
+def reshard(source: str, target: str, shards: int) -> Library:
+    """Bir JSON veri dosyasını (veya parçalı bir dizini) `shards` parçalı bir dizine
+    yazar. Kaynak ve hedef aynı dizinse yerinde yeniden bölünür; yeni manifest
+    yazılana kadar eski parçalar geçerli kalır."""
+    in_place = os.path.isdir(source) and os.path.abspath(source) == os.path.abspath(target)
+    if not in_place and os.path.exists(os.path.join(target, MANIFEST)):
+        raise ValueError(f"Hedef dizinde zaten parçalı veri var: {target}")
+    if os.path.isdir(source):
+        storage = ShardedStorage(source, journal=True)
+    else:
+        storage = JSONStorage(source, journal=True)
+    library = Library(name="Kaynak", storage=storage)
+    try:
+        if in_place:
+            storage.reshard(library, shards)
+        else:
+            target_storage = ShardedStorage(target, shards=shards)
+            try:
+                target_storage.save_all(library)
+            finally:
+                target_storage.close()
+    finally:
+        storage.close()
+    return library
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kütüphane veri bakım komutları")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate-sqlite", help="JSON veri dosyasını SQLite veritabanına aktarır")
+    migrate.add_argument("json_file")
+    migrate.add_argument("sqlite_file")
+
+    split = commands.add_parser("reshard", help="JSON dosyasını veya parçalı dizini yeniden parçalara böler")
+    split.add_argument("source", help="library.json dosyası veya parçalı dizin")
+    split.add_argument("target", help="Parçalı dizin (kaynakla aynıysa yerinde)")
+    split.add_argument("--shards", type=int, default=16)
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate-sqlite":
+        library = migrate_json_to_sqlite(args.json_file, args.sqlite_file)
+        print(f"{library.total_books} kitap ve {len(library._members)} üye '{args.sqlite_file}' dosyasına aktarıldı.")
+    elif args.command == "reshard":
+        library = reshard(args.source, args.target, args.shards)
+        print(f"{library.total_books} kitap {args.shards} parçaya bölünerek '{args.target}' dizinine yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""HTTP koşullu GET: ETag/Last-Modified başlıkları ve 304 Not Modified yanıtları.
+
+ETag'ler kütüphane sürümünden (library.version) veya kitabın kendi sürümünden
+(library.book_version) ve bellekteki durumun neslinden (library.state_token)
+türetilir. Sürümler her değişiklikte artar ve hiç geri dönmez; ancak batch()
+geri alındığında ya da veri dışarıdan değiştirilip yeniden yüklendiğinde
+sürüm aynı kalırken veri değişebilir. Nesil tam da bu durumlarda arttığından
+ETag'e eklenir. Nesil süreç başınadır: paylaşımlı modda başka bir işçiye düşen
+istemci 304 yerine 200 alabilir, ama hiçbir zaman bayat bir kopya için 304
+almaz. İstemcinin kopyasının güncel olup olmadığı yalnızca bu numaralarla
+anlaşılır; 304 yanıtı için veri okunmaz ve gövde serileştirilmez.
+
+Last-Modified kütüphanenin son değişiklik zamanıdır (saniye çözünürlüklü ve
+süreç başına). If-None-Match varsa If-Modified-Since'e bakılmaz (RFC 9110).
+"""
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """Parçaları tırnak içinde birleştiren güçlü bir ETag, ör. "books-1-42"."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def collection_validators(library, name: str) -> Tuple[str, float]:
+    """Bir liste yanıtının ETag'i (nesil ve kütüphane sürümü) ve Last-Modified zamanı.
+
+    Zaman sürümden, sürüm de veriden önce okunmalıdır: arada bir değişiklik
+    olursa doğrulayıcılar gövdeden yalnızca eski kalır ve istemci bir sonraki
+    istekte veriyi yeniden alır; hiçbir zaman güncelmiş gibi görünmez.
+    """
+    last_modified = library.last_modified
+    generation, version = library.state_token
+    return make_etag(name, generation, version), last_modified
+
+
+def book_validators(library, isbn: str) -> Tuple[str, float]:
+    """Tek bir kitabın ETag'i (nesil ve kitabın sürümü) ve Last-Modified zamanı."""
+    last_modified = library.last_modified
+    generation = library.state_token[0]
+    return make_etag("book", generation, library.book_version(isbn)), last_modified
+
+
+def validator_headers(etag: str, last_modified: float) -> dict:
+    """ETag ve Last-Modified başlıkları. `no-cache`, istemci ve ara önbelleklerin
+    kopyayı her kullanımdan önce yeniden doğrulamasını ister."""
+    return {"ETag": etag, "Last-Modified": formatdate(last_modified, usegmt=True), "Cache-Control": "no-cache"}
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # GET için zayıf karşılaştırma: W/ öneki yok sayılır.
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+def not_modified(request: Request, etag: str, last_modified: float) -> Optional[Response]:
+    """İstemcinin kopyası güncelse gövdesiz bir 304 yanıtı, değilse None döndürür."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+    if not fresh:
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
@@ -1,43 +1,263 @@
 import stat
-from fastapi import FastAPI, HTTPException, status, Depends
-from typing import List
+import logging
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, status, Depends, Request, Response, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
 
 
 from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.sharded import ShardedStorage
+from kutuphane_yonetim.core.storage import JSONStorage, SQLiteStorage
+from kutuphane_yonetim.core.importer import BookImporter, StreamParser, SUPPORTED_FORMATS
+from kutuphane_yonetim.core.openlibrary import create_http_client
+from kutuphane_yonetim.core.cache import DiskCache, MetadataCache
+from kutuphane_yonetim.core.export import gzip_chunks, iter_ndjson
+from kutuphane_yonetim.core import slowlog
+from kutuphane_yonetim.core.metrics import REGISTRY
 from kutuphane_yonetim.core.models import Member, Book, BookStatus
 from enum import Enum
 
+from .conditional import book_validators, collection_validators, not_modified, validator_headers
+from .metrics import MetricsMiddleware, update_library_gauges
+from .profiling import InstrumentedRoute, ProfilingMiddleware, SlowRequestMiddleware, run_profiled
+from .response_cache import BOOK_FIELDS, ResponseCache, book_row, member_row, member_summary_row
 from .schemas import *
 
 
+DATA_FILE = os.environ.get("KUTUPHANE_DATA_FILE", "data/library.json")
+USE_JOURNAL = os.environ.get("KUTUPHANE_JOURNAL", "0") == "1"
+# "json" (varsayılan), "sqlite" veya "sharded" (KUTUPHANE_DATA_FILE bir dizindir)
+STORAGE = os.environ.get("KUTUPHANE_STORAGE", "json")
+# Yeni bir parçalı dizindeki kitap parçası sayısı; var olan dizin kendi sayısıyla açılır.
+SHARDS = int(os.environ.get("KUTUPHANE_SHARDS", "16"))
+# "1" ise JSON veri dosyası birden çok süreç (ör. `uvicorn --workers N`) tarafından
+# paylaşılır: yazmalar dosya kilidiyle sıraya girer, her işçi diğerlerinin kayıtlarını uygular.
+SHARED_DATA = os.environ.get("KUTUPHANE_SHARED", "0") == "1"
+# "1" ise kitaplar bellekte sütunlu kompakt katalogda tutulur (büyük kataloglarda daha az bellek).
+COMPACT_CATALOGUE = os.environ.get("KUTUPHANE_COMPACT", "0") == "1"
+# Eşzamanlı değişikliklerin ortak bir yazmada toplanması için beklenecek süre (ms).
+# 0 iken de bir yazma sürerken gelen istekler bir sonraki yazmayı paylaşır.
+GROUP_COMMIT_WINDOW = float(os.environ.get("KUTUPHANE_GROUP_COMMIT_MS", "0")) / 1000
+# Verilirse değişiklikler yanıt verilmeden önce değil, arka planda en geç bu süre (ms) sonra
+# veya KUTUPHANE_WRITE_BEHIND_MAX değişiklik birikince yazılır (group commit yerine).
+WRITE_BEHIND_MS = os.environ.get("KUTUPHANE_WRITE_BEHIND_MS")
+WRITE_BEHIND_MAX = int(os.environ.get("KUTUPHANE_WRITE_BEHIND_MAX", "1000"))
+# Open Library önbelleği. Dosya verilmezse veri dosyasının yanında tutulur; "" ise yalnızca bellek.
+OL_CACHE_FILE = os.environ.get("KUTUPHANE_OL_CACHE_FILE")
+OL_CACHE_SIZE = int(os.environ.get("KUTUPHANE_OL_CACHE_SIZE", "4096"))
+OL_CACHE_TTL = float(os.environ.get("KUTUPHANE_OL_CACHE_TTL", str(7 * 24 * 3600)))
+OL_NEGATIVE_TTL = float(os.environ.get("KUTUPHANE_OL_NEGATIVE_TTL", "600"))
+# "0" ise istek süreleri ölçülmez ve /metrics uç noktası 404 döndürür.
+METRICS_ENABLED = os.environ.get("KUTUPHANE_METRICS", "1") == "1"
+# Bu süreyi (ms) aşan istekler ve Library çağrıları aşama dökümüyle loglanır; verilmezse kapalı.
+SLOW_MS = os.environ.get("KUTUPHANE_SLOW_MS")
+# Verilirse seçilen istekler cProfile ile profillenir ve .prof dosyaları bu dizine yazılır.
+PROFILE_DIR = os.environ.get("KUTUPHANE_PROFILE_DIR")
+# Profillenecek isteklerin oranı (0-1) ve virgülle ayrılmış yol önekleri (boşsa tümü).
+PROFILE_RATE = float(os.environ.get("KUTUPHANE_PROFILE_RATE", "1"))
+PROFILE_PATHS = [path for path in os.environ.get("KUTUPHANE_PROFILE_PATHS", "").split(",") if path]
+# Verilirse (ör. INFO) Library'nin işlem logları bu düzeyden itibaren yazılır.
+LOG_LEVEL = os.environ.get("KUTUPHANE_LOG_LEVEL")
+# Serileştirilmiş liste/kitap yanıtları önbelleğinin üst sınırı (MB); 0 ise önbelleğe alınmaz.
+RESPONSE_CACHE_MB = float(os.environ.get("KUTUPHANE_RESPONSE_CACHE_MB", "64"))
+
+# Liste uç noktalarında sayfa boyutu
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Sonraki sayfanın imlecini taşıyan yanıt başlığı
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_library_init_lock = threading.Lock()
+# Library nesnesi başına bir yanıt önbelleği; doğrulayıcılar o nesnenin durumuna bağlıdır.
+_response_caches: "weakref.WeakKeyDictionary[Library, ResponseCache]" = weakref.WeakKeyDictionary()
+_response_cache_lock = threading.Lock()
+
+
+def _create_metadata_cache() -> MetadataCache:
+    cache_file = OL_CACHE_FILE
+    if cache_file is None:
+        cache_file = os.path.join(os.path.dirname(DATA_FILE), "openlibrary_cache.sqlite")
+    disk = DiskCache(cache_file) if cache_file else None
+    return MetadataCache(max_size=OL_CACHE_SIZE, ttl=OL_CACHE_TTL, negative_ttl=OL_NEGATIVE_TTL, disk=disk)
+
+
+def _create_library(http_client=None, metadata_cache=None) -> Library:
+    if STORAGE == "sqlite":
+        storage = SQLiteStorage(DATA_FILE)
+    elif STORAGE == "sharded":
+        storage = ShardedStorage(DATA_FILE, shards=SHARDS, journal=USE_JOURNAL)
+    else:
+        storage = JSONStorage(DATA_FILE, journal=USE_JOURNAL, shared=SHARED_DATA)
+    write_behind = float(WRITE_BEHIND_MS) / 1000 if WRITE_BEHIND_MS is not None else None
+    return Library(name="API Kütüphanesi", storage=storage,
+                   group_commit_window=GROUP_COMMIT_WINDOW, http_client=http_client,
+                   metadata_cache=metadata_cache, compact=COMPACT_CATALOGUE,
+                   write_behind=write_behind, write_behind_max=WRITE_BEHIND_MAX)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama boyunca yaşayan tek bir Library, Open Library için bağlantı havuzlu
+    tek bir HTTP istemcisi ve iki katmanlı bir sonuç önbelleği oluşturur; kapanışta
+    veriyi diske yazar ve bunları kapatır. Arka planda yazma açıksa kapanış, bekleyen
+    tüm değişiklikler kalıcı olana kadar bekler."""
+    http_client = create_http_client()
+    metadata_cache = _create_metadata_cache()
+    app.state.library = _create_library(http_client=http_client, metadata_cache=metadata_cache)
+    yield
+    library = app.state.library
+    del app.state.library
+    await run_in_threadpool(library.close)
+    await http_client.aclose()
+    metadata_cache.close()
+
+
 app = FastAPI(
     title="Kütüphane Yönetim Sistemi API",
-    description="Kitapları ve üyeleri yönetmek için kullanılan API."
+    description="Kitapları ve üyeleri yönetmek için kullanılan API.",
+    lifespan=lifespan
     )
+if LOG_LEVEL:
+    logging.basicConfig(level=LOG_LEVEL.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+if SLOW_MS is not None:
+    slowlog.configure(float(SLOW_MS) / 1000)
+# Rota sınıfı endpoint'ler tanımlanmadan önce ayarlanmalıdır.
+if PROFILE_DIR or slowlog.enabled():
+    app.router.route_class = InstrumentedRoute
+if slowlog.enabled():
+    app.add_middleware(SlowRequestMiddleware)
+if PROFILE_DIR:
+    app.add_middleware(ProfilingMiddleware, directory=PROFILE_DIR, rate=PROFILE_RATE, paths=PROFILE_PATHS)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+def get_library(request: Request):
+    """Süreç boyunca paylaşılan Library nesnesini bir bağımlılık olarak sağlar.
+    Veri dosyası dışarıdan değiştirildiyse yalnızca o zaman yeniden yüklenir."""
+    library = getattr(request.app.state, "library", None)
+    if library is None:
+        # lifespan çalıştırılmadan kullanıldığında (ör. context manager'sız TestClient)
+        with _library_init_lock:
+            library = getattr(request.app.state, "library", None)
+            if library is None:
+                library = request.app.state.library = _create_library()
+    run_profiled(library.reload_if_changed)
+    return library
+
 
-def get_library():
-    """Library nesnesini bir bağımlılık olarak sağlar."""
-    return Library(name="API Kütüphanesi", data_file="data/library.json")
+def response_cache(library: Library) -> ResponseCache:
+    """Library'nin yanıt önbelleği; yoksa oluşturulur."""
+    cache = _response_caches.get(library)
+    if cache is None:
+        with _response_cache_lock:
+            cache = _response_caches.get(library)
+            if cache is None:
+                cache = _response_caches[library] = ResponseCache(max_bytes=int(RESPONSE_CACHE_MB * 1024 * 1024))
+    return cache
 
 
 @app.get("/")
 def read_root():
     return {"message": "Kütüphane API'sine hoş geldiniz!"}
 
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    """`fields=title,isbn` parametresini doğrular; geçersiz alan varsa 400 döndürür."""
+    if fields is None:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - set(BookResponse.model_fields)
+    if not selected or unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Geçersiz alan(lar): {', '.join(sorted(unknown)) or fields}. "
+                                   f"Geçerli alanlar: {', '.join(BookResponse.model_fields)}")
+    return selected
+
 @app.get("/books/", response_model=List[BookResponse], tags=["Books"])
-def list_all_books(library: Library = Depends(get_library)):
-    """Kütüphanedeki tüm kitapların bir listesini döndürür."""
-    return library._books
+def list_all_books(request: Request,
+                   limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                   cursor: Optional[str] = Query(None, description=f"Önceki yanıtın {NEXT_CURSOR_HEADER} başlığı"),
+                   book_status: Optional[BookStatus] = Query(None, alias="status"),
+                   author: Optional[str] = None,
+                   year_from: Optional[int] = None,
+                   year_to: Optional[int] = None,
+                   book_type: Optional[Literal["book", "ebook", "audiobook"]] = None,
+                   fields: Optional[str] = Query(None, description="Virgülle ayrılmış alanlar, ör. title,isbn"),
+                   library: Library = Depends(get_library)):
+    """Kitapları ISBN sırasıyla sayfa sayfa döndürür.
+
+    Sonraki sayfa varsa imleci X-Next-Cursor başlığında gelir; `cursor` parametresiyle
+    istenir. Durum, yazar, yıl aralığı ve tür filtreleri sunucuda uygulanır; `fields`
+    verilirse yalnızca istenen alanlar döndürülür. ETag kütüphane sürümüdür;
+    If-None-Match güncelse 304 döner. Gövde kütüphane değişene kadar önbellekten verilir.
+    """
+    selected = _parse_fields(fields)
+    columns = BOOK_FIELDS if selected is None else tuple(name for name in BOOK_FIELDS if name in selected)
+    etag, last_modified = collection_validators(library, "books")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
+    def build():
+        books, next_cursor = library.page_books(limit=limit, after=cursor, status=book_status, author=author,
+                                                year_from=year_from, year_to=year_to, book_type=book_type)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+        return [book_row(book, columns) for book in books], headers
+
+    key = ("books", limit, cursor, book_status, author, year_from, year_to, book_type, columns)
+    return response_cache(library).respond(key, library.state_token, build,
+                                           headers=validator_headers(etag, last_modified))
+
+@app.get("/books/search", response_model=List[BookResponse], tags=["Books"])
+def search_books(request: Request,
+                 q: str = Query(..., min_length=1, description="Başlık/yazar kelimeleri; önek eşleşmesi desteklenir."),
+                 limit: int = Query(20, ge=1, le=100),
+                 library: Library = Depends(get_library)):
+    """Başlık ve yazarda tam metin araması yapar; sonuçlar ilgiye göre sıralıdır."""
+    etag, last_modified = collection_validators(library, "books")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return response_cache(library).respond(
+        ("search", q, limit), library.state_token,
+        lambda: ([book_row(book) for book in library.search(q, limit=limit)], {}),
+        headers=validator_headers(etag, last_modified))
+
+def _book_response(library: Library, book, etag: str, last_modified: float) -> Response:
+    """Tek kitap yanıtı; gövde yalnızca o kitap değişince yeniden üretilir."""
+    validator = (library.state_token[0], library.book_version(book.isbn))
+    return response_cache(library).respond(("book", book.isbn), validator, lambda: (book_row(book), {}),
+                                           headers=validator_headers(etag, last_modified))
 
 @app.get("/books/{isbn}", response_model=BookResponse, tags=["Books"])
-def get_book_by_isbn(isbn: str, library: Library = Depends(get_library)):
-    """Verilen ISBN'e sahip tek bir kitabı döndürür ve kütüphaneye ekler."""
+def get_book_by_isbn(isbn: str, request: Request, library: Library = Depends(get_library)):
+    """Verilen ISBN'e sahip tek bir kitabı döndürür. ETag kitabın kendi sürümüdür;
+    başka kitaplardaki değişiklikler onu geçersiz kılmaz."""
+    etag, last_modified = book_validators(library, isbn)
     book = library.find_book(isbn=isbn)
 
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bu ISBN ile bir kitap bulunamadı.")
-    
-    return book
+
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return _book_response(library, book, etag, last_modified)
+
+@app.get("/books/{isbn}/borrower", response_model=MemberSummaryResponse, tags=["Books"])
+def get_book_borrower(isbn: str, library: Library = Depends(get_library)):
+    """Kitabı şu anda ödünç almış üyeyi döndürür."""
+    if not library.find_book(isbn=isbn):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bu ISBN ile bir kitap bulunamadı.")
+    member = library.current_borrower(isbn)
+    if member is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bu kitap şu anda ödünçte değil.")
+    return MemberSummaryResponse(member_id=member.member_id, name=member.name,
+                                 loan_count=len(member.borrowed_books))
 
 @app.post("/books/add-manually/", response_model=BookResponse, status_code=status.HTTP_201_CREATED, tags=["Books"])
 def add_book_manually(book_request: CreateBookRequest, library: Library = Depends(get_library)):
@@ -52,6 +272,66 @@ def add_book_manually(book_request: CreateBookRequest, library: Library = Depend
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
+_IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+@app.post("/books/bulk", response_model=BulkImportResponse, tags=["Books"])
+async def bulk_import_books(request: Request,
+                            fmt: Optional[str] = Query(None, alias="format", description="csv veya jsonl"),
+                            chunk_size: int = Query(1000, gt=0, le=50000),
+                            library: Library = Depends(get_library)):
+    """
+    İstek gövdesinde akış halinde gönderilen CSV veya JSON Lines kitapları toplu olarak ekler.
+    Format `format` parametresinden ya da Content-Type başlığından belirlenir.
+    Gövde parça parça okunur; her `chunk_size` satır doğrulanıp tek seferde kaydedilir.
+    """
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        fmt = _IMPORT_CONTENT_TYPES.get(content_type)
+    if fmt not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Gövde CSV (text/csv) veya JSON Lines (application/x-ndjson) olmalıdır.")
+
+    parser = StreamParser(fmt)
+    importer = BookImporter(library, chunk_size=chunk_size)
+    pending = []
+    async for data in request.stream():
+        pending.extend(parser.feed(data))
+        if len(pending) >= chunk_size:
+            await run_in_threadpool(importer.feed, pending)
+            pending = []
+    pending.extend(parser.close())
+    if pending:
+        await run_in_threadpool(importer.feed, pending)
+
+    report = importer.report
+    return BulkImportResponse(
+        total_rows=report.total_rows,
+        imported=report.imported,
+        failed=report.failed,
+        elapsed_seconds=report.elapsed_seconds,
+        rows_per_second=report.rows_per_second,
+        errors=report.errors,
+    )
+
+@app.post("/books/add-from-api/batch", response_model=List[ApiImportResultResponse], tags=["Books"])
+async def add_new_books_from_api(batch_request: BulkApiImportRequest, library: Library = Depends(get_library)):
+    """
+    Verilen ISBN listesini Open Library'den eşzamanlı olarak çeker ve başarılı olanları
+    tek seferde kaydeder. Her ISBN için ayrı bir sonuç döndürür.
+    """
+    results = await library.add_books_from_api(batch_request.isbns, concurrency=batch_request.concurrency)
+    return [
+        ApiImportResultResponse(isbn=result.isbn, status=result.status, detail=result.detail,
+                                book=result.book.model_dump() if result.book else None)
+        for result in results
+    ]
+
 @app.post("/books/add-from-api/{isbn}", response_model=BookResponse, status_code=status.HTTP_201_CREATED, tags=["Books"])
 async def add_new_book_from_api(isbn:str, library: Library = Depends(get_library)):
     """Verilen ISBN ile Open Library'den bir kitap bulur ve kütüphaneye ekler."""
@@ -76,21 +356,53 @@ def delete_existing_book(isbn: str, library: Library = Depends(get_library)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     
 
-@app.get("books/search/{isbn}", response_model=BookResponse, tags=["Books"])
-def get_book_by_isbn(isbn: str, library: Library = Depends(get_library)):
+@app.get("/books/search/{isbn}", response_model=BookResponse, tags=["Books"])
+def search_book_by_isbn(isbn: str, request: Request, library: Library = Depends(get_library)):
     """Verilen ISBN'e sahip tek bir kitap döndürür."""
+    etag, last_modified = book_validators(library, isbn)
     book = library.find_book(isbn=isbn)
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"ISBN {isbn} ile kitap bulunamadı.")
 
-    return book    
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return _book_response(library, book, etag, last_modified)
 
 #üye endpointleri
 
+def _members_page(library: Library, limit: int, cursor: Optional[int], row):
+    members, next_cursor = library.page_members(limit=limit, after=cursor)
+    headers = {NEXT_CURSOR_HEADER: str(next_cursor)} if next_cursor is not None else {}
+    return [row(member) for member in members], headers
+
 @app.get("/members/", response_model=List[MemberResponse], tags=["Members"])
-def list_all_members(library: Library = Depends(get_library)):
-    """Kütüphanedeki tüm üyelerin bir listesini döndürür."""
-    return library._members
+def list_all_members(request: Request,
+                     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                     cursor: Optional[int] = Query(None, description=f"Önceki yanıtın {NEXT_CURSOR_HEADER} başlığı"),
+                     library: Library = Depends(get_library)):
+    """Üyeleri ödünç aldıkları kitaplarla birlikte, member_id sırasıyla sayfa sayfa döndürür."""
+    etag, last_modified = collection_validators(library, "members")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return response_cache(library).respond(("members", limit, cursor), library.state_token,
+                                           lambda: _members_page(library, limit, cursor, member_row),
+                                           headers=validator_headers(etag, last_modified))
+
+@app.get("/members/summary", response_model=List[MemberSummaryResponse], tags=["Members"])
+def list_member_summaries(request: Request,
+                          limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                          cursor: Optional[int] = Query(None, description=f"Önceki yanıtın {NEXT_CURSOR_HEADER} başlığı"),
+                          library: Library = Depends(get_library)):
+    """Üyeleri kitap ayrıntıları olmadan, yalnızca ödünç sayılarıyla döndürür."""
+    etag, last_modified = collection_validators(library, "members")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return response_cache(library).respond(("members_summary", limit, cursor), library.state_token,
+                                           lambda: _members_page(library, limit, cursor, member_summary_row),
+                                           headers=validator_headers(etag, last_modified))
 
 @app.post("/members/", response_model=MemberResponse, status_code=status.HTTP_201_CREATED, tags=["Members"])
 def register_new_member(member_request: CreateMemberRequest, library: Library = Depends(get_library)):
@@ -129,4 +441,64 @@ def return_a_book(request: ReturnBookRequest, library: Library = Depends(get_lib
         return {"message": "Kitap başarıyla iade edildi."}
     
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+#dışa aktarım endpointleri
+
+@app.get("/export/{kind}.ndjson", tags=["Export"])
+def export_ndjson(kind: ExportKind,
+                  since: Optional[int] = Query(None, ge=0, description="Yalnızca bu sürümden sonra değişen kayıtlar"),
+                  gzip: bool = Query(False, description="Gövdeyi gzip ile sıkıştırır (Content-Encoding: gzip)"),
+                  library: Library = Depends(get_library)):
+    """Kitapları, üyeleri veya ödünçleri satır başına bir JSON kaydı olarak akış halinde döndürür.
+
+    Yanıt belleğe alınmadan üretilir. X-Export-Version başlığındaki değer, bir sonraki
+    artımlı aktarımda `since` olarak verilmelidir.
+    """
+    headers = {"X-Export-Version": str(library.version)}
+    body = iter_ndjson(library.iter_export(kind.value, since=since))
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+#istatistik endpointi
+
+@app.get("/stats", response_model=StatsResponse, tags=["Stats"])
+def library_stats(request: Request, response: Response,
+                  top: int = Query(10, ge=1, le=100, description="Listelenecek yazar ve üye sayısı"),
+                  library: Library = Depends(get_library)):
+    """Durum, tür ve yayın yılına göre kitap sayıları, en çok kitabı olan yazarlar
+    ve ödünç sayıları. Sayaçlar Library'de artımlı tutulduğundan katalog boyutundan
+    bağımsızdır; ETag kütüphane sürümüdür."""
+    etag, last_modified = collection_validators(library, "stats")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    response.headers.update(validator_headers(etag, last_modified))
+    return library.stats(top=top)
+
+#önbellek endpointleri
+
+@app.get("/cache/openlibrary", tags=["Cache"])
+def open_library_cache_stats(library: Library = Depends(get_library)):
+    """Open Library önbelleğinin isabet/ıska/atılma sayaçlarını döndürür."""
+    cache = library.open_library.cache
+    return cache.stats() if cache is not None else {}
+
+@app.get("/cache/responses", tags=["Cache"])
+def response_cache_stats(library: Library = Depends(get_library)):
+    """Serileştirilmiş yanıt önbelleğinin boyutunu ve isabet/ıska sayaçlarını döndürür."""
+    return response_cache(library).stats()
+
+#ölçüm endpointi
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Metrics"])
+def metrics(library: Library = Depends(get_library)):
+    """İstek süreleri, Library işlem süreleri, kaydedilen baytlar, katalog/üye/ödünç
+    sayıları ve önbellek isabet oranları; Prometheus metin biçiminde."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ölçümler kapalı.")
+    update_library_gauges(library, response_cache(library))
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
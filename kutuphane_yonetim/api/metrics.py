@@ -0,0 +1,74 @@
+"""API ölçümleri: rota başına istek süreleri ve kütüphane/önbellek göstergeleri."""
+import time
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.metrics import REGISTRY
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "kutuphane_http_request_seconds", "HTTP isteklerinin rota başına süresi (sn).", ["method", "route", "status"])
+BOOKS = REGISTRY.gauge("kutuphane_books", "Katalogdaki kitap sayısı.")
+MEMBERS = REGISTRY.gauge("kutuphane_members", "Kayıtlı üye sayısı.")
+LOANS = REGISTRY.gauge("kutuphane_loans", "Ödünçteki kitap sayısı.")
+VERSION = REGISTRY.gauge("kutuphane_library_version", "Kütüphanenin son değişiklik sürümü.")
+PENDING_WRITES = REGISTRY.gauge(
+    "kutuphane_pending_writes", "Arka planda yazılmayı bekleyen değişiklik sayısı (write-behind).")
+CACHE_LOOKUPS = REGISTRY.gauge(
+    "kutuphane_cache_lookups", "Önbellek aramaları (süreç başından beri).", ["cache", "result"])
+CACHE_HIT_RATIO = REGISTRY.gauge("kutuphane_cache_hit_ratio", "Önbellek isabet oranı.", ["cache"])
+CACHE_ENTRIES = REGISTRY.gauge("kutuphane_cache_entries", "Önbellekteki kayıt sayısı.", ["cache"])
+
+
+class MetricsMiddleware:
+    """İstek süresini yöntem, rota şablonu (ör. /books/{isbn}) ve durum koduyla kaydeden ASGI ara katmanı.
+
+    Rota, yönlendirme sırasında kapsama (scope) yazılan FastAPI rotasından okunur;
+    böylece ISBN gibi yol parametreleri ayrı seriler oluşturmaz. Eşleşmeyen
+    istekler "other" rotasıyla kaydedilir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"],
+                                    getattr(route, "path", "other"), status_code)
+
+
+def _set_cache_gauges(name: str, hits: int, misses: int, size: int):
+    CACHE_LOOKUPS.set(hits, name, "hit")
+    CACHE_LOOKUPS.set(misses, name, "miss")
+    CACHE_HIT_RATIO.set(hits / (hits + misses) if hits + misses else 0.0, name)
+    CACHE_ENTRIES.set(size, name)
+
+
+def update_library_gauges(library: Library, response_cache=None):
+    """Göstergeleri kütüphanenin, yanıt önbelleğinin ve Open Library önbelleğinin
+    şu anki durumuyla günceller."""
+    BOOKS.set(library.total_books)
+    MEMBERS.set(len(library._members))
+    LOANS.set(len(library._borrowers))
+    VERSION.set(library.version)
+    PENDING_WRITES.set(library.pending_writes)
+    if response_cache is not None:
+        _set_cache_gauges("response", response_cache.hits, response_cache.misses, len(response_cache))
+    cache = library.open_library.cache
+    if cache is None:
+        return
+    for layer, stats in cache.stats().items():
+        _set_cache_gauges(f"openlibrary_{layer}", stats["hits"], stats["misses"], stats["size"])
@@ -0,0 +1,203 @@
+"""İsteğe bağlı istek profillemesi ve yavaş istek günlüğü.
+
+ProfilingMiddleware seçilen istekleri cProfile ile profiller ve sonucu bir
+dizine .prof dosyası olarak yazar (`python -m pstats dosya.prof` veya snakeviz
+ile incelenir). Senkron endpoint'ler ve bağımlılıklar Starlette'in iş parçacığı
+havuzunda çalıştığından cProfile'ın iş parçacığı başına çalışması nedeniyle
+her iş parçacığı bölümü ayrı bir profilde toplanır ve istek bitince birleştirilir.
+Python 3.12 ve sonrasında cProfile sys.monitoring kullanır ve süreçte aynı anda
+tek bir profil etkin olabilir; bu profil tüm iş parçacıklarını kapsadığından
+iş parçacığı bölümleri için ayrı profil başlatılmaz, isteğin profili yeterlidir.
+
+SlowRequestMiddleware her isteği bir slowlog izine bağlar; eşiği aşan istekler
+aşama dökümüyle (reload, borrow, commit, save, openlibrary_fetch...) loglanır.
+"""
+import asyncio
+import cProfile
+import functools
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+
+from fastapi.routing import APIRoute
+
+from kutuphane_yonetim.core import slowlog
+
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar("kutuphane_profile_session", default=None)
+
+
+class ProfileSession:
+    """Bir isteğin profilleri; her iş parçacığı bölümü için bir cProfile.Profile."""
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Yeni bir profil başlatır. Başka bir profil zaten etkinse (Python 3.12+)
+        cProfile ValueError verir; o zaman profillenmez ve None döner."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def dump(self, path: str):
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+
+
+def run_profiled(function, *args, **kwargs):
+    """function'ı çağırır; geçerli istek profilleniyorsa bu iş parçacığındaki
+    çalışmayı isteğin profiline ekler."""
+    session = _session.get()
+    if session is None:
+        return function(*args, **kwargs)
+    profile = session.start()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        if profile is not None:
+            profile.disable()
+
+
+class InstrumentedRoute(APIRoute):
+    """Endpoint çağrısını ayrı bir "endpoint" aşaması olarak ölçen ve senkron
+    endpoint'lerin iş parçacığındaki çalışmasını profile ekleyen rota sınıfı.
+    İstek süresinden bu aşamaya düşmeyen kısım FastAPI'nin doğrulama ve
+    serileştirme süresidir."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        original = endpoint
+        # functools.wraps sayesinde FastAPI parametreleri özgün imzadan okur.
+        if asyncio.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def endpoint(*args, **kwargs):
+                return await _traced_async(original, *args, **kwargs)
+        else:
+            @functools.wraps(original)
+            def endpoint(*args, **kwargs):
+                return _traced(run_profiled, original, *args, **kwargs)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _traced(function, *args, **kwargs):
+    trace = slowlog.current()
+    if trace is None:
+        return function(*args, **kwargs)
+    start, depth = time.perf_counter(), trace.depth
+    trace.depth += 1
+    try:
+        return function(*args, **kwargs)
+    finally:
+        trace.depth = depth
+        trace.add("endpoint", start, time.perf_counter() - start, depth)
+
+
+async def _traced_async(function, *args, **kwargs):
+    trace = slowlog.current()
+    if trace is None:
+        return await function(*args, **kwargs)
+    start, depth = time.perf_counter(), trace.depth
+    trace.depth += 1
+    try:
+        return await function(*args, **kwargs)
+    finally:
+        trace.depth = depth
+        trace.add("endpoint", start, time.perf_counter() - start, depth)
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class SlowRequestMiddleware:
+    """Her HTTP isteği için bir slowlog izi başlatır ve istek bitince eşiği
+    aşmışsa loglatır (bkz. core/slowlog.py)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        trace = slowlog.Trace("request", scope["path"])
+        token = slowlog.begin(trace)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            slowlog.end(token)
+            trace.name = _route_name(scope)
+            trace.finish(status=status_code)
+
+
+class ProfilingMiddleware:
+    """Seçilen istekleri cProfile ile profiller ve `directory` içine yazar.
+
+    `paths` verilirse yalnızca bu öneklerle başlayan yollar, bunların da `rate`
+    oranı (0-1) profillenir. Olay döngüsü iş parçacığında aynı anda tek bir
+    profil çalışabildiğinden, bir istek profillenirken gelen diğer istekler
+    profillenmez; profil süresince olay döngüsünde çalışan başka isteklerin
+    eşzamansız kısımları da profile karışabilir.
+    """
+
+    def __init__(self, app, directory: str, rate: float = 1.0, paths: Iterable[str] = ()):
+        self.app = app
+        self.directory = directory
+        self.rate = rate
+        self.paths = tuple(paths)
+        self._busy = False
+        os.makedirs(directory, exist_ok=True)
+
+    def _selected(self, scope) -> bool:
+        if self._busy:
+            return False
+        if self.paths and not scope["path"].startswith(self.paths):
+            return False
+        return self.rate >= 1 or random.random() < self.rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+        self._busy = True
+        session = ProfileSession()
+        token = _session.set(session)
+        start = time.perf_counter()
+        profile = session.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if profile is not None:
+                profile.disable()
+            _session.reset(token)
+            self._busy = False
+            elapsed_ms = (time.perf_counter() - start) * 1e3
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", _route_name(scope)).strip("_")
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{elapsed_ms:.0f}ms-{uuid.uuid4().hex[:8]}.prof"
+            session.dump(os.path.join(self.directory, name))
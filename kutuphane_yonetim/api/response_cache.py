@@ -0,0 +1,123 @@
+"""Sık okunan liste ve kitap yanıtları için serileştirilmiş gövde önbelleği.
+
+Her kayıt bir anahtar (uç nokta ve sorgu parametreleri), bir doğrulayıcı ve
+hazır JSON baytlarından oluşur. Doğrulayıcı, yanıtın dayandığı durumun
+kimliğidir: listeler için library.state_token, tek kitap için nesil ve kitabın
+sürümü. Library'deki her değişiklik ilgili doğrulayıcıyı değiştirdiğinden kayıt
+tam olarak veri değiştiğinde geçersiz olur; ayrıca silmeye gerek yoktur. Başka
+bir kitabın değişmesi bir kitabın kaydını geçersiz kılmaz.
+
+Gövdeler Pydantic modellerinden geçirilmeden yanıt şemasındaki alanlardan
+doğrudan üretilir ve orjson kuruluysa onunla, değilse standart json ile
+kodlanır; çıktı FastAPI'nin JSONResponse'uyla aynı (boşluksuz, UTF-8) biçimdedir.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Response
+
+from .schemas import BookResponse, MemberSummaryResponse
+
+try:
+    import orjson
+except ImportError:  # isteğe bağlı hızlı kodlayıcı
+    orjson = None
+
+BOOK_FIELDS = tuple(BookResponse.model_fields)
+MEMBER_SUMMARY_FIELDS = tuple(MemberSummaryResponse.model_fields)
+
+
+def dumps(data: Any) -> bytes:
+    """Veriyi JSON baytlarına kodlar (orjson varsa onunla)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def book_row(book, fields: Iterable[str] = BOOK_FIELDS) -> dict:
+    """BookResponse alanları; durum gibi enum değerleri metin olarak kodlanır."""
+    return {name: getattr(book, name) for name in fields}
+
+
+def member_row(member) -> dict:
+    """MemberResponse alanları: ad, member_id ve ödünç alınan kitaplar."""
+    return {"name": member.name, "member_id": member.member_id,
+            "borrowed_books": [book_row(book) for book in member.borrowed_books]}
+
+
+def member_summary_row(member) -> dict:
+    return {"member_id": member.member_id, "name": member.name, "loan_count": len(member.borrowed_books)}
+
+
+class ResponseCache:
+    """Doğrulayıcıyla eşleşen kayıtları döndüren, bayt sınırlı LRU gövde önbelleği.
+
+    Bir kaydın doğrulayıcısı istenenden farklıysa kayıt bayattır: atılır ve ıska
+    sayılır. Toplam gövde boyutu `max_bytes`'ı aşınca en az kullanılanlar atılır.
+    Birden çok iş parçacığından kullanılabilir.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[Hashable, bytes, dict]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, validator: Hashable) -> Optional[Tuple[bytes, dict]]:
+        """Güncel kaydın (gövde, ek başlıklar) ikilisi; yoksa veya bayatsa None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != validator:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, key: Hashable, validator: Hashable, body: bytes, headers: dict = None):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (validator, body, headers or {})
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        self._size -= len(self._data.pop(key)[1])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "bytes": self._size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "encoder": "orjson" if orjson is not None else "json"}
+
+    def respond(self, key: Hashable, validator: Hashable, build: Callable[[], Tuple[Any, dict]],
+                headers: dict = None) -> Response:
+        """Önbellekteki gövdeyle ya da build()'in (veri, ek başlıklar) sonucunu
+        kodlayıp önbelleğe alarak bir JSON yanıtı döndürür. `headers` yanıta
+        eklenir ama saklanmaz (ör. ETag)."""
+        cached = self.get(key, validator)
+        if cached is None:
+            data, extra = build()
+            cached = dumps(data), extra
+            self.set(key, validator, *cached)
+        body, extra = cached
+        return Response(content=body, media_type="application/json", headers={**extra, **(headers or {})})
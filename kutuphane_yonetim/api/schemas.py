@@ -1,11 +1,15 @@
-from pydantic import BaseModel, Field
-from typing import List
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
 
 
 #temel veri modelleri
 
 class BookResponse(BaseModel):
     """API'den bir kitap yanıtı döndürülürken kullanılacak model."""
+    # Kompakt katalogdaki BookView nesneleri de nitelikleri üzerinden okunabilsin.
+    model_config = ConfigDict(from_attributes=True)
+
     title: str
     author: str
     isbn: str
@@ -18,10 +22,70 @@ class MemberResponse(BaseModel):
     member_id: int
     borrowed_books: List[BookResponse] = []
 
+class MemberSummaryResponse(BaseModel):
+    """Üye listesinde kitap ayrıntıları yerine yalnızca ödünç sayısını taşıyan model."""
+    member_id: int
+    name: str
+    loan_count: int
+
 class MessageResponse(BaseModel):
     """Genel başarı veya bilgi mesajları için kullanılacak model."""
     message: str
 
+class ImportErrorResponse(BaseModel):
+    """Toplu içe aktarmada başarısız olan bir satır."""
+    row: int
+    isbn: Optional[str] = None
+    error: str
+
+class BulkImportResponse(BaseModel):
+    """Toplu kitap içe aktarma raporu."""
+    total_rows: int
+    imported: int
+    failed: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[ImportErrorResponse] = []
+
+
+class ApiImportResultResponse(BaseModel):
+    """Open Library'den toplu eklemede tek bir ISBN'in sonucu."""
+    isbn: str
+    status: str = Field(..., description="added, duplicate, not_found veya error")
+    detail: Optional[str] = None
+    book: Optional[BookResponse] = None
+
+
+class AuthorCountResponse(BaseModel):
+    author: str
+    books: int
+
+
+class BorrowerCountResponse(BaseModel):
+    member_id: int
+    loans: int
+
+
+class StatsResponse(BaseModel):
+    """Kütüphane istatistikleri (bkz. Library.stats)."""
+    total_books: int
+    by_status: Dict[str, int] = Field(..., description="Kitap durumu -> kitap sayısı")
+    by_type: Dict[str, int] = Field(..., description="Kitap türü -> kitap sayısı")
+    by_year: Dict[int, int] = Field(..., description="Yayın yılı -> kitap sayısı")
+    top_authors: List[AuthorCountResponse]
+    total_members: int
+    active_loans: int
+    members_with_loans: int
+    loan_histogram: Dict[int, int] = Field(..., description="Ödünç sayısı -> o sayıda ödüncü olan üye sayısı")
+    top_borrowers: List[BorrowerCountResponse]
+
+
+class ExportKind(str, Enum):
+    """GET /export/{kind}.ndjson ile dışa aktarılabilen kayıt türleri."""
+    books = "books"
+    members = "members"
+    loans = "loans"
+
 
 #Giriş Modelleri
 
@@ -47,4 +111,7 @@ class CreateBookRequest(BaseModel):
     isbn: str = Field(..., min_length=10, max_length=13)
     publication_year: int = Field(..., gt=1400)
 
-    
\ No newline at end of file
+class BulkApiImportRequest(BaseModel):
+    """Open Library'den toplu kitap ekleme isteği."""
+    isbns: List[str] = Field(..., min_length=1, max_length=10000)
+    concurrency: int = Field(10, ge=1, le=50, description="Aynı anda gönderilecek en fazla istek sayısı")
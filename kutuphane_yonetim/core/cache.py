@@ -0,0 +1,171 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Süre sınırlı (TTL), en az kullanılanı atan (LRU) ve iş parçacığı güvenli bellek içi önbellek."""
+
+    def __init__(self, max_size: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "max_size": self.max_size, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
+
+
+class DiskCache:
+    """Süreç yeniden başlasa da korunan, SQLite tabanlı JSON değer önbelleği.
+
+    Süresi dolan kayıtlar ve `max_entries` sınırını aşan en eski kayıtlar her
+    `prune_every` yazmada bir temizlenir.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, prune_every: int = 1000,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, stored_at REAL NOT NULL)")
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None):
+        """(değer, kalan_süre) ikilisini veya bulunamazsa default'u döndürür."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, value: Any, ttl: float):
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl, now))
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        removed = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+        removed += self._conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)).rowcount
+        self.evictions += removed
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"size": size, "max_size": self.max_entries, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MetadataCache:
+    """Open Library sonuçları için iki katmanlı önbellek: önde bellek içi LRU/TTL,
+    arkada isteğe bağlı kalıcı disk önbelleği.
+
+    "Bulunamadı" sonuçları da önbelleğe alınır, ancak daha kısa bir süre
+    (`negative_ttl`) için; böylece Open Library'ye sonradan eklenen kitaplar
+    uzun süre gizli kalmaz.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 24 * 3600, negative_ttl: float = 300,
+                 disk: Optional[DiskCache] = None):
+        self.memory = TTLCache(max_size=max_size)
+        self.disk = disk
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def get(self, isbn: str) -> Optional[dict]:
+        value = self.memory.get(isbn, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.disk is None:
+            return None
+        entry = self.disk.get(isbn)
+        if entry is None:
+            return None
+        value, remaining = entry
+        # Disk isabeti belleğe taşınır; kalan süresi korunur.
+        self.memory.set(isbn, value, remaining)
+        return value
+
+    def set(self, isbn: str, value: dict):
+        ttl = self.ttl if value.get("found") else self.negative_ttl
+        self.memory.set(isbn, value, ttl)
+        if self.disk is not None:
+            self.disk.set(isbn, value, ttl)
+
+    def stats(self) -> dict:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    """Aynı anda gelen değişiklikleri tek bir kalıcı yazmada toplar (group commit).
+
+    submit() çağıran ilk iş parçacığı lider olur: `window` saniye kadar bekler,
+    kuyrukta biriken tüm kayıtları tek seferde commit_fn'e verir ve diğerlerini
+    uyandırır. Lider yazarken gelen kayıtlar bir sonraki gruba katılır; böylece
+    window=0 olsa bile eşzamanlı istekler aynı fsync'i paylaşır.
+    submit() yalnızca kendi kayıtları kalıcı olduktan sonra döner.
+    """
+
+    def __init__(self, commit_fn: Callable[[List[dict]], None], window: float = 0.0):
+        self._commit_fn = commit_fn
+        self.window = window
+        self._cond = threading.Condition()
+        self._queue: List[dict] = []
+        self._leader_active = False
+        # Sıradaki grubun numarası ve tamamlanmış grup sayısı
+        self._group_id = 0
+        self._done_id = 0
+        self._errors: Dict[int, BaseException] = {}
+        self.commits = 0
+
+    def submit(self, records: List[dict]):
+        """Kayıtları sıradaki gruba ekler ve grup kalıcı olana kadar bekler."""
+        with self._cond:
+            self._queue.extend(records)
+            my_group = self._group_id
+            while True:
+                if self._done_id > my_group:
+                    error = self._errors.get(my_group)
+                    if error is not None:
+                        raise error
+                    return
+                if not self._leader_active:
+                    self._leader_active = True
+                    break
+                self._cond.wait()
+
+        if self.window:
+            time.sleep(self.window)
+
+        with self._cond:
+            group, self._queue = self._queue, []
+            group_id = self._group_id
+            self._group_id += 1
+
+        error = None
+        try:
+            self._commit_fn(group)
+        except BaseException as e:
+            error = e
+
+        with self._cond:
+            self.commits += 1
+            self._done_id = group_id + 1
+            if error is not None:
+                self._errors[group_id] = error
+            # Eski grupların hatalarını tutmaya gerek yok.
+            for old_id in [i for i in self._errors if i < group_id - 64]:
+                del self._errors[old_id]
+            self._leader_active = False
+            self._cond.notify_all()
+
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """submit() zaten kayıtlar kalıcı olunca döndüğünden bekleyecek bir şey yoktur."""
+
+    def close(self):
+        pass
+
+
+class WriteBehindCommitter:
+    """Değişiklikleri arka planda toplayıp kalıcı hale getiren yazıcı (write-behind).
+
+    submit() kayıtları kuyruğa ekleyip hemen döner; fsync beklenmez. Arka plan
+    iş parçacığı ilk bekleyen kayıttan en geç `delay` saniye sonra veya kuyrukta
+    `max_pending` kayıt birikince hepsini tek seferde commit_fn'e verir.
+    flush() o ana kadar gönderilmiş tüm kayıtlar kalıcı olana kadar bekler.
+
+    Kayıp penceresi: süreç çökerse (veya close() çağrılmadan sonlanırsa) henüz
+    yazılmamış kayıtlar kaybolur. Bunlar en fazla son `delay` saniyenin ve
+    yazılmakta olan grubun kayıtlarıdır; sayıları 2 * `max_pending`'i geçemez,
+    çünkü bu sınıra ulaşıldığında submit() yazmanın yetişmesini bekler.
+
+    Yazma hata verirse kayıtlar kuyruğun başına geri konur ve `retry_interval`
+    saniye sonra yeniden denenir; hata flush()'tan yükseltilir.
+    """
+
+    def __init__(self, commit_fn: Callable[[List[dict]], None], delay: float = 0.05,
+                 max_pending: int = 1000, retry_interval: float = 1.0):
+        self._commit_fn = commit_fn
+        self.delay = delay
+        self.max_pending = max_pending
+        self.retry_interval = retry_interval
+        self._cond = threading.Condition()
+        self._queue: List[dict] = []
+        # Kuyruğun boş olmaktan çıktığı an; yazma en geç bundan `delay` sonra başlar.
+        self._first_at = 0.0
+        # Gönderilen ve kalıcı hale gelen kayıt sayıları (süreç başından beri)
+        self._submitted = 0
+        self._durable = 0
+        self._failures = 0
+        self._error: BaseException = None
+        self._flush_requested = False
+        self._closing = False
+        self.commits = 0
+        self._thread = threading.Thread(target=self._run, name="kutuphane-write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Gönderilmiş ama henüz kalıcı olmamış kayıt sayısı."""
+        return self._submitted - self._durable
+
+    def submit(self, records: List[dict]):
+        """Kayıtları kuyruğa ekler; yazılmamış kayıtlar sınırı aşmadıkça beklemeden döner."""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Arka plan yazıcısı kapatıldı.")
+            if not self._queue:
+                self._first_at = time.monotonic()
+            self._queue.extend(records)
+            self._submitted += len(records)
+            if len(self._queue) >= self.max_pending:
+                self._cond.notify_all()
+            while self.pending >= 2 * self.max_pending and self._thread.is_alive():
+                self._cond.wait()
+
+    def flush(self):
+        """Şu ana kadar gönderilen tüm kayıtlar kalıcı olana kadar bekler.
+        Bu sürede bir yazma hata verirse hatayı yükseltir."""
+        with self._cond:
+            target, failures = self._submitted, self._failures
+            while self._durable < target:
+                if self._failures > failures:
+                    raise self._error
+                if not self._thread.is_alive():
+                    raise RuntimeError("Arka plan yazıcısı çalışmıyor; bekleyen kayıtlar yazılamadı.")
+                self._flush_requested = True
+                self._cond.notify_all()
+                self._cond.wait()
+
+    def close(self):
+        """Bekleyen kayıtları yazar ve arka plan iş parçacığını durdurur."""
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closing = True
+                self._cond.notify_all()
+            self._thread.join()
+
+    def _next_group(self):
+        """Yazılacak sıradaki grubu bekler; kapanışta kuyruk boşsa None döndürür."""
+        with self._cond:
+            while not self._queue:
+                if self._closing:
+                    return None
+                self._cond.wait()
+            deadline = self._first_at + self.delay
+            while not (self._closing or self._flush_requested or len(self._queue) >= self.max_pending):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            group, self._queue = self._queue, []
+            self._flush_requested = False
+            return group
+
+    def _run(self):
+        while True:
+            group = self._next_group()
+            if group is None:
+                return
+            try:
+                self._commit_fn(group)
+            except Exception as e:
+                logger.exception("Arka planda %d kayıt yazılamadı; yeniden denenecek: %s", len(group), e)
+                with self._cond:
+                    self._queue[:0] = group
+                    self._first_at = time.monotonic()
+                    self._failures += 1
+                    self._error = e
+                    self._cond.notify_all()
+                    if self._closing:
+                        return
+                    self._cond.wait(self.retry_interval)
+                continue
+            with self._cond:
+                self._durable += len(group)
+                self._error = None
+                self.commits += 1
+                self._cond.notify_all()
@@ -0,0 +1,266 @@
+import threading
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Union
+
+from .models import AudioBook, Book, BookStatus, EBook
+
+# Durum ve tür kodları; dizilerde birer bayt olarak tutulur.
+STATUSES: List[BookStatus] = list(BookStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+BOOK_TYPES = ("book", "ebook", "audiobook")
+_TYPE_CODES = {book_type: code for code, book_type in enumerate(BOOK_TYPES)}
+# Yayın yılları 4 baytlık işaretli tamsayı olarak tutulur; model yalnızca alt
+# sınır koyduğundan 2 baytlık 'H' 65535'ten büyük yıllarda taşardı.
+YEAR_TYPECODE = "i"
+_MODELS = {"book": Book, "ebook": EBook, "audiobook": AudioBook}
+# Pydantic sınıflarında isinstance yavaştır; tam sınıf eşleşmesi önce sözlükten bakılır.
+_CLASS_TYPES = {model: book_type for book_type, model in _MODELS.items()}
+# "EPUB"/"PDF" gibi az sayıda farklı format değeri tek nesneyi paylaşır.
+_FORMAT_POOL: Dict[str, str] = {}
+_FIELD_NAMES = {model: frozenset(model.model_fields) for model in _MODELS.values()}
+
+
+def _trusted_model(model, fields: dict):
+    """Daha önce doğrulanmış alanlardan doğrulama çalıştırmadan model oluşturur.
+
+    model_construct varsayılanları ve alan kümesini Python'da hesapladığından
+    model_validate'ten bile yavaştır; burada yalnızca Pydantic'in örnek
+    özellikleri doğrudan atanır. `fields` modelin tüm alanlarını içermelidir.
+    """
+    book = model.__new__(model)
+    _set = object.__setattr__
+    _set(book, "__dict__", fields)
+    _set(book, "__pydantic_fields_set__", set(_FIELD_NAMES[model]))
+    _set(book, "__pydantic_extra__", None)
+    _set(book, "__pydantic_private__", None)
+    return book
+
+
+class BookView:
+    """CompactCatalogue'daki bir kitaba `Book` arayüzüyle erişen hafif görünüm.
+
+    Alanlar her erişimde katalogdan okunur; `status` değiştirildiğinde doğrudan
+    katalog güncellenir. Pydantic modeli yalnızca gerektiğinde (API yanıtı,
+    kopyalama, model_dump) `to_model()` ile oluşturulur.
+    """
+
+    __slots__ = ("_catalogue", "isbn")
+
+    def __init__(self, catalogue: "CompactCatalogue", isbn: str):
+        self._catalogue = catalogue
+        self.isbn = isbn
+
+    @property
+    def _row(self) -> int:
+        return self._catalogue._rows[self.isbn]
+
+    @property
+    def title(self) -> str:
+        return self._catalogue._titles[self._row]
+
+    @property
+    def author(self) -> str:
+        return self._catalogue._authors[self._row]
+
+    @property
+    def publication_year(self) -> int:
+        return self._catalogue._years[self._row]
+
+    @property
+    def status(self) -> BookStatus:
+        return STATUSES[self._catalogue._statuses[self._row]]
+
+    @status.setter
+    def status(self, value: BookStatus):
+        code = _STATUS_CODES[BookStatus(value)]
+        with self._catalogue._lock:
+            self._catalogue._statuses[self._row] = code
+
+    @property
+    def book_type(self) -> str:
+        return BOOK_TYPES[self._catalogue._types[self._row]]
+
+    @property
+    def file_format(self) -> Optional[str]:
+        return self._catalogue._file_formats.get(self.isbn)
+
+    @property
+    def duration_in_minutes(self) -> Optional[int]:
+        return self._catalogue._durations.get(self.isbn)
+
+    # Davranış, modeldeki yöntemlerin aynısıdır; görünüm `self` olarak verilir.
+    def borrow_book(self):
+        Book.borrow_book(self)
+
+    def return_book(self):
+        Book.return_book(self)
+
+    def get_base_info(self) -> str:
+        return Book.get_base_info(self)
+
+    def display_info(self) -> str:
+        return _MODELS[self.book_type].display_info(self)
+
+    def to_model(self) -> Union[Book, EBook, AudioBook]:
+        """Görünümün o anki değerleriyle bağımsız bir Pydantic modeli oluşturur
+        (veriler eklenirken doğrulandığı için doğrulama tekrar çalıştırılmaz)."""
+        fields = dict(title=self.title, author=self.author, publication_year=self.publication_year,
+                      isbn=self.isbn, status=self.status)
+        book_type = self.book_type
+        if book_type == "ebook":
+            fields["file_format"] = self.file_format
+        elif book_type == "audiobook":
+            fields["duration_in_minutes"] = self.duration_in_minutes
+        return _trusted_model(_MODELS[book_type], fields)
+
+    def model_dump(self, **kwargs) -> dict:
+        return self.to_model().model_dump(**kwargs)
+
+    def __deepcopy__(self, memo):
+        # dataclasses.asdict() (ör. FastAPI'de Member yanıtı) tüm katalogu
+        # kopyalamak yerine kitabın bağımsız bir modelini alır.
+        return self.to_model()
+
+    def __eq__(self, other):
+        if isinstance(other, BookView):
+            return self._catalogue is other._catalogue and self.isbn == other.isbn
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.isbn)
+
+    def __repr__(self):
+        return f"BookView(isbn={self.isbn!r}, title={self.title!r})"
+
+
+class CompactCatalogue(MutableMapping):
+    """ISBN -> kitap eşlemesini nesne başına değil sütun başına tutan bellek dostu katalog.
+
+    Library(..., compact=True) ile `_books` sözlüğünün yerine kullanılır. Başlıklar
+    bir listede, yazarlar tekilleştirilmiş (interned) dizgeler olarak, yıllar
+    array('i'), durum ve tür kodları array('B') içinde tutulur; e-kitap formatı ve
+    sesli kitap süresi yalnızca ilgili kitaplar için seyrek sözlüklerdedir.
+    Okumalar `BookView` döndürür. Silinen satırın yerine son satır taşınır;
+    yineleme sırası yine de ekleme sırasıdır.
+
+    Yazmalar (ekleme, silme, durum değişikliği) bir kilitle sıralanır; bir satır
+    taşınırken aynı satıra durum yazılamaz. Okumalar kilit almaz: taşınan satırın
+    verisi önce kopyalanır, ISBN -> satır eşlemesi ondan sonra güncellenir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._isbns: List[str] = []
+        self._titles: List[str] = []
+        self._authors: List[str] = []
+        self._author_pool: Optional[Dict[str, str]] = {}
+        self._years = array(YEAR_TYPECODE)
+        self._statuses = array("B")
+        self._types = array("B")
+        self._file_formats: Dict[str, str] = {}
+        self._durations: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __contains__(self, isbn) -> bool:
+        return isbn in self._rows
+
+    def __getitem__(self, isbn: str) -> BookView:
+        if isbn not in self._rows:
+            raise KeyError(isbn)
+        return BookView(self, isbn)
+
+    def __setitem__(self, isbn: str, book: Union[Book, EBook, AudioBook, BookView]):
+        book_type = _CLASS_TYPES.get(type(book))
+        if book_type is None:
+            if isinstance(book, BookView):
+                if book._catalogue is self and book.isbn == isbn:
+                    return
+                book_type = book.book_type
+            else:
+                book_type = ("ebook" if isinstance(book, EBook) else
+                             "audiobook" if isinstance(book, AudioBook) else "book")
+        with self._lock:
+            if self._author_pool is None:
+                self._author_pool = {author: author for author in self._authors}
+            author = self._author_pool.setdefault(book.author, book.author)
+            values = (book.title, author, _year_value(book.publication_year),
+                      _STATUS_CODES[book.status], _TYPE_CODES[book_type])
+            # Buradan sonrası hata vermez; bir sütun eklenip diğeri eksik kalmaz.
+
+            self._file_formats.pop(isbn, None)
+            self._durations.pop(isbn, None)
+            if book_type == "ebook":
+                self._file_formats[isbn] = _FORMAT_POOL.setdefault(book.file_format, book.file_format)
+            elif book_type == "audiobook":
+                self._durations[isbn] = book.duration_in_minutes
+
+            row = self._rows.get(isbn)
+            if row is None:
+                # Satır tamamlandıktan sonra görünür olur.
+                self._isbns.append(isbn)
+                self._titles.append(values[0])
+                self._authors.append(values[1])
+                self._years.append(values[2])
+                self._statuses.append(values[3])
+                self._types.append(values[4])
+                self._rows[isbn] = len(self._isbns) - 1
+            else:
+                (self._titles[row], self._authors[row], self._years[row],
+                 self._statuses[row], self._types[row]) = values
+
+    def __delitem__(self, isbn: str):
+        with self._lock:
+            row = self._rows.pop(isbn)
+            last = len(self._isbns) - 1
+            if row != last:
+                # Son satırı boşalan yere taşı; diziler delik bırakmadan küçülür.
+                moved = self._isbns[last]
+                for column in (self._isbns, self._titles, self._authors, self._years, self._statuses, self._types):
+                    column[row] = column[last]
+                self._rows[moved] = row
+            for column in (self._isbns, self._titles, self._authors, self._years, self._statuses, self._types):
+                del column[last]
+            self._file_formats.pop(isbn, None)
+            self._durations.pop(isbn, None)
+
+    def clear(self):
+        self.__init__()
+
+    def load_columns(self, columns):
+        """Boş kataloğu ikili anlık görüntüdeki sütunlarla (snapshot.BookColumns)
+        doldurur; kitap başına nesne oluşturulmaz."""
+        if self._rows:
+            raise ValueError("Sütunlar yalnızca boş bir kataloğa yüklenebilir.")
+        self._isbns = columns.isbns
+        self._titles = columns.titles
+        self._authors = columns.authors
+        # Yazarlar anlık görüntüde zaten paylaşılan nesneler; havuz ilk eklemede kurulur.
+        self._author_pool = None
+        self._years = columns.years
+        self._statuses = columns.statuses
+        self._types = columns.types
+        self._file_formats = columns.file_formats
+        self._durations = columns.durations
+        self._rows = dict(zip(self._isbns, range(len(self._isbns))))
+
+
+def _year_value(year: int) -> int:
+    """Yılın yıl sütununa sığdığını denetler; sığmıyorsa ValueError."""
+    try:
+        array(YEAR_TYPECODE, (year,))
+    except OverflowError:
+        raise ValueError(f"Yayın yılı {year} kompakt katalogda saklanamaz.") from None
+    return year
+
+
+def detach(book: Union[Book, EBook, AudioBook, BookView]) -> Union[Book, EBook, AudioBook]:
+    """Görünümse bağımsız bir model kopyasını, değilse kitabın kendisini döndürür.
+    Katalogdan silinecek bir kitabı (ör. geri alma için) saklarken kullanılır."""
+    return book.to_model() if isinstance(book, BookView) else book
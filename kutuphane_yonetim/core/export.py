@@ -0,0 +1,30 @@
+import json
+import zlib
+from typing import Iterable, Iterator
+
+# Gzip başlığıyla sıkıştırma (zlib'de 16 + pencere boyutu)
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def iter_ndjson(records: Iterable[dict], lines_per_chunk: int = 1000) -> Iterator[bytes]:
+    """Kayıtları JSON Lines olarak kodlar; her parçada en fazla `lines_per_chunk` satır
+    bulunur. Tek tek satır göndermek yerine parça parça göndermek ağ ve sunucu
+    tarafındaki yazma sayısını azaltırken belleği sınırlı tutar."""
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= lines_per_chunk:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Bayt parçalarını akış halinde gzip ile sıkıştırır."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,190 @@
+from .models import *
+from .storage import book_from_dict
+import codecs
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from pydantic import ValidationError
+from typing import IO, Iterable, Iterator, List, Union
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+BOOK_TYPES = ("book", "ebook", "audiobook")
+
+
+class RowError(Exception):
+    """Ayrıştırılamayan bir içe aktarma satırını temsil eder."""
+
+
+@dataclass
+class ImportReport:
+    """Toplu içe aktarmanın sonucu. Bellek sınırlı kalsın diye en fazla
+    `max_errors` hata ayrıntısı saklanır; `failed` tüm hataları sayar."""
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    max_errors: int = 1000
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total_rows / self.elapsed_seconds
+
+    def add_error(self, row: int, isbn, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "isbn": None if isbn is None else str(isbn), "error": message})
+
+
+def _clean_csv_row(header: List[str], values: List[str]) -> dict:
+    # Boş hücreler hiç verilmemiş sayılır; böylece isteğe bağlı alanlar varsayılanını alır.
+    return {key.strip(): value for key, value in zip(header, values) if value != ""}
+
+
+def read_rows(f: IO[str], fmt: str) -> Iterator[Union[dict, RowError]]:
+    """Açık bir metin dosyasından CSV veya JSON Lines satırlarını akış halinde okur."""
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        for values in reader:
+            if values:
+                yield _clean_csv_row(header, values)
+    elif fmt == "jsonl":
+        for line in f:
+            if line.strip():
+                yield _parse_json_line(line)
+    else:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+
+def _parse_json_line(line: str) -> Union[dict, RowError]:
+    try:
+        row = json.loads(line)
+    except ValueError as e:
+        return RowError(f"Geçersiz JSON: {e}")
+    if not isinstance(row, dict):
+        return RowError("Her satır bir JSON nesnesi olmalıdır.")
+    return row
+
+
+class StreamParser:
+    """Parça parça gelen (ör. HTTP gövdesi) CSV/JSONL baytlarını satırlara çevirir.
+
+    Yalnızca tamamlanmış kayıtlar döndürülür; yarım kalan kısım bir sonraki
+    parçayı bekler. CSV'de tırnak içindeki satır sonları kaydı bölmez.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Desteklenmeyen format: {fmt}")
+        self.fmt = fmt
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._record = ""
+        self._header = None
+
+    def feed(self, data: bytes) -> List[Union[dict, RowError]]:
+        self._buffer += self._decoder.decode(data)
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> List[Union[dict, RowError]]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        lines, self._buffer = [self._buffer], ""
+        rows = self._parse_lines(lines)
+        if self._record:
+            rows.append(RowError("Kapanmamış tırnak içeren yarım CSV kaydı."))
+            self._record = ""
+        return rows
+
+    def _parse_lines(self, lines: List[str]) -> List[Union[dict, RowError]]:
+        rows = []
+        for line in lines:
+            if self.fmt == "jsonl":
+                if line.strip():
+                    rows.append(_parse_json_line(line))
+                continue
+
+            self._record += line + "\n"
+            # Çift sayıda tırnak: kayıt tamamlandı (RFC 4180'de "" kaçış dizisidir).
+            if self._record.count('"') % 2:
+                continue
+            record, self._record = self._record, ""
+            values = next(csv.reader([record]), [])
+            if not values:
+                continue
+            if self._header is None:
+                self._header = values
+            else:
+                rows.append(_clean_csv_row(self._header, values))
+        return rows
+
+
+class BookImporter:
+    """Kitap satırlarını parçalar halinde doğrulayıp Library'ye ekler.
+
+    Her parça tek bir library.batch() içinde, yani tek bir yazmayla kalıcı olur.
+    Aynı nesne birden fazla feed() çağrısında kullanılabilir (akış halinde gelen
+    gövdeler için); satır numaraları ve rapor çağrılar boyunca birikir.
+    """
+
+    def __init__(self, library, chunk_size: int = 1000, max_errors: int = 1000):
+        self.library = library
+        self.chunk_size = chunk_size
+        self.report = ImportReport(max_errors=max_errors)
+        self._started = time.perf_counter()
+
+    def feed(self, rows: Iterable[Union[dict, RowError]]) -> ImportReport:
+        chunk = []
+        for row in rows:
+            self.report.total_rows += 1
+            chunk.append((self.report.total_rows, row))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        self.report.elapsed_seconds = time.perf_counter() - self._started
+        return self.report
+
+    def _import_chunk(self, chunk):
+        books = []
+        seen = set()
+        for row_number, row in chunk:
+            if isinstance(row, RowError):
+                self.report.add_error(row_number, None, str(row))
+                continue
+            isbn = row.get("isbn")
+            if row.get("book_type", "book") not in BOOK_TYPES:
+                self.report.add_error(row_number, isbn, f"Bilinmeyen kitap türü: {row.get('book_type')}")
+                continue
+            try:
+                book = book_from_dict(row)
+            except ValidationError as e:
+                self.report.add_error(row_number, isbn, "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()))
+                continue
+            if book.isbn in seen or book.isbn in self.library._books:
+                self.report.add_error(row_number, book.isbn, f"ISBN {book.isbn} zaten mevcut.")
+                continue
+            if book.status == BookStatus.BORROWED:
+                self.report.add_error(row_number, book.isbn, "Ödünç durumundaki bir kitap içe aktarılamaz.")
+                continue
+            seen.add(book.isbn)
+            books.append((row_number, book))
+
+        with self.library.batch():
+            for row_number, book in books:
+                # Yukarıdaki denetim kilitsizdir; arada aynı ISBN başka bir
+                # istekle eklenmiş olabilir. Yalnızca o satır reddedilir.
+                try:
+                    self.library._insert_book(book)
+                except ValueError as e:
+                    self.report.add_error(row_number, book.isbn, str(e))
+                    continue
+                self.report.imported += 1
@@ -0,0 +1,140 @@
+import json
+import os
+from typing import List, Optional
+
+from .metrics import BYTES_WRITTEN
+
+
+class Journal:
+    """Library değişikliklerini satır başına bir JSON kaydı olarak tutan,
+    yalnızca sonuna ekleme yapılan işlem günlüğü (write-ahead log).
+
+    Her kayda artan bir `seq` numarası verilir. Anlık görüntü (snapshot) dosyası
+    kendisine dahil edilen son `seq` değerini saklar; böylece anlık görüntü
+    yazıldıktan sonra günlük temizlenmeden çökülse bile kayıtlar iki kez uygulanmaz.
+
+    Birden çok süreç aynı günlüğe (dosya kilidi altında) yazabilir; `offset` bu
+    sürecin okuduğu/yazdığı yere kadarki bayt sayısıdır ve read_new() yalnızca
+    ondan sonra eklenen kayıtları okur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.last_seq = 0
+        # Son sıkıştırmadan (compaction) bu yana günlükte biriken kayıt sayısı
+        self.pending = 0
+        self._file = None
+
+    def replay(self, after_seq: int = 0) -> List[dict]:
+        """Günlükteki `seq` değeri after_seq'ten büyük kayıtları sırayla döndürür.
+
+        Yazılırken çökme nedeniyle yarım kalmış son satır onaylanmamış bir
+        işlemdir; atlanır ve sonraki eklemeler bozulmasın diye dosyadan kesilir.
+        """
+        self.close()
+        self.last_seq = max(self.last_seq, after_seq)
+        self.pending = 0
+        records = []
+        valid_end = 0
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return records
+
+        with f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    seq = record["seq"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                valid_end += len(line)
+                self.pending += 1
+                self.last_seq = max(self.last_seq, seq)
+                if seq > after_seq:
+                    records.append(record)
+            size = f.seek(0, os.SEEK_END)
+
+        if size > valid_end:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+                os.fsync(f.fileno())
+        self.offset = valid_end
+        return records
+
+    def _size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def has_new_records(self) -> bool:
+        """Günlüğe bu süreç dışında kayıt eklendiyse ya da günlük boşaltıldıysa True."""
+        return self._size() != self.offset
+
+    def read_new(self) -> Optional[List[dict]]:
+        """Son okumadan/yazmadan sonra (başka bir süreç tarafından) eklenen kayıtları
+        sırayla döndürür. Günlük bu arada boşaltıldıysa (anlık görüntü alındıysa)
+        None döndürür; bu durumda tam yeniden yükleme gerekir."""
+        size = self._size()
+        if size < self.offset:
+            return None
+        if size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        records = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self.offset += len(line)
+            self.pending += 1
+            self.last_seq = max(self.last_seq, record["seq"])
+            records.append(record)
+        return records
+
+    def append(self, record: dict) -> int:
+        """Kaydı günlüğün sonuna ekler ve diske senkronize eder (fsync).
+        Fonksiyon döndüğünde kayıt kalıcıdır. Verilen sıra numarasını döndürür."""
+        return self.append_many([record])
+
+    def append_many(self, records: List[dict]) -> int:
+        """Kayıtları tek bir yazma ve tek bir fsync ile ekler; son sıra numarasını döndürür."""
+        seq = self.last_seq
+        lines = []
+        for record in records:
+            seq += 1
+            lines.append(json.dumps({**record, "seq": seq}, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        payload = "".join(lines).encode('utf-8')
+        self._file.write(payload)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.offset = self._file.tell()
+        self.last_seq = seq
+        self.pending += len(records)
+        BYTES_WRITTEN.inc("journal", amount=len(payload))
+        return seq
+
+    def reset(self):
+        """Anlık görüntü kalıcı olarak yazıldıktan sonra günlüğü boşaltır.
+        Sıra numaraları sıfırlanmaz."""
+        self.close()
+        with open(self.path, 'wb') as f:
+            os.fsync(f.fileno())
+        self.offset = 0
+        self.pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
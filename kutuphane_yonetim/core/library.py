@@ -1,88 +1,536 @@
 from .models import *
-import json
-from typing import List, Union
+from .cache import MetadataCache
+from .committer import GroupCommitter, WriteBehindCommitter
+from .compact import CompactCatalogue, detach
+from .importer import BookImporter, ImportReport
+from .locks import LockStripes, SharedExclusiveLock
+from .metrics import timed
+from .openlibrary import OPEN_LIBRARY_URL, OpenLibraryClient
+from .query import QueryPlan, SecondaryIndexes
+from .search import SearchIndex, fold
+from .snapshot import BookColumns
+from .sortedkeys import SortedKeys
+from .stats import LibraryStats
+from .storage import JSONStorage, StorageBackend, book_from_dict, book_to_dict, book_type_of
+from .versions import VersionTracker
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import asyncio
+import gc
+import heapq
 import httpx
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# iter_export() ile dışa aktarılabilen kayıt türleri
+EXPORT_KINDS = ("books", "members", "loans")
+
+
+@contextmanager
+def _gc_paused():
+    """Döngüsel çöp toplayıcıyı blok boyunca durdurur.
+
+    Açılışta oluşturulan milyonlarca kitap nesnesinin hepsi yaşamaya devam eder;
+    toplayıcı yine de her birkaç yüz bin nesnede bunların hepsini tarar ve
+    açılış süresinin çoğunu bu taramalar alır.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@dataclass
+class _BatchState:
+    """Bir iş parçacığının batch() bloğu: iç içe derinlik, bekleyen kayıtlar, geri
+    alma adımları ve blok bitene kadar tutulan kilit şeritleri."""
+    depth: int = 0
+    records: List[dict] = field(default_factory=list)
+    undo_log: List[Callable[[], None]] = field(default_factory=list)
+    stripes: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class ApiImportResult:
+    """add_books_from_api'de tek bir ISBN'in sonucu.
+    status: "added", "duplicate", "not_found" veya "error"."""
+    isbn: str
+    status: str
+    detail: Optional[str] = None
+    book: Optional[Book] = None
 
-OPEN_LIBRARY_URL = "https://openlibrary.org/search.json?isbn="
 
 class Library:
-    def __init__(self, name, data_file="library.json"):
+    """Kitapları, üyeleri ve ödünç işlemlerini yöneten kütüphane.
+
+    Birden çok iş parçacığından (ör. FastAPI'nin iş parçacığı havuzu) aynı anda
+    kullanılabilir:
+
+    - ISBN/member_id ile aramalar kilit almaz.
+    - Her değişiklik, dokunduğu kitap ve üyenin kilit şeritlerini (LockStripes)
+      değişiklik kalıcı olana kadar tutar. Aynı kitap üzerindeki işlemler sırayla
+      yürür ve günlüğe o sırayla yazılır; farklı kitaplar birbirini beklemez ve
+      group commit ile aynı yazmayı paylaşır.
+    - Depolamaya tek seferde tek bir iş parçacığı yazar (`_write_lock`).
+    - Tam yazmalar (save_all) durumun tutarlı bir kopyasını almak için yalnızca
+      bellekteki kısa değişiklik bölümlerinin bitmesini bekler (`_state_lock`).
+    - Türetilmiş indeksler (başlık, arama, sıralı anahtarlar, ikincil indeksler)
+      `_index_lock` ile korunur.
+
+    batch() blokları iş parçacığına özeldir; bir bloktaki değişiklikler blok
+    bitene kadar kalıcı olmaz ve dokunduğu kilit şeritleri de o zamana kadar
+    tutulur. Aynı anda yalnızca bir batch() bloğu yürür.
+
+    Depolama katmanı paylaşımlıysa (storage.shared, ör. birden çok API işçisi aynı
+    dosyayı kullanıyorsa) her değişiklik ve her batch() bloğu süreçler arası
+    yazma kilidini tutar: önce diğer süreçlerin yazdıkları uygulanır, doğrulama
+    bu güncel durum üzerinde yapılır ve değişiklik kilit bırakılmadan yazılır.
+    Böylece iki işçinin aynı kitabı ödünç vermesi gibi çakışmalar ValueError ile
+    reddedilir, sessizce kaybolmaz.
+
+    write_behind (saniye) verilirse değişiklikler kalıcı olmasını beklemeden döner;
+    arka planda en geç bu süre sonra veya `write_behind_max` değişiklik birikince
+    toplu yazılır (bkz. WriteBehindCommitter). flush() ve close() bekleyen tüm
+    değişiklikler kalıcı olana kadar bekler. Süreç çökerse son yazmadan sonraki
+    değişiklikler kaybolur.
+    """
+
+    def __init__(self, name, data_file="library.json", journal=False, snapshot_every=1000,
+                 storage: StorageBackend = None, group_commit_window: float = None,
+                 http_client: httpx.AsyncClient = None, metadata_cache: MetadataCache = None,
+                 compact: bool = False, write_behind: float = None, write_behind_max: int = 1000):
         self.name = name
-        self._books: List[Union[Book, EBook, AudioBook]] = []
-        self._members: List[Member] = []
-        self.data_file = data_file
+        # Kitaplar ISBN'e, üyeler member_id'ye göre tutulur; aramalar O(1).
+        # compact=True ise kitaplar nesne başına model yerine sütunlu bir katalogda
+        # tutulur ve okumalar BookView döndürür (bkz. core/compact.py).
+        self._books: Dict[str, Union[Book, EBook, AudioBook]] = CompactCatalogue() if compact else {}
+        self._members: Dict[int, Member] = {}
+        # Ödünç tablosu: ISBN -> kitabı elinde tutan üyenin ID'si. Üye tarafı
+        # (member_id -> ISBN'ler) Member.borrowed_books'tur; ikisi _lend/_take_back ile birlikte güncellenir.
+        self._borrowers: Dict[str, int] = {}
+        # Küçük harfe katlanmış başlık -> o başlığa sahip kitapların ISBN'leri (eklenme sırasıyla)
+        self._title_index: Dict[str, List[str]] = {}
+        # Başlık ve yazar kelimeleri üzerinde tam metin araması
+        self._search_index = SearchIndex()
+        # Her değişikliğin sürümü; dışa aktarımda `since` filtresi için
+        self._versions = VersionTracker()
+        # Sayfalama imleçleri için sıralı ISBN ve member_id kümeleri
+        self._isbn_order: SortedKeys[str] = SortedKeys()
+        self._member_order: SortedKeys[int] = SortedKeys()
+        # Durum, yazar, tür ve yayın yılı indeksleri; query() bunlardan plan seçer
+        self._secondary = SecondaryIndexes()
+        # Başlık/arama/sıra indeksleri yüklemeden sonra ilk ihtiyaçta toplu kurulur;
+        # böylece açılış süresi yalnızca veriyi okumaya harcanır.
+        self._indexes_ready = False
+        # Toplu sayaçlar (bkz. stats()); ilk istendiğinde kurulur, sonra her değişiklikle güncellenir.
+        self._stats: Optional[LibraryStats] = None
+        # Eşzamanlılık (bkz. sınıf açıklaması). Alma sırası: şeritler -> _state_lock -> _index_lock;
+        # _write_lock şeritlerden sonra, _state_lock'tan önce alınır. Paylaşımlı depolamada
+        # değişiklikler _write_lock'u ve depolama kilidini şeritlerden önce alır (bkz. _mutating).
+        self._entity_locks = LockStripes()
+        self._state_lock = SharedExclusiveLock()
+        self._index_lock = threading.RLock()
+        self._write_lock = threading.RLock()
+        # Aynı anda tek bir batch() bloğu şerit tutabilir (bkz. LockStripes.retain).
+        self._batch_lock = threading.Lock()
+        # Kalıcılık bir depolama katmanına devredilir; verilmezse JSON dosyası kullanılır.
+        if storage is None:
+            storage = JSONStorage(data_file, journal=journal, snapshot_every=snapshot_every)
+        self.storage = storage
+        self.data_file = storage.path
+        # batch() içindeyken kalıcı hale getirilmeyi bekleyen kayıtlar ve geri alma
+        # adımları; her iş parçacığının kendi bloğu vardır (bkz. _batch).
+        self._local = threading.local()
+        # group_commit_window verilirse eşzamanlı değişiklikler ortak bir yazmada toplanır;
+        # write_behind verilirse arka planda yazılır. Paylaşımlı depolamada her değişiklik
+        # süreçler arası kilidi tutarken yazılmalıdır; ikisi de kullanılmaz.
+        self._committer = None
+        if write_behind is not None and not storage.shared:
+            self._committer = WriteBehindCommitter(self._commit_to_storage, delay=write_behind,
+                                                   max_pending=write_behind_max)
+        elif group_commit_window is not None and not storage.shared:
+            self._committer = GroupCommitter(self._commit_to_storage, window=group_commit_window)
+        # Open Library istekleri; http_client verilirse (ör. API'nin) bağlantı havuzu paylaşılır.
+        # Sonuçlar varsayılan olarak yalnızca bellekte önbelleğe alınır.
+        if metadata_cache is None:
+            metadata_cache = MetadataCache()
+        self.open_library = OpenLibraryClient(client=http_client, cache=metadata_cache)
         self._load_data()
 
 
     ### Veri Methodları ###
-    
+
     def _save_data(self):
-        """Kütüphanedeki tüm kitap ve üye verilerini JSON dosyasına kaydeder."""
-        try:
-            books_data = []
-            for book in self._books:
-                book_data = book.model_dump(mode='json')
-                if isinstance(book, EBook):
-                    book_data['book_type'] = 'ebook'
-                elif isinstance(book, AudioBook):
-                    book_data['book_type'] = 'audiobook'
-                else:
-                    book_data['book_type'] = 'book'
-                books_data.append(book_data)
-
-            members_data = []
-            for member in self._members:
-                borrowed_isbns = [book.isbn for book in member.borrowed_books]
-                members_data.append({
-                    "name": member.name,
-                    "member_id": member.member_id,
-                    "borrowed_isbns": borrowed_isbns 
-                })
-
-            data_to_save = {
-                "books": books_data,
-                "members": members_data
-            }
-
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-            
-        except Exception as e:
-            print(f"[HATA] Veri kaydetme sırasında bir sorun oluştu: {e}")
+        """Kütüphanenin tüm durumunu depolama katmanına baştan yazar."""
+        # Arka planda bekleyen kayıtlar tam yazmadan sonra günlüğe ikinci kez düşmesin.
+        self._flush_committer()
+        with self._exclusive_storage():
+            self.storage.save_all(self)
 
+    @timed("load")
     def _load_data(self):
-        """JSON dosyasından kitap ve üye verilerini yükler."""
+        """Depolama katmanından kitap ve üye verilerini yükler ve varsa
+        sonrasında gelen işlem kayıtlarını üzerine uygular."""
+        with _gc_paused():
+            # Günlüğün yarım kalmış son satırı yüklemede kesilir; başka bir süreç o sırada yazmamalı.
+            with self.storage.locked():
+                loaded = self.storage.load()
+            self._versions.load(loaded.versions)
+            # Anlık görüntü alınırken sürümü damgalanmış ama henüz günlüğe yazılmamış
+            # değişiklikler anlık görüntüde zaten vardır; günlükten ikinci kez uygulanmazlar.
+            snapshot_version = self._versions.version
+            self._indexes_ready = False
+            if isinstance(loaded.books, BookColumns) and isinstance(self._books, CompactCatalogue):
+                self._books.load_columns(loaded.books)
+            else:
+                for book in loaded.books:
+                    self._books[book.isbn] = book
+
+            for member, borrowed_isbns in loaded.members:
+                for isbn in borrowed_isbns:
+                    book_obj = self._books.get(isbn)
+                    if book_obj:
+                        member.borrowed_books.append(book_obj)
+                        self._borrowers[isbn] = member.member_id
+                self._members[member.member_id] = member
+
+            self._apply_records(loaded.records, after_version=snapshot_version)
+
+    def _apply_records(self, records: List[dict], after_version: int = 0):
+        """İşlem kayıtlarını sırayla uygular; sürümü `after_version`'dan büyük olmayanları atlar."""
+        for record in records:
+            if record.get("version", after_version + 1) <= after_version:
+                continue
+            try:
+                self._apply_record(record)
+                self._versions.apply(record)
+            except (ValueError, KeyError) as e:
+                logger.warning("İşlem kaydı uygulanamadı (seq=%s): %s", record.get('seq'), e)
+
+    def _apply_record(self, record: dict):
+        """Tek bir işlem kaydını bellekteki duruma uygular (kalıcı hale getirmeden)."""
+        op = record["op"]
+        if op == "add_book":
+            self._index_book(book_from_dict(record["book"]))
+        elif op == "delete_book":
+            self._unindex_book(self._books[record["isbn"]])
+        elif op == "register_member":
+            self._index_member(Member(name=record["name"], member_id=record["member_id"]))
+        elif op == "borrow":
+            self._lend(self._members[record["member_id"]], self._books[record["isbn"]])
+        elif op == "return":
+            self._take_back(self._members[record["member_id"]], self._books[record["isbn"]])
+        else:
+            raise ValueError(f"Bilinmeyen işlem: {op}")
+
+    def _persist(self, record: dict, apply: Callable[[], None], undo: Callable[[], None]):
+        """Değişikliği (`apply`) bellekte uygular ve kalıcı hale getirir.
+
+        Değişiklik ve kaydın yeni sürümle damgalanması, tam yazmaların aldığı
+        kopyayla yarışmayacak şekilde birlikte yapılır. batch() içindeyse kayıt
+        blok sonuna kadar bekletilir ve `undo` geri alma için saklanır; değilse
+        hemen depolama katmanına gönderilir. `apply` hata verirse hiçbir şey
+        damgalanmaz ve yazılmaz. Yazma hata verirse değişiklik ve sürüm damgası
+        batch() geri almasındaki gibi geri alınır ve hata çağırana iletilir;
+        böylece bellekte kalıcı olmayan bir değişiklik görünmez.
+        """
+        with self._state_lock.shared():
+            apply()
+            previous = self._versions.stamp(record)
+
+        def undo_stamped():
+            undo()
+            self._versions.unstamp(record, previous)
+
+        batch = self._batch
+        if batch.depth:
+            batch.records.append(record)
+            batch.undo_log.append(undo_stamped)
+            return
+        try:
+            self._commit([record])
+        except BaseException:
+            self._undo([undo_stamped])
+            raise
+
+    def _undo(self, undo_log: List[Callable[[], None]]):
+        with self._state_lock.shared():
+            for undo in reversed(undo_log):
+                undo()
+            # Kayıtların sürümleri geri yazılır, ama genel sürüm arada başka
+            # değişiklikler damgalandıysa geri dönemez; süreç içi önbellekler geri
+            # alınmış durumu nesilden anlar (bkz. state_token).
+            self._versions.bump_generation()
+
+    @property
+    def _batch(self):
+        """Çağıran iş parçacığının batch() durumu."""
+        batch = getattr(self._local, "batch", None)
+        if batch is None:
+            batch = self._local.batch = _BatchState()
+        return batch
+
+    def _commit(self, records: List[dict]):
+        if self._committer is not None:
+            self._committer.submit(records)
+        else:
+            self._commit_to_storage(records)
+
+    def _commit_to_storage(self, records: List[dict]):
+        with self._write_lock:
+            self.storage.commit(self, records)
+
+    @contextmanager
+    def _exclusive_storage(self):
+        """Depolamaya yazma hakkı: süreç içinde `_write_lock`, paylaşımlı depolamada
+        ayrıca süreçler arası kilit. Paylaşımlı depolamada diğer süreçlerin
+        değişiklikleri kilit alınır alınmaz uygulanır."""
+        with self._write_lock, self.storage.locked():
+            if self.storage.shared:
+                self._catch_up()
+            yield
+
+    @contextmanager
+    def _mutating(self, *keys):
+        """Bir değişikliğin doğrulanıp kalıcı hale gelmesi boyunca tutulan kilitler:
+        dokunulan kitap/üyenin şeritleri, paylaşımlı depolamada önce `_exclusive_storage`.
+
+        batch() içinde şeritler en dıştaki blok yazılana ya da geri alınana kadar
+        tutulur: diğer iş parçacıkları henüz yazılmamış bir değişikliğin üzerine
+        değişiklik yapıp onu yazamaz (paylaşımlı depolama kilidini blok zaten tutar).
+        """
+        batch = self._batch
+        if batch.depth:
+            self._entity_locks.retain(batch.stripes, *keys)
+            yield
+            return
+        if not self.storage.shared:
+            with self._entity_locks.hold(*keys):
+                yield
+            return
+        with self._exclusive_storage(), self._entity_locks.hold(*keys):
+            yield
+
+    @timed("reload")
+    def _catch_up(self) -> bool:
+        """Depolamadaki dış değişiklikleri uygular; çağıran `_write_lock`'u ve
+        depolama kilidini tutar. Yalnızca yeni kayıtlar okunabiliyorsa onlar
+        uygulanır, okunamıyorsa her şey yeniden yüklenir. Değişiklik varsa True."""
+        records = self.storage.read_changes()
+        if records is None:
+            with self._state_lock.exclusive(), self._index_lock:
+                self._books.clear()
+                self._members.clear()
+                self._borrowers.clear()
+                self._stats = None
+                self._load_data()
+            return True
+        if not records:
+            return False
+        with self._state_lock.exclusive():
+            self._apply_records(records, after_version=self._versions.version)
+        return True
+
+    @contextmanager
+    def batch(self):
+        """Blok içindeki tüm değişiklikleri blok sonunda tek seferde kalıcı hale getirir.
+
+        Bloktan bir istisna çıkarsa bloktaki değişiklikler bellekte geri alınır ve
+        hiçbiri yazılmaz. İç içe kullanılabilir; yalnızca en dıştaki blok yazar,
+        içteki bir bloğun hatası yalnızca o bloğun değişikliklerini geri alır.
+        Bloğun dokunduğu kitap ve üyeler blok bitene kadar kilitli kalır; diğer iş
+        parçacıklarının bunlardaki değişiklikleri bekler. Bloklar birbirini bekler.
+
+            with library.batch():
+                for book in books:
+                    library.add_book(book)
+        """
+        outer = not self._batch.depth
+        if outer:
+            self._batch_lock.acquire()
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with self._mutating():
+                batch = self._batch
+                records_mark, undo_mark = len(batch.records), len(batch.undo_log)
+                batch.depth += 1
+                try:
+                    yield self
+                except BaseException:
+                    batch.depth -= 1
+                    self._rollback_to(records_mark, undo_mark)
+                    raise
+                batch.depth -= 1
+                if batch.depth or not batch.records:
+                    return
+
+                records, batch.records = batch.records, []
+                undo_log, batch.undo_log = batch.undo_log, []
+                try:
+                    self._commit(records)
+                except BaseException:
+                    self._undo(undo_log)
+                    raise
+        finally:
+            if outer:
+                self._entity_locks.release(self._batch.stripes)
+                self._batch_lock.release()
+
+    transaction = batch
+
+    def _rollback_to(self, records_mark: int, undo_mark: int):
+        """batch() içinde verilen işaretten sonraki değişiklikleri bellekte geri alır."""
+        batch = self._batch
+        self._undo(batch.undo_log[undo_mark:])
+        del batch.undo_log[undo_mark:]
+        del batch.records[records_mark:]
+
+    def compact(self):
+        """Tam bir anlık görüntü yazar; günlük açıksa günlüğü boşaltır."""
+        self._save_data()
 
-                for book_data in data.get("books", []):
-                    book_type = book_data.pop("book_type", "book")
-                    if book_type == 'ebook':
-                        self._books.append(EBook.model_validate(book_data))
-                    elif book_type == 'audiobook':
-                        self._books.append(AudioBook.model_validate(book_data))
-                    else:
-                        self._books.append(Book.model_validate(book_data))
+    @property
+    def version(self) -> int:
+        """Son değişikliğin sürüm numarası; her değişiklikte artar."""
+        return self._versions.version
 
-                loaded_members = data.get("members", [])
-                for member_data in loaded_members:
-                    borrowed_isbns = member_data.pop("borrowed_isbns", [])
-                    member = Member(**member_data)
-                    
-                    for isbn in borrowed_isbns:
-                        book_obj = self.find_book(isbn=isbn)
-                        if book_obj:
-                            member.borrowed_books.append(book_obj)
-                            
-                    self._members.append(member)
+    @property
+    def state_token(self) -> Tuple[int, int]:
+        """Bellekteki durumun kimliği (nesil, sürüm): her değişiklik, geri alma ve
+        tam yeniden yüklemede değişir. Süreç içi önbellekler içindir; sürümün
+        aksine süreçler arasında karşılaştırılamaz."""
+        return self._versions.generation, self._versions.version
 
-                print(f"{len(self._books)} kitap ve {len(self._members)} üye başarıyla yüklendi.")
+    @property
+    def last_modified(self) -> float:
+        """Son değişikliğin (veya yüklemenin) zamanı, Unix zamanı olarak."""
+        return self._versions.modified_at
+
+    def book_version(self, isbn: str) -> int:
+        """Kitabın son değiştiği sürüm. Sürümü bilinmeyen (eski dosyalardan gelen)
+        veya bulunmayan kitaplar için kütüphane sürümü döner; bu değer kitap
+        değiştiğinde alacağı her sürümden küçüktür."""
+        return self._versions.get("book", isbn) or self._versions.version
+
+    def reload_if_changed(self) -> bool:
+        """Veri son yüklemeden/kaydetmeden sonra dışarıdan (ör. başka bir API
+        süreci tarafından) değiştirildiyse kütüphaneyi günceller: günlüğe eklenen
+        kayıtlar okunabiliyorsa yalnızca onlar uygulanır, değilse her şey yeniden
+        yüklenir. Güncelleme yapıldıysa True döndürür."""
+        if not self.storage.has_external_changes():
+            return False
+        # Kilitler beklenirken başka bir iş parçacığı güncellemiş olabilir; _catch_up yeniden bakar.
+        with self._write_lock, self.storage.locked():
+            return self._catch_up()
 
-        except FileNotFoundError:
-            print("Veri dosyası bulunamadı. Kütüphane boş olarak başlatılıyor.")
-        except (json.JSONDecodeError, TypeError) as e:
-            print(f"Veri dosyası okunamadı veya bozuk. Kütüphane boş olarak başlatılıyor. Hata: {e}")
+    @property
+    def pending_writes(self) -> int:
+        """Arka planda yazılmayı bekleyen değişiklik sayısı; write_behind kapalıyken 0."""
+        return getattr(self._committer, "pending", 0)
+
+    def _flush_committer(self):
+        # Arka plan yazıcısı _write_lock'u aldığından bu kilit tutulmadan beklenmelidir.
+        if self._committer is not None:
+            self._committer.flush()
+
+    def flush(self):
+        """Bekleyen ve kaydedilememiş değişiklikler varsa veriyi diske yazar;
+        döndüğünde o ana kadarki tüm değişiklikler kalıcıdır."""
+        self._flush_committer()
+        with self._exclusive_storage():
+            self.storage.flush(self)
+
+    def close(self):
+        """Bekleyen değişiklikleri yazar, depolama katmanını ve kütüphanenin kendi
+        oluşturduğu Open Library HTTP istemcisini kapatır."""
+        self.flush()
+        if self._committer is not None:
+            self._committer.close()
+        self.storage.close()
+        self.open_library.close()
+
+    async def aclose(self):
+        """close()'un olay döngüsü içinden kullanılacak hali; HTTP istemcisi
+        çalışan döngüde beklenerek kapatılır."""
+        await self.open_library.aclose()
+        self.close()
+
+    ### İndeks Methodları ###
+
+    def _ensure_indexes(self):
+        """Başlık, arama, sıra ve ikincil indeksleri henüz kurulmadıysa kitap ve
+        üye sözlüklerinden toplu olarak kurar."""
+        if self._indexes_ready:
+            return
+        with self._index_lock:
+            if self._indexes_ready:
+                return
+            self._title_index = {}
+            self._search_index = SearchIndex()
+            for isbn, book in self._books.items():
+                self._title_index.setdefault(book.title.casefold(), []).append(isbn)
+                self._search_index.add(isbn, book.title, book.author)
+            self._isbn_order = SortedKeys(self._books)
+            self._secondary = SecondaryIndexes(self._books.values())
+            self._member_order = SortedKeys(self._members)
+            self._indexes_ready = True
+
+    def _index_book(self, book: Union[Book, EBook, AudioBook]):
+        """Kitabı ISBN, başlık ve arama indekslerine ekler."""
+        with self._index_lock:
+            self._books[book.isbn] = book
+            if self._stats is not None:
+                self._stats.add_book(book)
+            if not self._indexes_ready:
+                return
+            self._title_index.setdefault(book.title.casefold(), []).append(book.isbn)
+            self._search_index.add(book.isbn, book.title, book.author)
+            self._isbn_order.add(book.isbn)
+            self._secondary.add(book)
+
+    def _unindex_book(self, book: Union[Book, EBook, AudioBook]):
+        """Kitabı ISBN, başlık ve arama indekslerinden çıkarır."""
+        with self._index_lock:
+            key = book.title.casefold()
+            # Kompakt katalogda görünümün alanları satır silinince okunamaz.
+            if self._stats is not None:
+                self._stats.remove_book(book)
+            if self._indexes_ready:
+                self._secondary.remove(book)
+            del self._books[book.isbn]
+            if not self._indexes_ready:
+                return
+            self._search_index.remove(book.isbn)
+            self._isbn_order.discard(book.isbn)
+            same_title = self._title_index.get(key, [])
+            if book.isbn in same_title:
+                same_title.remove(book.isbn)
+            if not same_title:
+                self._title_index.pop(key, None)
+
+    def _status_changed(self, book: Union[Book, EBook, AudioBook], old_status: BookStatus):
+        """Ödünç verme/iadeden sonra kitabı durum indeksinde taşır."""
+        with self._index_lock:
+            if self._indexes_ready:
+                self._secondary.move_status(book.isbn, old_status, book.status)
+
+    def _index_member(self, member: Member):
+        with self._index_lock:
+            self._members[member.member_id] = member
+            if self._indexes_ready:
+                self._member_order.add(member.member_id)
+
+    def _unindex_member(self, member_id: int):
+        with self._index_lock:
+            self._members.pop(member_id, None)
+            if self._indexes_ready:
+                self._member_order.discard(member_id)
 
 
 
@@ -90,85 +538,271 @@ class Library:
     ### KİTAP METHODLARI ###
     def add_book(self, book: Union[Book, EBook, AudioBook]):
         """Kütüphaneye yeni bir kitap (veya alt türü) ekler."""
-        # ISBN'nin benzersiz olduğunu kontrol etmek iyi bir pratiktir.
-        for existing_book in self._books:
-            if existing_book.isbn == book.isbn:
+        self._insert_book(book)
+        logger.info("'%s' kütüphaneye eklendi.", book.title)
+
+    @timed("add_book")
+    def _insert_book(self, book: Union[Book, EBook, AudioBook]):
+        """Kitabı indeksler ve kalıcı hale getirir; ISBN zaten varsa ValueError."""
+        with self._mutating(("book", book.isbn)):
+            # ISBN'nin benzersiz olduğunu kontrol etmek iyi bir pratiktir.
+            if book.isbn in self._books:
                 raise ValueError(f"ISBN {book.isbn} zaten mevcut.")
-        self._books.append(book)
-        self._save_data()
-        print(f"'{book.title}' kütüphaneye eklendi.")
+            self._persist({"op": "add_book", "book": book_to_dict(book)},
+                          apply=lambda: self._index_book(book),
+                          undo=lambda: self._unindex_book(book))
+
+    def import_books(self, rows: Iterable[dict], chunk_size: int = 1000, max_errors: int = 1000) -> ImportReport:
+        """Kitap satırlarını (ör. importer.read_rows ile okunan CSV/JSONL) toplu olarak ekler.
+
+        Satırlar chunk_size'lık parçalar halinde doğrulanır ve her parça tek bir
+        yazmayla kalıcı olur. Hatalı veya tekrarlanan satırlar atlanır ve satır
+        numarasıyla birlikte rapora eklenir.
+        """
+        return BookImporter(self, chunk_size=chunk_size, max_errors=max_errors).feed(rows)
 
     async def add_book_from_api(self, isbn: str):
         """Verilen ISBN'i kullanarak Open Library API'sinden kitap bilgilerini çeker
         ve kütüphaneye yeni bir Book nesnesi olarak ekler."""
-        if self.find_book(isbn=isbn):
+        if isbn in self._books:
             raise ValueError(f"ISBN {isbn} zaten mevcut!")
-        
-        params = {"q": isbn}
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(OPEN_LIBRARY_URL, params=params, follow_redirects=True)
-                response.raise_for_status()
-
-            data = response.json()
-
-            if not data.get("docs") or len(data["docs"]) == 0:
-                raise ValueError(f"ISBN {isbn} ile Open Library'de arama sonucu bulunamadı.")
-            
-            first_result = data["docs"][0]
-            title = first_result.get("title", "Başlık Bilinmiyor")
-            author = first_result.get("author_name", ["Yazar Bilinmiyor"])[0]
-            publication_year = first_result.get("first_publish_year", 9999)
-
-            print(f"{isbn} ile {data.get('numFound', 0)} sonuç bulundu.")
-            new_book = Book(
-                title=title,
-                author=author,
-                isbn=isbn,
-                publication_year=publication_year
-            )
-
-            self._books.append(new_book)
-            self._save_data()
-            print(f"İlk sıradaki sonuç eklendi: '{new_book.title}' by {new_book.author}")
-
-
-        except httpx.HTTPStatusError as e:
-            raise IOError(f"API isteği başarısız oldu: Sunucu hatası {e.response.status_code}")
-        
-        except httpx.RequestError:
-            raise IOError("Ağ hatası. Lütfen internet bağlantınızı kontrol edin.")
-        
-        except (KeyError, IndexError, TypeError):
-            raise IOError(f"API'den gelen veri formatı beklenmedik veya bozuk. ISBN: {isbn}")
-
 
+        new_book = await self.open_library.fetch_book(isbn)
+        if new_book.isbn in self._books:
+            raise ValueError(f"ISBN {isbn} zaten mevcut!")
+        await asyncio.to_thread(self._insert_book, new_book)
+        logger.info("İlk sıradaki sonuç eklendi: '%s' by %s", new_book.title, new_book.author)
+
+    async def add_books_from_api(self, isbns: Iterable[str], concurrency: int = 10) -> List[ApiImportResult]:
+        """Birden çok ISBN'i Open Library'den eşzamanlı olarak çeker ve ekler.
+
+        Aynı anda en fazla `concurrency` istek gönderilir; tüm istekler aynı
+        bağlantı havuzunu kullanır. Başarılı sonuçların hepsi tek bir yazmayla
+        kaydedilir. Her ISBN için bir ApiImportResult döndürülür (giriş sırasıyla,
+        tekrarlananlar bir kez).
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(isbn: str) -> ApiImportResult:
+            if isbn in self._books:
+                return ApiImportResult(isbn, "duplicate", f"ISBN {isbn} zaten mevcut!")
+            async with semaphore:
+                try:
+                    book = await self.open_library.fetch_book(isbn)
+                except ValueError as e:
+                    return ApiImportResult(isbn, "not_found", str(e))
+                except IOError as e:
+                    return ApiImportResult(isbn, "error", str(e))
+            return ApiImportResult(isbn, "added", book=book)
+
+        results = await asyncio.gather(*(fetch(isbn) for isbn in dict.fromkeys(isbns)))
+        # Ekleme ve yazma (fsync, dosya kilidi) olay döngüsünü bloklamasın diye
+        # iş parçacığında yürür.
+        await asyncio.to_thread(self._insert_api_results, results)
+
+        added = sum(1 for result in results if result.status == "added")
+        logger.info("Open Library'den %d/%d kitap eklendi.", added, len(results))
+        return results
+
+    def _insert_api_results(self, results: List[ApiImportResult]):
+        """Çekilen kitapları tek bir batch() içinde ekler; eklenemeyen ISBN
+        yalnızca kendi sonucunda raporlanır, diğerleri yine kaydedilir."""
+        with self.batch():
+            for result in results:
+                if result.status != "added":
+                    continue
+                # İstekler sürerken aynı ISBN başka bir yoldan eklenmiş olabilir.
+                try:
+                    self._insert_book(result.book)
+                except ValueError as e:
+                    result.status, result.detail, result.book = "duplicate", str(e), None
 
     def find_book(self, *, isbn: str = None, title: str = None):
         """ISBN'e veya başlığa göre tek bir kitap bulur."""
+        # ISBN araması ölçülmez: süresi ölçümün kendisinden kısadır.
         if isbn:
-            for book in self._books:
-                if book.isbn == isbn:
-                    return book
+            return self._books.get(isbn)
         elif title:
-            for book in self._books:
-                if book.title.lower() == title.lower():
-                    return book
+            return self._find_by_title(title)
+        return None
+
+    @timed("find_by_title")
+    def _find_by_title(self, title: str):
+        self._ensure_indexes()
+        with self._index_lock:
+            same_title = self._title_index.get(title.casefold())
+            if same_title:
+                return self._books[same_title[0]]
         return None
     
 
+    @timed("search")
+    def search(self, query: str, limit: int = 20) -> List[Union[Book, EBook, AudioBook]]:
+        """Başlık ve yazarda tam metin araması yapar.
+
+        Sorgudaki tüm kelimeler (önek olarak da) eşleşmelidir; Türkçe büyük/küçük
+        harf kuralları gözetilir. Sonuçlar ilgiye göre sıralıdır: başlıktaki ve tam
+        kelime eşleşmeleri öne çıkar.
+        """
+        self._ensure_indexes()
+        with self._index_lock:
+            return [self._books[isbn] for isbn, _ in self._search_index.search(query, limit)]
+
+    def iter_books(self, after: Optional[str] = None, status: Optional[BookStatus] = None,
+                   author: Optional[str] = None, year_from: Optional[int] = None,
+                   year_to: Optional[int] = None, book_type: Optional[str] = None
+                   ) -> Iterator[Union[Book, EBook, AudioBook]]:
+        """Kitapları ISBN sırasıyla, isteğe bağlı filtrelerle döndürür.
+
+        `after` verilirse yalnızca ISBN'i ondan büyük kitaplar gelir; sıra ekleme ve
+        silmelerden etkilenmediği için sayfalama imleci olarak kullanılabilir.
+        Yazar filtresi Türkçe büyük/küçük harf kurallarıyla tam eşleşme yapar.
+        Yineleme sırasında eklenen veya silinen kitaplar görünmeyebilir.
+        """
+        self._ensure_indexes()
+        author_key = fold(author) if author is not None else None
+        for isbn in self._isbn_order.irange(after):
+            book = self._books.get(isbn)
+            if book is None:
+                continue
+            if status is not None and book.status != status:
+                continue
+            if author_key is not None and fold(book.author) != author_key:
+                continue
+            if year_from is not None and book.publication_year < year_from:
+                continue
+            if year_to is not None and book.publication_year > year_to:
+                continue
+            if book_type is not None and book_type_of(book) != book_type:
+                continue
+            yield book
+
+    def page_books(self, limit: int = 100, after: Optional[str] = None, **filters
+                   ) -> Tuple[List[Union[Book, EBook, AudioBook]], Optional[str]]:
+        """Bir sayfa kitap ve sonraki sayfanın imlecini (son sayfadaysa None) döndürür."""
+        books = self.query(limit=limit + 1, after=after, **filters)
+        if len(books) > limit:
+            return books[:limit], books[limit - 1].isbn
+        return books, None
+
+    def explain(self, limit: Optional[int] = None, status: Optional[BookStatus] = None,
+                author: Optional[str] = None, year_from: Optional[int] = None,
+                year_to: Optional[int] = None, book_type: Optional[str] = None) -> QueryPlan:
+        """query()'nin aynı filtrelerle seçeceği planı döndürür (bkz. core/query.py)."""
+        self._ensure_indexes()
+        with self._index_lock:
+            return self._secondary.plan(len(self._books), limit, status=status, author=author,
+                                        year_from=year_from, year_to=year_to, book_type=book_type)
+
+    @timed("query")
+    def query(self, limit: Optional[int] = None, after: Optional[str] = None,
+              status: Optional[BookStatus] = None, author: Optional[str] = None,
+              year_from: Optional[int] = None, year_to: Optional[int] = None,
+              book_type: Optional[str] = None) -> List[Union[Book, EBook, AudioBook]]:
+        """Filtrelerle eşleşen kitapları ISBN sırasıyla döndürür (en çok `limit` tane).
+
+        Filtreler iter_books() ile aynıdır ve birlikte (VE) uygulanır. Planlayıcı
+        en seçici ikincil indeksten başlar; sayfa küçük ve eşleşmeler boldsa
+        ISBN sırasıyla taramayı seçer. Sonuç her iki planda da aynıdır.
+        """
+        filters = dict(status=status, author=author, year_from=year_from, year_to=year_to, book_type=book_type)
+        self._ensure_indexes()
+        with self._index_lock:
+            plan = self._secondary.plan(len(self._books), limit, **filters)
+            if plan.index == "empty":
+                return []
+            if plan.index == "scan":
+                return list(islice(self.iter_books(after, **filters), limit))
+            candidates, required = self._secondary.candidates(plan, **filters)
+            check_year = plan.index != "publication_year" and (year_from is not None or year_to is not None)
+
+            def matches(isbn: str) -> bool:
+                if after is not None and isbn <= after:
+                    return False
+                if not all(isbn in isbns for isbns in required):
+                    return False
+                if check_year:
+                    year = self._books[isbn].publication_year
+                    return (year_from is None or year >= year_from) and (year_to is None or year <= year_to)
+                return True
+
+            found = filter(matches, candidates)
+            isbns = sorted(found) if limit is None else heapq.nsmallest(limit, found)
+            return [self._books[isbn] for isbn in isbns]
+
+    def iter_export(self, kind: str = "books", since: Optional[int] = None) -> Iterator[dict]:
+        """Dışa aktarım kayıtlarını birer birer üretir; bellek kullanımı katalog
+        boyutundan bağımsızdır.
+
+        kind: "books", "members" veya "loans". Her kayıt son değiştiği `version`
+        değerini taşır. `since` verilirse yalnızca o sürümden sonra değişenler
+        döner; arada silinen kitaplar ve iade edilen ödünçler {"isbn", "deleted": True}
+        kaydıyla bildirilir (bir kitabın tek ödüncü olduğundan ödünçler ISBN'le tanınır). Aktarım sırasında yapılan değişiklikler bir sonraki aktarımda
+        mutlaka görünür: başlangıçtaki `version` değeri sonraki `since` olarak
+        kullanılmalıdır.
+        """
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Bilinmeyen dışa aktarım türü: {kind}")
+        self._ensure_indexes()
+        versions = self._versions
+
+        def changed(version: int) -> bool:
+            return since is None or version > since
+
+        if kind == "books":
+            for isbn in self._isbn_order.irange():
+                version = versions.get("book", isbn)
+                book = self._books.get(isbn)
+                if book is None or not changed(version):
+                    continue
+                try:
+                    record = book_to_dict(book)
+                except KeyError:
+                    # Kompakt katalogda kitap aktarım sürerken silindi; bir sonraki
+                    # aktarımda mezar taşı olarak görünür.
+                    continue
+                record["version"] = version
+                yield record
+            if since is not None:
+                for isbn, version in sorted(versions.items("deleted_book", since)):
+                    if isbn not in self._books:
+                        yield {"isbn": isbn, "deleted": True, "version": version}
+        elif kind == "members":
+            for member_id in self._member_order.irange():
+                version = versions.get("member", member_id)
+                member = self._members.get(member_id)
+                if member is not None and changed(version):
+                    yield {"member_id": member_id, "name": member.name, "version": version}
+        else:
+            for member_id in self._member_order.irange():
+                member = self._members.get(member_id)
+                if member is None:
+                    continue
+                for book in list(member.borrowed_books):
+                    version = versions.get("book", book.isbn)
+                    if changed(version):
+                        yield {"member_id": member_id, "isbn": book.isbn, "version": version}
+            if since is not None:
+                for isbn, version in sorted(versions.items("returned_loan", since)):
+                    if isbn not in self._borrowers:
+                        yield {"isbn": isbn, "deleted": True, "version": version}
+
+    @timed("delete_book")
     def delete_book(self, isbn: str):
-        book_to_delete = self.find_book(isbn=isbn)
-        if not book_to_delete:
-            raise ValueError(f"ISBN {isbn} ile eşleşen kitap bulunamadı.")
-        
-        if book_to_delete.status == BookStatus.BORROWED:
-            raise ValueError(f"'{book_to_delete.title}' ödünç alındığı için silinemez.")
-            
-        self._books.remove(book_to_delete)
-        self._save_data()
-        print(f"'{book_to_delete.title}' başarıyla silindi.")
+        with self._mutating(("book", isbn)):
+            book_to_delete = self.find_book(isbn=isbn)
+            if not book_to_delete:
+                raise ValueError(f"ISBN {isbn} ile eşleşen kitap bulunamadı.")
+
+            if book_to_delete.status == BookStatus.BORROWED:
+                raise ValueError(f"'{book_to_delete.title}' ödünç alındığı için silinemez.")
+
+            # Kompakt katalogda görünüm silinen satırı gösterdiği için geri alma bağımsız bir kopyayı saklar.
+            removed = detach(book_to_delete)
+            self._persist({"op": "delete_book", "isbn": isbn},
+                          apply=lambda: self._unindex_book(book_to_delete),
+                          undo=lambda: self._index_book(removed))
+        logger.info("'%s' başarıyla silindi.", removed.title)
 
 
     
@@ -178,7 +812,7 @@ class Library:
             return
         
         print(f"--- {self.name} kütüphanesi kitap listesi ---")
-        for book in self._books:
+        for book in self._books.values():
             print(book.display_info())
     
     @property
@@ -188,21 +822,31 @@ class Library:
     
 
     ### ÜYE METHODLARI ###
+    @timed("register_member")
     def register_member(self, member: Member):
-        for existing_member in self._members:
-            if existing_member.member_id == member.member_id:
+        with self._mutating(("member", member.member_id)):
+            if member.member_id in self._members:
                 raise ValueError(f"Üye ID {member.member_id} zaten kayıtlı.")
-        self._members.append(member)
-        self._save_data()
-        print(f"Kullanıcı başarıyla kaydoldu: {member.name} - {member.member_id}")
+            self._persist({"op": "register_member", "name": member.name, "member_id": member.member_id},
+                          apply=lambda: self._index_member(member),
+                          undo=lambda: self._unindex_member(member.member_id))
+        logger.info("Kullanıcı başarıyla kaydoldu: %s - %s", member.name, member.member_id)
 
     def find_member(self, member_id:int):
-        for member in self._members:
-            if member.member_id == member_id:
-                return member
-            
-        return None
+        """Üyeyi ID'sine göre bulur."""
+        return self._members.get(member_id)
     
+    def page_members(self, limit: int = 100, after: Optional[int] = None
+                     ) -> Tuple[List[Member], Optional[int]]:
+        """member_id sırasıyla bir sayfa üye ve sonraki sayfanın imlecini döndürür."""
+        self._ensure_indexes()
+        with self._index_lock:
+            members = [self._members[member_id]
+                       for member_id in islice(self._member_order.irange(after), limit + 1)]
+        if len(members) > limit:
+            return members[:limit], members[limit - 1].member_id
+        return members, None
+
     def list_members(self):
         """Tüm üyeleri ve ödünç aldıkları kitap sayısını listeler."""
         if not self._members:
@@ -210,53 +854,87 @@ class Library:
             return
         
         print(f"--- {self.name} Kütüphanesi Üye Listesi ---")
-        for member in self._members:
+        for member in self._members.values():
             print(f"ID: {member.member_id}, İsim: {member.name}, Ödünç Alınan Kitap Sayısı: {len(member.borrowed_books)}")
 
 
     ### İŞLEM METHODLARI ###
 
 
+    @timed("borrow")
     def borrow_book(self, member_id: int, book_isbn: str):
         """Bir üyenin bir kitabı ödünç almasını sağlar."""
-        member = self.find_member(member_id)
-        if not member:
-            raise ValueError(f"Bu ID ile kullanıcı bulunamadı! --> {member_id}")
-        
-        book = self.find_book(isbn=book_isbn)
-        if not book:
-            raise ValueError(f"Bu ISBN ile kitap bulunamadı!--> {book_isbn}")
+        with self._mutating(("book", book_isbn), ("member", member_id)):
+            member = self.find_member(member_id)
+            if not member:
+                raise ValueError(f"Bu ID ile kullanıcı bulunamadı! --> {member_id}")
 
-        book.borrow_book()
+            book = self.find_book(isbn=book_isbn)
+            if not book:
+                raise ValueError(f"Bu ISBN ile kitap bulunamadı!--> {book_isbn}")
 
-        member.borrowed_books.append(book)
-        self._save_data()
-        print(f"'{book.title}', '{member.name}' adlı üyeye ödünç verildi.")
+            self._persist({"op": "borrow", "member_id": member_id, "isbn": book_isbn},
+                          apply=lambda: self._lend(member, book),
+                          undo=lambda: self._take_back(member, book))
+        logger.info("'%s', '%s' adlı üyeye ödünç verildi.", book.title, member.name)
 
 
+    @timed("return")
     def return_book(self, member_id: int, book_isbn: str):
         """Bir üyenin bir kitabı iade etmesini sağlar."""
-        member = self.find_member(member_id)
-        if not member:
-            raise ValueError(f"Bu ID ile kullanıcı bulunamadı! --> {member_id}")
-        
-        book_to_return = None
-
-        for book in member.borrowed_books:
-            if book.isbn == book_isbn:
-                book_to_return = book
-                break
-        
-        if not book_to_return:
-            raise ValueError(f"'{member.name}' adlı üye, ISBN {book_isbn} olan kitabı ödünç almamış.")
-
-        book_to_return.return_book()
-
-        member.borrowed_books.remove(book_to_return)
-        self._save_data()
-        print(f"'{book_to_return.title}', '{member.name}' tarafından iade edildi.")
-
-
-
-    
-
+        with self._mutating(("book", book_isbn), ("member", member_id)):
+            member = self.find_member(member_id)
+            if not member:
+                raise ValueError(f"Bu ID ile kullanıcı bulunamadı! --> {member_id}")
+
+            if self._borrowers.get(book_isbn) != member_id:
+                raise ValueError(f"'{member.name}' adlı üye, ISBN {book_isbn} olan kitabı ödünç almamış.")
+            book_to_return = member.borrowed_books.get(book_isbn)
+
+            self._persist({"op": "return", "member_id": member_id, "isbn": book_isbn},
+                          apply=lambda: self._take_back(member, book_to_return),
+                          undo=lambda: self._lend(member, book_to_return))
+        logger.info("'%s', '%s' tarafından iade edildi.", book_to_return.title, member.name)
+
+    def current_borrower(self, isbn: str) -> Optional[Member]:
+        """Kitabı şu anda ödünç almış üyeyi döndürür; kitap ödünçte değilse None."""
+        member_id = self._borrowers.get(isbn)
+        return None if member_id is None else self._members.get(member_id)
+
+    def _lend(self, member: Member, book: Union[Book, EBook, AudioBook]):
+        """Kitabın durumunu, durum indeksini ve ödünç tablosunun iki yönünü birlikte günceller."""
+        old_status = book.status
+        book.borrow_book()
+        self._status_changed(book, old_status)
+        member.borrowed_books.append(book)
+        self._borrowers[book.isbn] = member.member_id
+        if self._stats is not None:
+            self._stats.lend(member.member_id)
+
+    def _take_back(self, member: Member, book: Union[Book, EBook, AudioBook]):
+        member.borrowed_books.remove(book)
+        old_status = book.status
+        book.return_book()
+        self._status_changed(book, old_status)
+        del self._borrowers[book.isbn]
+        if self._stats is not None:
+            self._stats.take_back(member.member_id)
+
+    ### İSTATİSTİK METHODLARI ###
+
+    def stats(self, top: int = 10) -> dict:
+        """Durum, tür ve yayın yılına göre kitap sayıları, en çok kitabı olan `top`
+        yazar, ödünç sayıları ve en çok ödüncü olan `top` üye.
+
+        Sayaçlar ilk çağrıda bir kez baştan hesaplanır, sonra her değişiklikle
+        güncellenir; sonraki çağrılar katalog boyutundan bağımsızdır.
+        """
+        stats = self._stats
+        if stats is None:
+            # Kurulum sürerken değişiklik uygulanmasın; uygulananlar sayaçlara ya
+            # kurulumdan önce girer ya da kurulduktan sonra artımlı eklenir.
+            with self._state_lock.exclusive(), self._index_lock:
+                stats = self._stats
+                if stats is None:
+                    stats = self._stats = LibraryStats.build(self._books.values(), self._members.values())
+        return stats.snapshot(total_members=len(self._members), top=top)
@@ -0,0 +1,108 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Set
+
+
+class LockStripes:
+    """Anahtarları sabit sayıda kilide dağıtan kilit şeritleri (lock striping).
+
+    Her kitap veya üye için ayrı bir kilit tutmak yerine anahtarın özeti
+    `stripes` kilitten birini seçer; farklı anahtarlar çoğunlukla farklı kilitlere
+    düşer ve birbirini beklemez. hold() birden çok anahtarın kilitlerini her zaman
+    aynı (sıra numarası) düzende aldığı için kilitlenme (deadlock) oluşmaz.
+    Kilitler RLock'tur: aynı iş parçacığı iç içe hold() çağırabilir.
+
+    retain() şeritleri sırasız alır ve release() çağrılana kadar tutar (batch()
+    bloğunun dokunduğu kayıtlar için). hold() beklerken hiçbir kilit tutmadığından
+    bununla kilitlenmez; retain() kullanan iş parçacıklarının ise aynı anda en
+    fazla biri çalışmalıdır.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _stripes(self, keys) -> Set[int]:
+        return {hash(key) % len(self._locks) for key in keys}
+
+    @contextmanager
+    def hold(self, *keys: Hashable):
+        locks = [self._locks[i] for i in sorted(self._stripes(keys))]
+        # Hepsi ya da hiçbiri: bir kilit meşgulse alınanlar bırakılır ve o kilit
+        # beklenir. Böylece retain() ile tutulan bir şerit beklenirken başka bir
+        # şerit tutulmaz.
+        while True:
+            acquired = []
+            for lock in locks:
+                if not lock.acquire(blocking=not acquired):
+                    break
+                acquired.append(lock)
+            if len(acquired) == len(locks):
+                break
+            for held in reversed(acquired):
+                held.release()
+            busy = locks[len(acquired)]
+            with busy:
+                pass
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def retain(self, held: Set[int], *keys: Hashable):
+        """Anahtarların şeritlerini alır ve bırakmaz; `held` kümesinde olmayanlar
+        alınıp kümeye eklenir."""
+        for i in sorted(self._stripes(keys) - held):
+            self._locks[i].acquire()
+            held.add(i)
+
+    def release(self, held: Set[int]):
+        """retain() ile alınmış şeritleri bırakır ve kümeyi boşaltır."""
+        for i in held:
+            self._locks[i].release()
+        held.clear()
+
+
+class SharedExclusiveLock:
+    """Paylaşımlı/özel kilit (okuyucu-yazıcı kilidi), yazıcı öncelikli.
+
+    shared() bölümleri birbirini beklemeden aynı anda çalışır; exclusive() bölümü
+    hepsi bitene kadar bekler ve o sürede yeni shared() girişlerini durdurur.
+    Library'de değişiklikler shared(), tutarlı bir tam kopya gerektiren yazmalar
+    (save_all) exclusive() ile yapılır. Kilit yeniden girişli değildir.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
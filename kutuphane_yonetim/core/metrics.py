@@ -0,0 +1,203 @@
+"""Prometheus metin biçiminde dışa verilebilen süreç içi ölçümler.
+
+Harici bir istemci kütüphanesi veya servis gerektirmez: sayaçlar, anlık
+değerler ve histogramlar bellekte tutulur, Registry.render() bunları
+Prometheus'un metin biçiminde (text/plain; version=0.0.4) yazar.
+
+Bir ölçüm kaydı bir kilit ve birkaç toplama işlemidir (~1 µs); ISBN/ID ile
+aramalar gibi bundan kısa süren işlemler ölçülmez.
+"""
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from . import slowlog
+
+# Saniye cinsinden süreler için: 50 µs'den 10 sn'ye.
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bayt cinsinden boyutlar için: 1 KB'tan 1 GB'a.
+BYTE_BUCKETS = tuple(1024 * 4 ** i for i in range(11))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer (ör. katalogdaki kitap sayısı)."""
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    """Gözlemleri kovalara dağıtan histogram; toplam ve sayıyı da tutar."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Etiket değerleri -> [kova sayıları (son kova +Inf), toplam, sayı]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues) -> int:
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total, count)
+                              for labels, (counts, total, count) in self._series.items())
+        lines = []
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Ölçümlerin adlarıyla tutulduğu kayıt; render() hepsini metin biçiminde yazar."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"'{metric.name}' adlı ölçüm zaten kayıtlı.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+# Sürecin varsayılan kaydı; API'nin /metrics uç noktası bunu yazar.
+REGISTRY = Registry()
+
+OPERATION_SECONDS = REGISTRY.histogram(
+    "kutuphane_operation_seconds", "Library ve depolama işlemlerinin süresi (sn).", ["operation"])
+SAVE_BYTES = REGISTRY.histogram(
+    "kutuphane_save_bytes", "Tam kaydetme başına yazılan bayt.", ["file"], buckets=BYTE_BUCKETS)
+BYTES_WRITTEN = REGISTRY.counter(
+    "kutuphane_bytes_written_total", "Depolama katmanının yazdığı toplam bayt.", ["file"])
+
+
+def timed(operation: str):
+    """İşlevin süresini OPERATION_SECONDS'a `operation` etiketiyle kaydeden dekoratör.
+    Yavaş işlem günlüğü açıksa süre geçerli izin bir aşaması olur (bkz. slowlog).
+    Hata veren çağrılar da ölçülür. Eşzamansız işlevler de desteklenir."""
+    def decorator(function):
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                trace = slowlog.enter(operation, start)
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    OPERATION_SECONDS.observe(elapsed, operation)
+                    if trace is not None:
+                        slowlog.leave(trace, operation, start, elapsed)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            trace = slowlog.enter(operation, start)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                OPERATION_SECONDS.observe(elapsed, operation)
+                if trace is not None:
+                    slowlog.leave(trace, operation, start, elapsed)
+        return wrapper
+    return decorator
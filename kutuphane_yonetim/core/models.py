@@ -1,6 +1,7 @@
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import List
+import copy
+from typing import Dict, Iterable, Iterator, Optional
 from dataclasses import dataclass, field
 
 class BookStatus(str, Enum):
@@ -57,10 +58,67 @@ class AudioBook(Book):
         return f"{self.get_base_info()} [Süre: {self.duration_in_minutes} dk] - Durum: {self.status.value}"
     
 
+class BorrowedBooks:
+    """Bir üyenin ödünç aldığı kitaplar, ödünç alma sırasıyla.
+
+    Kitaplar ISBN'e göre bir sözlükte tutulur; ekleme, çıkarma ve `in` kontrolü
+    üyenin kaç kitabı olduğundan bağımsızdır (kurumsal üyelerin binlerce ödüncü
+    olabilir). Okuma tarafında liste gibi davranır: yinelenir ve listeyle
+    karşılaştırılabilir. Sıra numarasıyla erişim sözlükte O(n) olacağından
+    desteklenmez; tek bir kitaba `get(isbn)` ile erişilir.
+    """
+
+    __slots__ = ("_books",)
+
+    def __init__(self, books: Iterable[Book] = ()):
+        self._books: Dict[str, Book] = {}
+        for book in books:
+            self.append(book)
+
+    def append(self, book: Book):
+        self._books[book.isbn] = book
+
+    def remove(self, book: Book):
+        if self._books.pop(book.isbn, None) is None:
+            raise ValueError(f"ISBN {book.isbn} ödünç alınanlar arasında değil.")
+
+    def get(self, isbn: str) -> Optional[Book]:
+        return self._books.get(isbn)
+
+    def isbns(self):
+        return self._books.keys()
+
+    def __contains__(self, book) -> bool:
+        return getattr(book, "isbn", None) in self._books
+
+    def __iter__(self) -> Iterator[Book]:
+        # Kopya üzerinden: başka bir iş parçacığı ödünç verirken yineleme bozulmaz.
+        return iter(list(self._books.values()))
+
+    def __len__(self):
+        return len(self._books)
+
+    def __eq__(self, other):
+        if isinstance(other, (BorrowedBooks, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __deepcopy__(self, memo):
+        # dataclasses.asdict() (ör. FastAPI'nin Member yanıtı) düz bir liste alır.
+        return [copy.deepcopy(book, memo) for book in self]
+
+    def __repr__(self):
+        return f"BorrowedBooks({list(self)!r})"
+
+
 @dataclass
 class Member:
     """Bir kütüphane üyesini temsil eden dataclass."""
     name: str
     member_id: int
 
-    borrowed_books: List[Book] = field(default_factory=list)
\ No newline at end of file
+    borrowed_books: BorrowedBooks = field(default_factory=BorrowedBooks)
+
+    def __post_init__(self):
+        if not isinstance(self.borrowed_books, BorrowedBooks):
+            self.borrowed_books = BorrowedBooks(self.borrowed_books)
\ No newline at end of file
@@ -0,0 +1,153 @@
+from .models import Book
+from .cache import MetadataCache
+from .metrics import timed
+import asyncio
+import httpx
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+OPEN_LIBRARY_URL = "https://openlibrary.org/search.json?isbn="
+
+# Tekrar denenecek HTTP durum kodları: hız sınırı ve geçici sunucu hataları
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def create_http_client(max_connections: int = 20, timeout: float = 10.0) -> httpx.AsyncClient:
+    """Open Library istekleri için bağlantı havuzlu bir AsyncClient oluşturur."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+class OpenLibraryClient:
+    """Open Library arama API'si için havuzlu (pooled) ve tekrar denemeli istemci.
+
+    Dışarıdan bir httpx.AsyncClient verilirse (ör. FastAPI uygulamasınınki) o kullanılır
+    ve kapatılması sahibine bırakılır. Verilmezse ilk istekte bir istemci oluşturulur
+    ve aynı olay döngüsündeki sonraki isteklerde yeniden kullanılır; böylece her ISBN
+    için yeni bağlantı ve TLS el sıkışması yapılmaz. `cache` verilirse sonuçlar
+    önbellekten karşılanır.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, retries: int = 3, backoff: float = 0.5,
+                 cache: Optional[MetadataCache] = None):
+        self._client = client
+        self.cache = cache
+        self._owns_client = client is None
+        self._client_loop = None
+        self.retries = retries
+        self.backoff = backoff
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if not self._owns_client:
+            return self._client
+        loop = asyncio.get_running_loop()
+        # Bağlantılar oluşturuldukları olay döngüsüne bağlıdır.
+        if self._client is None or self._client_loop is not loop:
+            self._client = create_http_client()
+            self._client_loop = loop
+        return self._client
+
+    async def _get(self, isbn: str) -> httpx.Response:
+        """İsteği gönderir; 429/5xx ve ağ hatalarında üstel bekleme ile tekrar dener."""
+        client = self._get_client()
+        attempt = 0
+        while True:
+            try:
+                response = await client.get(OPEN_LIBRARY_URL, params={"q": isbn})
+            except httpx.RequestError:
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.retries:
+                    response.raise_for_status()
+                    return response
+                delay = self.backoff * (2 ** attempt)
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_book(self, isbn: str) -> Book:
+        """Verilen ISBN için Open Library'deki ilk sonucu Book olarak döndürür.
+
+        Önbellekte (bulundu ya da bulunamadı olarak) kayıtlı bir ISBN için ağa çıkılmaz.
+        Sonuç yoksa ValueError, HTTP/ağ hatası veya beklenmedik veri formatında
+        IOError fırlatır; hatalar önbelleğe alınmaz.
+        """
+        metadata = self.cache.get(isbn) if self.cache is not None else None
+        if metadata is None:
+            metadata = await self._fetch_metadata(isbn)
+            if self.cache is not None:
+                self.cache.set(isbn, metadata)
+
+        if not metadata["found"]:
+            raise ValueError(f"ISBN {isbn} ile Open Library'de arama sonucu bulunamadı.")
+        return Book(
+            title=metadata["title"],
+            author=metadata["author"],
+            isbn=isbn,
+            publication_year=metadata["publication_year"]
+        )
+
+    @timed("openlibrary_fetch")
+    async def _fetch_metadata(self, isbn: str) -> dict:
+        """Open Library'ye istek atar ve ilk sonucun önbelleğe alınabilir özetini döndürür."""
+        try:
+            response = await self._get(isbn)
+            data = response.json()
+
+            if not data.get("docs") or len(data["docs"]) == 0:
+                return {"found": False}
+
+            first_result = data["docs"][0]
+            logger.info("%s ile %s sonuç bulundu.", isbn, data.get('numFound', 0))
+            return {
+                "found": True,
+                "title": first_result.get("title", "Başlık Bilinmiyor"),
+                "author": first_result.get("author_name", ["Yazar Bilinmiyor"])[0],
+                "publication_year": first_result.get("first_publish_year", 9999),
+            }
+
+        except httpx.HTTPStatusError as e:
+            raise IOError(f"API isteği başarısız oldu: Sunucu hatası {e.response.status_code}")
+
+        except httpx.RequestError:
+            raise IOError("Ağ hatası. Lütfen internet bağlantınızı kontrol edin.")
+
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+            raise IOError(f"API'den gelen veri formatı beklenmedik veya bozuk. ISBN: {isbn}")
+
+    async def aclose(self):
+        """Kendi oluşturduğu istemciyi kapatır."""
+        if self._owns_client and self._client is not None:
+            client, self._client, self._client_loop = self._client, None, None
+            await client.aclose()
+
+    def close(self):
+        """aclose()'un senkron karşılığı (ör. Library.close için).
+
+        İstemcinin döngüsü başka bir iş parçacığında çalışıyorsa kapatma oraya
+        gönderilip beklenir; çağıran bir döngünün içindeyse o döngüde göreve
+        dönüştürülür, değilse yeni bir döngüde çalıştırılır.
+        """
+        if not self._owns_client or self._client is None:
+            return
+        client, loop = self._client, self._client_loop
+        self._client = self._client_loop = None
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is not running and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        elif running is not None:
+            running.create_task(client.aclose())
+        else:
+            asyncio.run(client.aclose())
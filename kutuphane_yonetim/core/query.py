@@ -0,0 +1,147 @@
+"""Durum, yazar, tür ve yayın yılı üzerinde ikincil indeksler ve sorgu planlayıcı.
+
+Durum, yazar (fold ile katlanmış) ve kitap türü için karma indeksler, yayın yılı
+için sıralı bir indeks tutulur: yıl -> ISBN kümesi ve bisect ile aralık taranan
+sıralı yıl listesi. Her koşulun kaç kitapla eşleştiği indekslerden sabit sürede
+(yıl aralığında aralıktaki yıl sayısı kadar) okunur.
+
+Planlayıcı en seçici koşulun kümesinden başlar; diğer karma indeksleri küçükten
+büyüğe üyelik denetimiyle keser, yıl koşulu kitabın kendisinden denetlenir.
+Sayfa istenirken en seçici küme bile büyükse (ör. status=mevcut) sıralı ISBN
+taraması daha ucuzdur; tarama ilk `limit` eşleşmede biter. İki maliyet
+karşılaştırılarak biri seçilir (bkz. SecondaryIndexes.plan).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .models import BookStatus
+from .search import fold
+from .sortedkeys import SortedKeys
+from .storage import book_type_of
+
+# Bir indeks adayının, taramada okunan bir kitaba göre göreli maliyeti (aday başına
+# üyelik denetimleri, sıralama ve sonuç listesi). 100k kitapta ölçülmüştür.
+INDEX_ROW_COST = 2
+
+
+@dataclass
+class QueryPlan:
+    """Bir sorgunun nasıl yürütüleceği.
+
+    index: adayların alınacağı indeks ("status", "author", "book_type",
+    "publication_year"), ISBN sırasıyla tarama için "scan", hiçbir kitabın
+    eşleşmediği biliniyorsa "empty". estimate: o indeksin aday sayısı.
+    filters: adaylara sırasıyla uygulanacak diğer koşullar.
+    """
+    index: str
+    estimate: int
+    filters: List[str] = field(default_factory=list)
+
+
+def _add(index: Dict[Hashable, Set[str]], key: Hashable, isbn: str):
+    index.setdefault(key, set()).add(isbn)
+
+
+def _discard(index: Dict[Hashable, Set[str]], key: Hashable, isbn: str):
+    keys = index.get(key)
+    if keys is not None:
+        keys.discard(isbn)
+        if not keys:
+            del index[key]
+
+
+class SecondaryIndexes:
+    """Kitapların durum, yazar, tür ve yayın yılı indeksleri.
+
+    Kitabın durumu ödünç verme/iade ile değiştiğinde move_status() çağrılmalıdır;
+    diğer alanlar kitap eklendikten sonra değişmez.
+    """
+
+    def __init__(self, books: Iterable = ()):
+        self._status: Dict[BookStatus, Set[str]] = {}
+        self._author: Dict[str, Set[str]] = {}
+        self._type: Dict[str, Set[str]] = {}
+        self._year: Dict[int, Set[str]] = {}
+        self._years: SortedKeys[int] = SortedKeys()
+        for book in books:
+            self.add(book)
+
+    def add(self, book):
+        _add(self._status, book.status, book.isbn)
+        _add(self._author, fold(book.author), book.isbn)
+        _add(self._type, book_type_of(book), book.isbn)
+        if book.publication_year not in self._year:
+            self._years.add(book.publication_year)
+        _add(self._year, book.publication_year, book.isbn)
+
+    def remove(self, book):
+        _discard(self._status, book.status, book.isbn)
+        _discard(self._author, fold(book.author), book.isbn)
+        _discard(self._type, book_type_of(book), book.isbn)
+        _discard(self._year, book.publication_year, book.isbn)
+        if book.publication_year not in self._year:
+            self._years.discard(book.publication_year)
+
+    def move_status(self, isbn: str, old: BookStatus, new: BookStatus):
+        if old != new:
+            _discard(self._status, old, isbn)
+            _add(self._status, new, isbn)
+
+    ### Planlama ###
+
+    def _years_between(self, year_from: Optional[int], year_to: Optional[int]) -> List[int]:
+        years = []
+        for year in self._years.irange(None if year_from is None else year_from - 1):
+            if year_to is not None and year > year_to:
+                break
+            years.append(year)
+        return years
+
+    def _hash_filters(self, status, author, book_type) -> Dict[str, Set[str]]:
+        """Verilen karma koşulların eşleşen ISBN kümeleri."""
+        sets = {}
+        if status is not None:
+            sets["status"] = self._status.get(status, set())
+        if author is not None:
+            sets["author"] = self._author.get(fold(author), set())
+        if book_type is not None:
+            sets["book_type"] = self._type.get(book_type, set())
+        return sets
+
+    def plan(self, total: int, limit: Optional[int] = None, status: Optional[BookStatus] = None,
+             author: Optional[str] = None, year_from: Optional[int] = None, year_to: Optional[int] = None,
+             book_type: Optional[str] = None) -> QueryPlan:
+        """En ucuz yürütme planını seçer.
+
+        İndeks planının maliyeti adayları dolaşıp sıralamaktır (INDEX_ROW_COST * k).
+        Tarama, en seçici koşulun oranıyla eşleşmelerin katalogda düzgün
+        dağıldığı varsayılarak `limit` eşleşme bulunana kadar okunacak kitap
+        sayısıdır; limit yoksa tüm katalog.
+        """
+        estimates = {name: len(isbns) for name, isbns in self._hash_filters(status, author, book_type).items()}
+        if year_from is not None or year_to is not None:
+            estimates["publication_year"] = sum(len(self._year[year])
+                                                for year in self._years_between(year_from, year_to))
+        if not estimates:
+            return QueryPlan("scan", total)
+        order = sorted(estimates, key=estimates.get)
+        best, estimate = order[0], estimates[order[0]]
+        if estimate == 0:
+            return QueryPlan("empty", 0)
+        index_cost = INDEX_ROW_COST * estimate
+        scan_cost = total if limit is None else min(total, limit * total / estimate)
+        if scan_cost < index_cost:
+            return QueryPlan("scan", total, order)
+        return QueryPlan(best, estimate, order[1:])
+
+    def candidates(self, plan: QueryPlan, status: Optional[BookStatus] = None, author: Optional[str] = None,
+                   year_from: Optional[int] = None, year_to: Optional[int] = None,
+                   book_type: Optional[str] = None) -> Tuple[Iterable[str], List[Set[str]]]:
+        """İndeks planının adayları ve adayların üye olması gereken diğer kümeler
+        (en seçiciden başlayarak). Yıl koşulu bu kümelere girmez."""
+        sets = self._hash_filters(status, author, book_type)
+        if plan.index == "publication_year":
+            candidates = [isbn for year in self._years_between(year_from, year_to) for isbn in self._year[year]]
+        else:
+            candidates = sets[plan.index]
+        return candidates, [sets[name] for name in plan.filters if name in sets]
@@ -0,0 +1,143 @@
+import heapq
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+from .sortedkeys import SortedKeys
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Alan ağırlıkları: başlıkta geçen terim yazarda geçenden daha değerlidir.
+TITLE_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+
+
+def fold(text: str) -> str:
+    """Metni Türkçe kurallarına uygun şekilde küçük harfe katlar.
+
+    str.lower() 'İ' harfini 'i' + birleşik nokta (U+0307) yapar ve 'I' harfini 'i'
+    kabul eder; burada önce İ->i, I->ı dönüşümü yapılır. Büyük harfli yazımda
+    (ör. "ISPARTA", "INFERNO") noktalı/noktasız ayrımı anlaşılamadığından eşleşmede
+    'ı' ile 'i' aynı sayılır.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("İ", "i").replace("I", "ı").lower()
+    return text.replace("\u0307", "").replace("ı", "i")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+class SearchIndex:
+    """Kitap başlıkları ve yazarları üzerinde artımlı güncellenen ters indeks.
+
+    Her terim için hangi kitaplarda (ISBN) ve hangi alanda geçtiği tutulur.
+    Sıralı terim listesi üzerinde ikili arama ile önek (prefix) eşleşmesi yapılır.
+    Çok terimli sorgular VE (AND) ile birleştirilir: önce en az kitapla eşleşen
+    terimin adayları çıkarılır, diğer terimler yalnızca bu adaylar üzerinde denenir.
+    """
+
+    def __init__(self):
+        # terim -> {isbn: alan ağırlığı (başlık/yazar bitleri)}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # isbn -> {terim: alan ağırlığı}; silme ve aday puanlama için
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        # önek araması için sıralı terim kümesi
+        self._vocabulary: SortedKeys[str] = SortedKeys()
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add(self, isbn: str, title: str, author: str):
+        if isbn in self._doc_terms:
+            self.remove(isbn)
+        terms: Dict[str, int] = {}
+        for token in tokenize(title):
+            terms[token] = terms.get(token, 0) | TITLE_WEIGHT
+        for token in tokenize(author):
+            terms[token] = terms.get(token, 0) | AUTHOR_WEIGHT
+        self._doc_terms[isbn] = terms
+        for token, weight in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary.add(token)
+            postings[isbn] = weight
+
+    def remove(self, isbn: str):
+        terms = self._doc_terms.pop(isbn, None)
+        if not terms:
+            return
+        for token in terms:
+            postings = self._postings[token]
+            del postings[isbn]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary.discard(token)
+
+    def _expand(self, term: str) -> List[str]:
+        """Verilen önekle başlayan tüm indeks terimlerini döndürür."""
+        return self._vocabulary.prefixed(term)
+
+    @staticmethod
+    def _score(term: str, token: str, weight: int) -> int:
+        # Önce alan belirleyicidir (başlık > yazar); aynı alanda tam eşleşme
+        # önek eşleşmesinin önüne geçer.
+        field_score = TITLE_WEIGHT if weight & TITLE_WEIGHT else AUTHOR_WEIGHT
+        return field_score * 2 + (token == term)
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, int]]:
+        """Sorgudaki tüm terimleri (önek olarak) içeren kitapları puanlarıyla döndürür.
+        Sonuçlar puana göre azalan sırada, eşitlikte ISBN'e göre sıralıdır."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        expansions = {term: self._expand(term) for term in terms}
+        if any(not tokens for tokens in expansions.values()):
+            return []
+
+        # En seçici terimden başla.
+        terms.sort(key=lambda t: sum(len(self._postings[token]) for token in expansions[t]))
+        first, rest = terms[0], terms[1:]
+
+        scores: Dict[str, int] = {}
+        for token in expansions[first]:
+            # Ağırlık yalnızca üç değer alabilir; puanı terim başına bir kez hesapla.
+            table = {weight: self._score(first, token, weight)
+                     for weight in (AUTHOR_WEIGHT, TITLE_WEIGHT, TITLE_WEIGHT | AUTHOR_WEIGHT)}
+            postings = self._postings[token]
+            if not scores:
+                scores = {isbn: table[weight] for isbn, weight in postings.items()}
+                continue
+            for isbn, weight in postings.items():
+                score = table[weight]
+                if score > scores.get(isbn, 0):
+                    scores[isbn] = score
+
+        for term in rest:
+            narrowed = {}
+            for isbn, score in scores.items():
+                best = 0
+                for token, weight in self._doc_terms[isbn].items():
+                    if token.startswith(term):
+                        best = max(best, self._score(term, token, weight))
+                if best:
+                    narrowed[isbn] = score + best
+            scores = narrowed
+            if not scores:
+                return []
+
+        # Puanlar küçük tam sayılardır: kovalara ayırıp en yüksekten başlayarak
+        # yalnızca gereken kadar ISBN seçmek, tüm adayları anahtarla sıralamaktan ucuzdur.
+        buckets: Dict[int, List[str]] = {}
+        for isbn, score in scores.items():
+            buckets.setdefault(score, []).append(isbn)
+        results: List[Tuple[str, int]] = []
+        for score in sorted(buckets, reverse=True):
+            needed = limit - len(results)
+            if needed <= 0:
+                break
+            results.extend((isbn, score) for isbn in heapq.nsmallest(needed, buckets[score]))
+        return results
@@ -0,0 +1,390 @@
+"""Kitapları ISBN'e göre parça dosyalarına bölen JSON depolama katmanı.
+
+Tek bir library.json'da açılış da tam kaydetme de tüm kataloğu tek iş
+parçacığında işler. Burada veri bir dizinde tutulur:
+
+- `books-NNN.<sıra>.json`: ISBN'in CRC32'sine göre N parçaya bölünmüş kitaplar,
+  kitap sürümleri, silinen kitapların ve iade edilen ödünçlerin mezar taşları ve
+  bu kitapların ödünçleri;
+  ayrıca üye numarasının CRC32'si bu parçaya düşen üyelerin sürümleri,
+- `members.<sıra>.json`: üyeler,
+- `manifest.json`: parça sayısı, her parçanın geçerli dosyası, kütüphane
+  sürümü ve (günlük açıksa) dahil edilen son günlük sırası.
+
+Açılışta kitap parçaları bir ProcessPoolExecutor'da paralel okunup doğrulanır;
+işçiler sonucu sütunlar (snapshot.BookColumns) olarak döndürdüğünden süreçler
+arası aktarım ucuzdur ve kompakt katalog sütunları olduğu gibi devralır.
+
+Kaydetmede yalnızca son yazmadan bu yana değişen parçalar yeni bir sıra
+numarasıyla yazılır, ardından manifest atomik olarak değiştirilir; manifest
+değişene kadar eski dosyalar geçerlidir, böylece yarıda kesilen bir kaydetme
+veriyi bozmaz. Değişmeyen parçalara dokunulmaz. Bir ödünç/iade yalnızca
+kitabın ve üyenin parçasını (çoğu zaman ikisi de aynı dosya değildir) yeniden
+yazar; tüm ödünçleri tutan tek bir dosya yoktur.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from .journal import Journal
+from .metrics import BYTES_WRITTEN, SAVE_BYTES, timed
+from .models import Member
+from .snapshot import BookColumns, to_columns
+from .storage import LoadedData, StorageBackend, book_from_dict, book_to_dict
+
+logger = logging.getLogger(__name__)
+
+# 2: ödünçler ve üye sürümleri kitap parçalarında (1'de tek bir loans dosyasında).
+FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+MEMBERS = "members"
+# Yalnızca 1. biçimde; okunur ve sonraki kaydetmede parçalara taşınır.
+LOANS = "loans"
+# Bundan küçük kataloglarda süreç havuzunu başlatmak okumadan pahalıdır; parçalar sırayla okunur.
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+_DATA_FILE_RE = re.compile(r"^(books-\d+|members|loans)\.\d+\.json$")
+
+
+def shard_of(isbn: str, shards: int) -> int:
+    """ISBN'in parça numarası. hash() süreç başına tuzlandığından CRC32 kullanılır."""
+    return zlib.crc32(isbn.encode("utf-8")) % shards
+
+
+def member_shard_of(member_id: int, shards: int) -> int:
+    """Üye sürümünün tutulduğu parçanın numarası."""
+    return shard_of(str(member_id), shards)
+
+
+def shard_name(index: int) -> str:
+    return f"books-{index:03d}"
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data) -> int:
+    """Veriyi geçici dosya üzerinden atomik olarak yazar ve bayt sayısını döndürür."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def _read_book_shard(path: str) -> Tuple[BookColumns, array, dict]:
+    """Bir kitap parçasını okuyup doğrular; sütunları, ISBN'lerle hizalı kitap
+    sürümlerini ve dosyanın geri kalanını (mezar taşları, ödünçler, üye
+    sürümleri) döndürür. İşçi süreçte çalışır."""
+    try:
+        data = _read_json(path)
+        versions = data.pop("versions", {})
+        columns = to_columns(book_from_dict(book_data) for book_data in data.pop("books", []))
+    except (OSError, ValueError, TypeError, KeyError, OverflowError) as e:
+        # Pydantic hataları her zaman süreçler arası aktarılamaz; düz bir ValueError'a çevrilir.
+        # OverflowError: yıl, sütunun tamsayı türüne sığmıyor.
+        raise ValueError(f"Parça dosyası okunamadı ({path}): {e}") from None
+    return columns, array("Q", [versions.get(isbn, 0) for isbn in columns.isbns]), data
+
+
+class ShardedStorage(StorageBackend):
+    """Kitapları ve ödünçlerini `shards` parça dosyasına bölen, üyeleri ayrı bir
+    dosyada tutan depolama katmanı. `path` bir dizindir.
+
+    Parça sayısı yalnızca yeni bir düzen için kullanılır; var olan bir dizin
+    manifest'teki sayıyla açılır, reshard() ile değiştirilir. `workers` açılışta
+    kullanılacak süreç sayısıdır (varsayılan çekirdek sayısı).
+
+    journal=True ise değişiklikler JSONStorage'daki gibi günlüğe eklenir ve
+    snapshot_every kayıtta bir değişen parçalar yazılır; değilse her commit()
+    yalnızca değişen parçaları yazar. Paylaşımlı (çok süreçli) mod desteklenmez.
+
+    Bozuk veya eksik bir parça dosyası açılışı ValueError ile durdurur; tek
+    dosyalı katmanın aksine boş başlanmaz, çünkü sonraki kaydetme diğer
+    parçaları bu boş durumla değiştirirdi.
+    """
+
+    def __init__(self, path: str, shards: int = 16, journal: bool = False, snapshot_every: int = 1000,
+                 workers: Optional[int] = None):
+        if shards < 1:
+            raise ValueError("Parça sayısı en az 1 olmalıdır.")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.shards = shards
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = os.path.join(path, MANIFEST)
+        self.journal = Journal(os.path.join(path, "journal")) if journal else None
+        self.snapshot_every = snapshot_every
+        # Parça adı (ör. "books-003") -> manifest'teki geçerli dosya adı
+        self._files: Dict[str, str] = {}
+        self._write_seq = 0
+        # Parça numarası -> içindeki ISBN'ler; bir parçayı yazmak tüm kataloğu dolaşmasın diye.
+        self._shard_isbns: Optional[List[Set[str]]] = None
+        # Son yazmadan bu yana değişen parçaların adları
+        self._changed: Set[str] = set()
+        self._signature = None
+        self._signature_lock = threading.Lock()
+        # Kaydedilemeyen değişiklik varsa True olur, flush() tekrar dener.
+        self.dirty = False
+
+    def _names(self) -> List[str]:
+        return [shard_name(index) for index in range(self.shards)] + [MEMBERS]
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def has_external_changes(self) -> bool:
+        with self._signature_lock:
+            if self._file_signature() != self._signature:
+                return True
+        return self.journal is not None and self.journal.has_new_records()
+
+    def read_changes(self) -> Optional[List[dict]]:
+        with self._signature_lock:
+            if self._file_signature() != self._signature:
+                return None
+        if self.journal is None:
+            return []
+        return self.journal.read_new()
+
+    ### Okuma ###
+
+    def load(self) -> LoadedData:
+        """Manifest'teki parçaları okur; günlük açıksa sonraki kayıtları da döndürür."""
+        with self._signature_lock:
+            self._signature = self._file_signature()
+        self._changed = set()
+        try:
+            manifest = _read_json(self.manifest_path)
+        except FileNotFoundError:
+            manifest = None
+        except ValueError as e:
+            raise ValueError(f"Manifest okunamadı ({self.manifest_path}): {e}") from None
+
+        journal_seq = 0
+        if manifest is None:
+            logger.info("Parça dizini boş. Kütüphane boş olarak başlatılıyor.")
+            self._files, self._write_seq = {}, 0
+            self._shard_isbns = [set() for _ in range(self.shards)]
+            loaded = LoadedData(books=[], members=[])
+        else:
+            if manifest.get("format") not in (1, FORMAT_VERSION):
+                raise ValueError(f"Desteklenmeyen parça biçimi: {manifest.get('format')}")
+            loaded = self._load_manifest(manifest)
+            journal_seq = manifest.get("journal_seq", 0)
+        self._remove_unreferenced()
+
+        if self.journal is not None:
+            loaded.records = self.journal.replay(after_seq=journal_seq)
+            # Günlükten uygulanan değişiklikler parçalarda henüz yok; günlük
+            # boşaltılmadan önce yazılmaları gerekir.
+            for record in loaded.records:
+                self._track(record)
+            if loaded.records:
+                logger.info("Günlükten %d işlem yeniden uygulanacak.", len(loaded.records))
+        return loaded
+
+    def _load_manifest(self, manifest: dict) -> LoadedData:
+        self.shards = manifest["shards"]
+        self._files = dict(manifest["files"])
+        self._write_seq = manifest["write_seq"]
+        paths = [os.path.join(self.path, self._files[shard_name(index)]) for index in range(self.shards)]
+
+        columns, book_versions, deleted, returned, member_versions = BookColumns(), array("Q"), {}, {}, {}
+        # member_id -> [(ödünç sürümü, ISBN)]; üyenin kitapları ödünç alma sırasıyla yüklenir.
+        loans: Dict[int, List[Tuple[int, str]]] = {}
+        self._shard_isbns = []
+        for shard_columns, shard_versions, rest in self._read_book_shards(paths):
+            columns.extend(shard_columns)
+            book_versions.extend(shard_versions)
+            deleted.update(rest.get("deleted", {}))
+            returned.update(rest.get("returned", {}))
+            member_versions.update(rest.get("member_versions", {}))
+            for isbn, (member_id, version) in rest.get("loans", {}).items():
+                loans.setdefault(member_id, []).append((version, isbn))
+            self._shard_isbns.append(set(shard_columns.isbns))
+
+        try:
+            members_data = _read_json(os.path.join(self.path, self._files[MEMBERS]))
+            if LOANS in self._files:
+                loans_data = _read_json(os.path.join(self.path, self._files[LOANS]))
+                for position, (member_id, isbn) in enumerate(loans_data["loans"]):
+                    loans.setdefault(member_id, []).append((position, isbn))
+                member_versions.update(loans_data.get("member_versions", {}))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Üye veya ödünç dosyası okunamadı: {e}") from None
+        members = [(Member(**member_data), [isbn for _, isbn in sorted(loans.get(member_data["member_id"], []))])
+                   for member_data in members_data["members"]]
+
+        versions = {"version": manifest["version"], "book": (columns.isbns, book_versions),
+                    "member": member_versions, "deleted_book": deleted, "returned_loan": returned}
+        logger.info("%d kitap ve %d üye %d parçadan yüklendi.", len(columns), len(members), self.shards)
+        return LoadedData(books=columns, members=members, versions=versions)
+
+    def _read_book_shards(self, paths: List[str]) -> list:
+        """Parçaları yeterince büyükse süreç havuzunda paralel, değilse sırayla okur."""
+        workers = min(self.workers, len(paths))
+        try:
+            total = sum(os.path.getsize(path) for path in paths)
+        except OSError as e:
+            raise ValueError(f"Parça dosyası bulunamadı: {e}") from None
+        if workers <= 1 or total < PARALLEL_MIN_BYTES:
+            return [_read_book_shard(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_read_book_shard, paths))
+
+    def _remove_unreferenced(self):
+        """Yarıda kalmış kaydetmelerden ve eski düzenlerden kalan dosyaları siler."""
+        referenced = set(self._files.values())
+        for filename in os.listdir(self.path):
+            if _DATA_FILE_RE.match(filename) and filename not in referenced:
+                os.remove(os.path.join(self.path, filename))
+
+    ### Yazma ###
+
+    def _track(self, record: dict):
+        """Kaydın değiştirdiği parçaları işaretler ve parçaların ISBN kümelerini günceller."""
+        op = record["op"]
+        if op in ("add_book", "delete_book", "borrow", "return"):
+            isbn = record["book"]["isbn"] if op == "add_book" else record["isbn"]
+            index = shard_of(isbn, self.shards)
+            self._changed.add(shard_name(index))
+            if self._shard_isbns is not None and index < len(self._shard_isbns):
+                if op == "add_book":
+                    self._shard_isbns[index].add(isbn)
+                elif op == "delete_book":
+                    self._shard_isbns[index].discard(isbn)
+        if op == "register_member":
+            self._changed.add(MEMBERS)
+        # Kayıt ve her ödünç/iade üyenin sürümünü, dolayısıyla üyenin parçasını değiştirir.
+        if op in ("register_member", "borrow", "return"):
+            self._changed.add(shard_name(member_shard_of(record["member_id"], self.shards)))
+
+    @timed("commit")
+    def commit(self, library, records: List[dict]):
+        """Günlük açıksa kayıtları ekler, değilse değişen parçaları yazar."""
+        for record in records:
+            self._track(record)
+        if self.journal is None:
+            self.save_all(library)
+            return
+        try:
+            self.journal.append_many(records)
+        except OSError as e:
+            self.dirty = True
+            raise IOError(f"İşlem günlüğe yazılamadı: {e}")
+        if self.journal.pending >= self.snapshot_every:
+            try:
+                self.save_all(library)
+            except IOError:
+                # Kayıtlar günlükte zaten kalıcı; tam yazma `dirty` ile sonra yeniden denenir.
+                pass
+
+    @timed("save")
+    def save_all(self, library):
+        """Son yazmadan bu yana değişen parçaları (düzen yeniyse veya parça sayısı
+        değiştiyse tümünü) yazar ve manifest'i değiştirir. Günlük açıksa ardından
+        boşaltılır. Yazma süresince Library'deki değişiklikler bekletilir."""
+        with library._state_lock.exclusive():
+            self._save_all(library)
+
+    def reshard(self, library, shards: int):
+        """Kitapları `shards` parçaya yeniden böler ve tüm dosyaları yazar."""
+        if shards < 1:
+            raise ValueError("Parça sayısı en az 1 olmalıdır.")
+        self.shards = shards
+        self.save_all(library)
+
+    def _save_all(self, library):
+        try:
+            full = set(self._files) != set(self._names())
+            if full or self._shard_isbns is None or len(self._shard_isbns) != self.shards:
+                self._shard_isbns = [set() for _ in range(self.shards)]
+                for isbn in library._books:
+                    self._shard_isbns[shard_of(isbn, self.shards)].add(isbn)
+            names = self._names() if full else sorted(self._changed)
+
+            seq = self._write_seq + 1
+            written, size = {}, 0
+            for name in names:
+                filename = f"{name}.{seq}.json"
+                size += _write_json(os.path.join(self.path, filename), self._shard_data(library, name))
+                written[name] = filename
+            files = written if full else {**self._files, **written}
+            manifest = {"format": FORMAT_VERSION, "shards": self.shards, "write_seq": seq,
+                        "version": library._versions.version, "files": files}
+            if self.journal is not None:
+                manifest["journal_seq"] = self.journal.last_seq
+            with self._signature_lock:
+                size += _write_json(self.manifest_path, manifest)
+                self._signature = self._file_signature()
+
+            stale = [filename for name, filename in self._files.items() if files.get(name) != filename]
+            self._files, self._write_seq = files, seq
+            self._changed = set()
+            self.dirty = False
+            SAVE_BYTES.observe(size, "shards")
+            BYTES_WRITTEN.inc("shards", amount=size)
+            for filename in stale:
+                try:
+                    os.remove(os.path.join(self.path, filename))
+                except FileNotFoundError:
+                    pass
+            if self.journal is not None:
+                self.journal.reset()
+
+        except Exception as e:
+            self.dirty = True
+            logger.exception("Parçalar kaydedilirken bir sorun oluştu: %s", e)
+            raise IOError(f"Parçalar yazılamadı: {e}") from e
+
+    def _shard_data(self, library, name: str) -> dict:
+        versions = library._versions
+        if name == MEMBERS:
+            return {"members": [{"name": member.name, "member_id": member.member_id}
+                                for member in library._members.values()]}
+        index = int(name.split("-")[1])
+        books, book_versions, loans = [], {}, {}
+        for isbn in sorted(self._shard_isbns[index]):
+            book = library._books.get(isbn)
+            if book is None:
+                continue
+            books.append(book_to_dict(book))
+            version = versions.get("book", isbn)
+            if version:
+                book_versions[isbn] = version
+            member_id = library._borrowers.get(isbn)
+            if member_id is not None:
+                # Ödünçteki kitabın sürümü ödünç verildiği sürümdür; açılışta sıralama için saklanır.
+                loans[isbn] = [member_id, version]
+        deleted = {isbn: version for isbn, version in versions.items("deleted_book", 0)
+                   if shard_of(isbn, self.shards) == index}
+        returned = {isbn: version for isbn, version in versions.items("returned_loan", 0)
+                    if shard_of(isbn, self.shards) == index}
+        member_versions = {str(key): version for key, version in versions.items("member", 0)
+                           if member_shard_of(key, self.shards) == index}
+        return {"books": books, "versions": book_versions, "deleted": deleted, "returned": returned,
+                "loans": loans, "member_versions": member_versions}
+
+    def flush(self, library):
+        if self.dirty:
+            self.save_all(library)
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
@@ -0,0 +1,105 @@
+"""Yavaş işlem günlüğü: eşiği aşan Library çağrılarını ve API isteklerini aşama
+aşama süre dökümüyle loglar.
+
+Bir iz (Trace) bir API isteği veya dışarıdan yapılan bir Library çağrısı boyunca
+ContextVar'da tutulur; metrics.timed ile ölçülen her işlem (reload, borrow,
+commit, save, openlibrary_fetch...) ize bir aşama olarak eklenir. İz bittiğinde
+toplam süre eşiği aşmışsa "kutuphane_yonetim.slow" loguna tek satırlık JSON
+yazılır; kayıt ayrıca log kaydının `slow_operation` özniteliğinde sözlük olarak
+bulunur. Eşik verilmemişse (varsayılan) hiçbir şey kaydedilmez.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("kutuphane_yonetim.slow")
+
+_threshold: Optional[float] = None
+_current: ContextVar[Optional["Trace"]] = ContextVar("kutuphane_slowlog_trace", default=None)
+
+
+def configure(threshold: Optional[float]):
+    """Eşiği saniye cinsinden ayarlar; None günlüğü kapatır."""
+    global _threshold
+    _threshold = threshold
+
+
+def enabled() -> bool:
+    return _threshold is not None
+
+
+class Trace:
+    """Bir istek veya Library çağrısının aşamaları: (ad, başlangıç, süre, derinlik)."""
+    __slots__ = ("kind", "name", "start", "depth", "phases")
+
+    def __init__(self, kind: str, name: str, start: float = None):
+        self.kind = kind
+        self.name = name
+        self.start = time.perf_counter() if start is None else start
+        self.depth = 0
+        self.phases: List[Tuple[str, float, float, int]] = []
+
+    def add(self, phase: str, start: float, seconds: float, depth: int = 0):
+        self.phases.append((phase, start, seconds, depth))
+
+    def finish(self, seconds: float = None, **fields):
+        """İz eşiği aştıysa loglar. Üst düzey aşamalara düşmeyen süre `other_ms`
+        olarak verilir (API isteklerinde yönlendirme, doğrulama ve serileştirme)."""
+        if _threshold is None:
+            return
+        if seconds is None:
+            seconds = time.perf_counter() - self.start
+        if seconds < _threshold:
+            return
+        phases = sorted(self.phases, key=lambda phase: phase[1])
+        accounted = sum(duration for _, _, duration, depth in phases if depth == 0)
+        record = {
+            "kind": self.kind,
+            "name": self.name,
+            "duration_ms": round(seconds * 1e3, 3),
+            **fields,
+            "phases": [{"phase": phase, "at_ms": round((start - self.start) * 1e3, 3),
+                        "ms": round(duration * 1e3, 3), "depth": depth}
+                       for phase, start, duration, depth in phases],
+            "other_ms": round(max(seconds - accounted, 0.0) * 1e3, 3),
+        }
+        logger.warning("%s", json.dumps(record, ensure_ascii=False), extra={"slow_operation": record})
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+def begin(trace: Trace):
+    """İzi geçerli bağlamın izi yapar; end() için bir belirteç döndürür."""
+    return _current.set(trace)
+
+
+def end(token):
+    _current.reset(token)
+
+
+def enter(operation: str, start: float):
+    """Ölçülen bir işlemin başlangıcı (metrics.timed). Etkin bir iz yoksa işlem
+    kendi izini başlatır. leave() için bir tanıtıcı döndürür; günlük kapalıysa None."""
+    if _threshold is None:
+        return None
+    trace = _current.get()
+    token = None
+    if trace is None:
+        trace = Trace("library", operation, start)
+        token = _current.set(trace)
+    depth = trace.depth
+    trace.depth += 1
+    return trace, token, depth
+
+
+def leave(handle, operation: str, start: float, seconds: float):
+    trace, token, depth = handle
+    trace.depth = depth
+    trace.add(operation, start, seconds, depth)
+    if token is not None:
+        _current.reset(token)
+        trace.finish(seconds)
@@ -0,0 +1,206 @@
+import marshal
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .compact import _FORMAT_POOL, _trusted_model, BOOK_TYPES, STATUSES, YEAR_TYPECODE
+from .models import AudioBook, Book, BookStatus, EBook, Member
+
+# Başlık: sihirli dizi, biçim sürümü, yazan Python'un ana/alt sürümü,
+# yük uzunluğu ve yükün CRC32 sağlaması (küçük sonlu).
+MAGIC = b"KTPSNAP\x00"
+# 2: yıllar array(YEAR_TYPECODE) olarak yazılır (1'de array('H')).
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sHBBQI")
+
+# BookStatus bir str alt sınıfı olduğundan düz metin durumlar da aynı koda eşlenir.
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_TYPE_CODES = {Book: 0, EBook: 1, AudioBook: 2}
+
+
+@dataclass
+class BookColumns:
+    """Anlık görüntüdeki kitaplar, sütun sütun.
+
+    Yinelendiğinde Pydantic modelleri üretir; kompakt katalog ise sütunları
+    doğrudan devralır ve kitap başına hiç nesne oluşturmaz (CompactCatalogue.load_columns).
+    """
+    isbns: List[str] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    authors: List[str] = field(default_factory=list)
+    years: array = field(default_factory=lambda: array(YEAR_TYPECODE))
+    statuses: array = field(default_factory=lambda: array("B"))
+    types: array = field(default_factory=lambda: array("B"))
+    file_formats: Dict[str, str] = field(default_factory=dict)
+    durations: Dict[str, int] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.isbns)
+
+    def __iter__(self) -> Iterator[Union[Book, EBook, AudioBook]]:
+        # Sütunlar yazılırken doğrulanmış modellerden geldiği için doğrulama
+        # tekrar çalıştırılmaz; _trusted_model model_validate'in yaklaşık yarısı kadar sürer.
+        file_formats, durations = self.file_formats, self.durations
+        for isbn, title, author, year, status, book_type in zip(
+                self.isbns, self.titles, self.authors, self.years, self.statuses, self.types):
+            fields = {"title": title, "author": author, "publication_year": year, "isbn": isbn,
+                      "status": STATUSES[status]}
+            if book_type == 1:
+                fields["file_format"] = file_formats[isbn]
+                yield _trusted_model(EBook, fields)
+            elif book_type == 2:
+                fields["duration_in_minutes"] = durations[isbn]
+                yield _trusted_model(AudioBook, fields)
+            else:
+                yield _trusted_model(Book, fields)
+
+    def extend(self, other: "BookColumns"):
+        """Başka bir sütun kümesini (ör. bir parça dosyasınınkini) sona ekler."""
+        self.isbns.extend(other.isbns)
+        self.titles.extend(other.titles)
+        self.authors.extend(other.authors)
+        self.years.extend(other.years)
+        self.statuses.extend(other.statuses)
+        self.types.extend(other.types)
+        self.file_formats.update(other.file_formats)
+        self.durations.update(other.durations)
+
+
+def to_columns(books: Iterable) -> BookColumns:
+    """Kitapları (model veya BookView) sütunlara çevirir."""
+    columns = BookColumns()
+    author_pool: Dict[str, str] = {}
+    for book in books:
+        isbn = book.isbn
+        columns.isbns.append(isbn)
+        columns.titles.append(book.title)
+        # Aynı nesne tekrar yazıldığında marshal yalnızca bir referans yazar; okunan
+        # yazar ve format dizgeleri de böylece paylaşılan nesneler olarak gelir.
+        columns.authors.append(author_pool.setdefault(book.author, book.author))
+        columns.years.append(book.publication_year)
+        columns.statuses.append(_STATUS_CODES[book.status])
+        # Pydantic modellerinde isinstance ve olmayan özniteliğe getattr pahalıdır;
+        # tür kodu sınıftan bulunur, bilinmeyen sınıflar (BookView) kendi türünü söyler.
+        book_type = _TYPE_CODES.get(type(book))
+        if book_type is None:
+            book_type = BOOK_TYPES.index(book.book_type)
+        columns.types.append(book_type)
+        if book_type == 1:
+            columns.file_formats[isbn] = _FORMAT_POOL.setdefault(book.file_format, book.file_format)
+        elif book_type == 2:
+            columns.durations[isbn] = book.duration_in_minutes
+    return columns
+
+
+@dataclass
+class Snapshot:
+    books: BookColumns
+    # (üye, ödünç aldığı ISBN'ler) ikilileri
+    members: List[Tuple[Member, List[str]]]
+    # VersionTracker.load() biçiminde; "book" değeri (ISBN'ler, sürümler) sütun ikilisidir.
+    versions: Optional[dict]
+    journal_seq: int
+
+
+def write_snapshot(path: str, books: Iterable, members: Iterable[Tuple[int, str, List[str]]],
+                   versions: Optional[dict], journal_seq: int, source_signature):
+    """Kitapları ve üyeleri ikili anlık görüntü dosyasına atomik olarak yazar.
+
+    `source_signature` anlık görüntünün yansıttığı JSON dosyasının (mtime_ns, boyut)
+    ikilisidir; okurken eşleşmezse anlık görüntü bayat sayılır.
+    """
+    columns = to_columns(books)
+
+    member_ids, member_names, loans = [], [], {}
+    for member_id, name, isbns in members:
+        member_ids.append(member_id)
+        member_names.append(name)
+        if isbns:
+            loans[member_id] = list(isbns)
+
+    # Kitap sürümleri ISBN sütunuyla hizalı bir array('Q') olarak yazılır; açılışta
+    # bir milyon girdilik sözlük kurmak yerine dizi olduğu gibi devralınır.
+    versions = dict(versions or {})
+    book_versions = versions.pop("book", {})
+    version_column = array("Q", [book_versions.get(isbn, 0) for isbn in columns.isbns])
+
+    payload = marshal.dumps({
+        "byteorder": sys.byteorder,
+        "source_signature": tuple(source_signature),
+        "journal_seq": journal_seq,
+        "versions": versions,
+        "book_versions": version_column.tobytes(),
+        "isbns": columns.isbns,
+        "titles": columns.titles,
+        "authors": columns.authors,
+        "years": columns.years.tobytes(),
+        "statuses": columns.statuses.tobytes(),
+        "types": columns.types.tobytes(),
+        "file_formats": columns.file_formats,
+        "durations": columns.durations,
+        "member_ids": member_ids,
+        "member_names": member_names,
+        "loans": loans,
+    })
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, sys.version_info[0], sys.version_info[1],
+                          len(payload), zlib.crc32(payload))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str, source_signature) -> Optional[Snapshot]:
+    """Anlık görüntüyü okur. Dosya yoksa, başlığı/sürümü uyumsuzsa, sağlaması
+    tutmuyorsa veya `source_signature` ile yazılmamışsa (bayatsa) None döndürür."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, py_major, py_minor, length, checksum = _HEADER.unpack_from(mm)
+                # marshal biçimi Python sürümleri arasında değişebilir.
+                if (magic != MAGIC or version != FORMAT_VERSION
+                        or (py_major, py_minor) != sys.version_info[:2]
+                        or len(mm) != _HEADER.size + length):
+                    return None
+                with memoryview(mm) as view:
+                    payload = view[_HEADER.size:]
+                    try:
+                        if zlib.crc32(payload) != checksum:
+                            return None
+                        data = marshal.loads(payload)
+                    finally:
+                        payload.release()
+    except (FileNotFoundError, ValueError, EOFError, TypeError):
+        return None
+
+    if tuple(data["source_signature"]) != tuple(source_signature):
+        return None
+
+    years, book_versions = array(YEAR_TYPECODE), array("Q")
+    years.frombytes(data["years"])
+    book_versions.frombytes(data["book_versions"])
+    if data["byteorder"] != sys.byteorder:
+        years.byteswap()
+        book_versions.byteswap()
+    versions = data["versions"]
+    if versions:
+        versions["book"] = (data["isbns"], book_versions)
+    columns = BookColumns(
+        isbns=data["isbns"], titles=data["titles"], authors=data["authors"], years=years,
+        statuses=array("B", data["statuses"]), types=array("B", data["types"]),
+        file_formats=data["file_formats"], durations=data["durations"])
+    loans = data["loans"]
+    members = [(Member(name=name, member_id=member_id), loans.get(member_id, []))
+               for member_id, name in zip(data["member_ids"], data["member_names"])]
+    return Snapshot(books=columns, members=members, versions=versions or None,
+                    journal_seq=data["journal_seq"])
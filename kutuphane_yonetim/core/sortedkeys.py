@@ -0,0 +1,99 @@
+import bisect
+from typing import Generic, Iterable, Iterator, List, Optional, TypeVar
+
+K = TypeVar("K")
+
+
+class SortedKeys(Generic[K]):
+    """Sıralı anahtar kümesi: ekleme/silme ve sıralı aralık taraması.
+
+    Tek bir büyük sıralı listeye bisect.insort her eklemede O(n) bellek kaydırması
+    yapar; yüz binlerce kitabın toplu eklenmesinde bu karesel maliyete dönüşür.
+    Burada yeni anahtarlar küçük ikinci bir sıralı listeye eklenir ve bu liste ana
+    listenin belli bir oranını aşınca birleştirilir; birleştirme maliyeti eklemelere
+    yayılır. Okumalar iki listeyi sıralı olarak birleştirerek dolaşır.
+    """
+
+    def __init__(self, keys: Iterable[K] = ()):
+        self._main: List[K] = sorted(set(keys))
+        self._recent: List[K] = []
+
+    def __len__(self):
+        return len(self._main) + len(self._recent)
+
+    def __contains__(self, key: K) -> bool:
+        return any(self._find(keys, key) is not None for keys in (self._recent, self._main))
+
+    def __iter__(self) -> Iterator[K]:
+        return self.irange()
+
+    @staticmethod
+    def _find(keys: List[K], key: K) -> Optional[int]:
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return i
+        return None
+
+    def add(self, key: K):
+        if key in self:
+            return
+        bisect.insort(self._recent, key)
+        if len(self._recent) > max(1024, len(self._main) // 8):
+            self._main = sorted(self._main + self._recent)
+            self._recent = []
+
+    def discard(self, key: K):
+        for keys in (self._recent, self._main):
+            i = self._find(keys, key)
+            if i is not None:
+                del keys[i]
+                return
+
+    def clear(self):
+        self._main = []
+        self._recent = []
+
+    def irange(self, after: Optional[K] = None) -> Iterator[K]:
+        """Anahtarları sıralı döndürür; `after` verilirse yalnızca ondan büyükleri.
+
+        Yineleme sürerken (ör. akış halindeki bir dışa aktarımda) anahtar eklenip
+        silinebilir: her adımda son döndürülen anahtardan sonrası aranır, böylece
+        bir silme sonraki anahtarı atlatmaz, birleştirme de tekrar döndürmez.
+        """
+        # Dilimleme kalan tüm listeyi kopyalardı; indeksle dolaşmak ilk sayfayı ucuz tutar.
+        last = after
+        i = j = 0
+        while True:
+            main, recent = self._main, self._recent
+            # Sık durum: yalnızca ana liste var ve son anahtar hâlâ yerinde.
+            if recent or not (0 < i <= len(main) and main[i - 1] == last):
+                i = self._resume(main, i, last)
+                j = self._resume(recent, j, last)
+            if i < len(main) and (j >= len(recent) or main[i] < recent[j]):
+                last = main[i]
+                i += 1
+            elif j < len(recent):
+                last = recent[j]
+                j += 1
+            else:
+                return
+            yield last
+
+    @staticmethod
+    def _resume(keys: List[K], i: int, last: Optional[K]) -> int:
+        """`last`tan büyük ilk anahtarın indeksi. Liste değişmediyse önceki indeks
+        hâlâ doğrudur ve sabit sürede doğrulanır; değiştiyse yeniden aranır."""
+        if last is None:
+            return 0
+        if i <= len(keys) and (i == 0 or keys[i - 1] <= last) and (i == len(keys) or keys[i] > last):
+            return i
+        return bisect.bisect_right(keys, last)
+
+    def prefixed(self, prefix: str) -> List[K]:
+        """Verilen önekle başlayan (metin) anahtarları döndürür."""
+        matches = []
+        for keys in (self._main, self._recent):
+            start = bisect.bisect_left(keys, prefix)
+            end = bisect.bisect_left(keys, prefix + "\U0010ffff", lo=start)
+            matches.extend(keys[start:end])
+        return matches
@@ -0,0 +1,146 @@
+"""Kütüphane istatistikleri: katalog ve ödünç sayaçlarının artımlı tutulması.
+
+LibraryStats her kitap ekleme/silme ve ödünç verme/iade ile birlikte güncellenir;
+stats() katalog boyutundan bağımsız sürede döner. Yazar ve üye sıralamaları
+sayı kovalarından (RankedCounter) okunur; en çok kitabı olan k yazar tüm
+yazarları sıralamadan bulunur.
+"""
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+from .models import BookStatus
+from .storage import book_type_of
+
+BOOK_TYPES = ("book", "ebook", "audiobook")
+
+
+class RankedCounter:
+    """Anahtar başına sayaç; aynı sayıya sahip anahtarlar bir kovada tutulur.
+
+    top(k), sayı değerlerini büyükten küçüğe dolaşarak en büyük k sayacı
+    O(k + farklı sayı değeri) sürede verir; eşitlikler anahtar sırasıyla bozulur.
+    Sıfıra düşen anahtarlar silinir.
+    """
+
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, Set[Hashable]] = {}
+
+    def add(self, key: Hashable, delta: int = 1):
+        old = self._counts.get(key, 0)
+        new = old + delta
+        if old:
+            bucket = self._buckets[old]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[old]
+        if new > 0:
+            self._counts[key] = new
+            self._buckets.setdefault(new, set()).add(key)
+        else:
+            self._counts.pop(key, None)
+
+    def get(self, key: Hashable) -> int:
+        return self._counts.get(key, 0)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def items(self):
+        return self._counts.items()
+
+    def histogram(self) -> Dict[int, int]:
+        """Sayı değeri -> o sayıya sahip anahtar sayısı."""
+        return {count: len(keys) for count, keys in self._buckets.items()}
+
+    def top(self, k: int) -> List[Tuple[Hashable, int]]:
+        result = []
+        for count in sorted(self._buckets, reverse=True):
+            if len(result) >= k:
+                break
+            keys = heapq.nsmallest(k - len(result), self._buckets[count])
+            result.extend((key, count) for key in keys)
+        return result
+
+
+class LibraryStats:
+    """Durum, tür, yazar ve yayın yılına göre kitap sayıları ile üye başına
+    ödünç sayıları. Birden çok iş parçacığından güncellenebilir."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_books = 0
+        self.by_status: Counter = Counter()
+        self.by_type: Counter = Counter()
+        self.by_year: Counter = Counter()
+        self.authors = RankedCounter()
+        # member_id -> elindeki kitap sayısı (yalnızca ödüncü olan üyeler)
+        self.loans = RankedCounter()
+        self.active_loans = 0
+
+    @classmethod
+    def build(cls, books: Iterable, members: Iterable) -> "LibraryStats":
+        """Sayaçları kitap ve üyelerin tamamından baştan hesaplar."""
+        stats = cls()
+        for book in books:
+            stats.add_book(book)
+        for member in members:
+            if member.borrowed_books:
+                stats.loans.add(member.member_id, len(member.borrowed_books))
+                stats.active_loans += len(member.borrowed_books)
+        return stats
+
+    def add_book(self, book):
+        with self._lock:
+            self._count_book(book, 1)
+
+    def remove_book(self, book):
+        with self._lock:
+            self._count_book(book, -1)
+
+    def _count_book(self, book, delta: int):
+        self.total_books += delta
+        self.by_status[book.status] += delta
+        self.by_type[book_type_of(book)] += delta
+        self.by_year[book.publication_year] += delta
+        if not self.by_year[book.publication_year]:
+            del self.by_year[book.publication_year]
+        self.authors.add(book.author, delta)
+
+    def lend(self, member_id: int):
+        """Mevcut bir kitap üyeye ödünç verildi."""
+        self._move(member_id, BookStatus.AVAILABLE, BookStatus.BORROWED, 1)
+
+    def take_back(self, member_id: int):
+        """Ödünçteki bir kitap iade edildi."""
+        self._move(member_id, BookStatus.BORROWED, BookStatus.AVAILABLE, -1)
+
+    def _move(self, member_id: int, old_status: BookStatus, new_status: BookStatus, delta: int):
+        with self._lock:
+            self.by_status[old_status] -= 1
+            self.by_status[new_status] += 1
+            self.loans.add(member_id, delta)
+            self.active_loans += delta
+
+    def snapshot(self, total_members: int, top: int = 10) -> dict:
+        """Sayaçların bir kopyası; en çok kitabı olan `top` yazar ve en çok
+        ödüncü olan `top` üyeyle birlikte."""
+        with self._lock:
+            loan_histogram = self.loans.histogram()
+            if total_members > len(self.loans):
+                loan_histogram[0] = total_members - len(self.loans)
+            return {
+                "total_books": self.total_books,
+                "by_status": {status.value: self.by_status[status] for status in BookStatus},
+                "by_type": {book_type: self.by_type[book_type] for book_type in BOOK_TYPES},
+                "by_year": dict(sorted(self.by_year.items())),
+                "top_authors": [{"author": author, "books": count} for author, count in self.authors.top(top)],
+                "total_members": total_members,
+                "active_loans": self.active_loans,
+                "members_with_loans": len(self.loans),
+                "loan_histogram": dict(sorted(loan_histogram.items())),
+                "top_borrowers": [{"member_id": member_id, "loans": count}
+                                  for member_id, count in self.loans.top(top)],
+            }
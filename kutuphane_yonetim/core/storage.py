@@ -0,0 +1,527 @@
+from .models import *
+from .compact import BookView
+from .journal import Journal
+from .metrics import BYTES_WRITTEN, SAVE_BYTES, timed
+from .snapshot import read_snapshot, write_snapshot
+from .versions import VERSION_KINDS, record_changes
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: paylaşımlı (çok süreçli) mod kullanılamaz.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def book_type_of(book: Union[Book, EBook, AudioBook]) -> str:
+    """Kitabın kayıtlarda kullanılan tür adını ('book', 'ebook', 'audiobook') döndürür."""
+    if isinstance(book, BookView):
+        return book.book_type
+    if isinstance(book, EBook):
+        return 'ebook'
+    elif isinstance(book, AudioBook):
+        return 'audiobook'
+    return 'book'
+
+
+def book_to_dict(book: Union[Book, EBook, AudioBook]) -> dict:
+    """Kitabı, türünü belirten 'book_type' alanıyla birlikte sözlüğe çevirir."""
+    book_data = book.model_dump(mode='json')
+    book_data['book_type'] = book_type_of(book)
+    return book_data
+
+
+def book_from_dict(book_data: dict) -> Union[Book, EBook, AudioBook]:
+    """'book_type' alanına bakarak doğru kitap sınıfını oluşturur (doğrulamalı)."""
+    book_data = dict(book_data)
+    book_type = book_data.pop("book_type", "book")
+    if book_type == 'ebook':
+        return EBook.model_validate(book_data)
+    elif book_type == 'audiobook':
+        return AudioBook.model_validate(book_data)
+    return Book.model_validate(book_data)
+
+
+@dataclass
+class LoadedData:
+    """Bir depolama katmanının açılışta Library'ye verdiği veriler."""
+    books: Iterable[Union[Book, EBook, AudioBook]] = ()
+    # (üye, ödünç aldığı ISBN'ler) ikilileri
+    members: Iterable[Tuple[Member, List[str]]] = ()
+    # Yüklenen duruma sırayla uygulanacak işlem kayıtları (ör. günlükten)
+    records: List[dict] = field(default_factory=list)
+    # VersionTracker.to_dict() biçiminde kayıt sürümleri; eski dosyalarda yoktur.
+    versions: Optional[dict] = None
+
+
+class StorageBackend(ABC):
+    """Library'nin kalıcılık katmanı için ortak arayüz.
+
+    Library her değişikliği bir işlem kaydı olarak (ör. {"op": "borrow", ...})
+    commit() ile bildirir; katmanın bunu nasıl kalıcı hale getireceği kendine aittir.
+    """
+
+    path: str
+    # True ise aynı veriyi başka süreçler de yazar; Library her değişikliği
+    # locked() içinde, önce read_changes() ile güncellenerek yapar.
+    shared: bool = False
+
+    @abstractmethod
+    def load(self) -> LoadedData:
+        """Kayıtlı veriyi okur."""
+
+    @abstractmethod
+    def commit(self, library, records: List[dict]):
+        """Library'de uygulanmış bir grup değişikliği kalıcı hale getirir; kalıcı
+        olamazsa IOError fırlatır (Library değişikliği geri alır)."""
+
+    @abstractmethod
+    def save_all(self, library):
+        """Library'nin tüm durumunu baştan yazar; yazamazsa IOError."""
+
+    def has_external_changes(self) -> bool:
+        """Veri son yüklemeden sonra başka bir yazar tarafından değiştirildiyse True."""
+        return False
+
+    def read_changes(self) -> Optional[List[dict]]:
+        """Başka bir yazarın son yüklemeden/okumadan sonra yaptığı değişiklikleri
+        işlem kayıtları olarak döndürür. Değişiklikler kayıt olarak okunamıyorsa
+        (ör. veri baştan yazıldıysa) None döndürür: tam yeniden yükleme gerekir."""
+        return None if self.has_external_changes() else []
+
+    def locked(self):
+        """Süreçler arası yazma kilidi; paylaşımlı olmayan katmanlarda etkisizdir."""
+        return nullcontext()
+
+    def flush(self, library):
+        """Kaydedilememiş değişiklikler varsa diske yazar; yazamazsa IOError."""
+
+    def close(self):
+        """Açık dosya/bağlantıları kapatır."""
+
+
+class JSONStorage(StorageBackend):
+    """Tüm kütüphaneyi tek bir JSON dosyasında tutan depolama katmanı.
+
+    journal=True ise her değişiklik dosyayı yeniden yazmak yerine günlüğe tek
+    satır olarak eklenir; snapshot_every kayıtta bir anlık görüntü alınır.
+
+    binary_snapshot=True ise JSON dosyasının yanına aynı içeriğin ikili bir kopyası
+    (`<dosya>.snap`, bkz. core/snapshot.py) yazılır. Açılışta bu kopya JSON'dan
+    yeniyse JSON ayrıştırma ve Pydantic doğrulaması atlanır; yoksa ya da bayatsa
+    JSON okunur ve kopya yeniden oluşturulur.
+
+    shared=True birden çok sürecin (ör. birden çok API işçisi) aynı dosyaları
+    kullandığı durum içindir: yazmalar `<dosya>.lock` üzerindeki fcntl kilidiyle
+    sıraya girer ve her süreç diğerlerinin günlüğe eklediği kayıtları
+    read_changes() ile yalnızca yeni kısmı okuyarak uygular. Kütüphanenin sürüm
+    numarası (versions.version) dosyada ve her kayıtta saklandığından süreçler
+    arasında ortak, artan bir nesil numarasıdır.
+    """
+
+    def __init__(self, path: str, journal: bool = False, snapshot_every: int = 1000,
+                 binary_snapshot: bool = True, shared: bool = False):
+        if shared and fcntl is None:
+            raise RuntimeError("Paylaşımlı mod dosya kilitleri (fcntl) gerektirir; bu platformda desteklenmiyor.")
+        self.path = path
+        self.shared = shared
+        self.lock_path = path + ".lock"
+        self._lock_file = None
+        # flock kilidi açık dosya başınadır; süreç içindeki iç içe locked()
+        # çağrıları için derinlik sayılır ve kilit en dıştakinde bırakılır.
+        self._lock_depth = 0
+        self._lock_guard = threading.RLock()
+        self.journal = Journal(path + ".journal") if journal else None
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = path + ".snap" if binary_snapshot else None
+        # Son yükleme/kaydetmedeki (mtime_ns, boyut); dış değişiklikleri fark etmek için.
+        # Dosya değiştirilip imza güncellenene kadar geçen an başka bir iş parçacığına
+        # dış değişiklik gibi görünmesin diye ikisi birlikte kilit altında yapılır.
+        self._signature = None
+        self._signature_lock = threading.Lock()
+        # Kaydedilemeyen değişiklik varsa True olur, flush() tekrar dener.
+        self.dirty = False
+
+    def _file_signature(self):
+        """Veri dosyasının (mtime_ns, boyut) ikilisini döndürür, dosya yoksa None."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def has_external_changes(self) -> bool:
+        with self._signature_lock:
+            if self._file_signature() != self._signature:
+                return True
+        return self.journal is not None and self.journal.has_new_records()
+
+    def read_changes(self) -> Optional[List[dict]]:
+        """Dosya başka bir süreç tarafından baştan yazıldıysa (anlık görüntü) None,
+        değilse günlüğe eklenmiş yeni kayıtlar."""
+        with self._signature_lock:
+            if self._file_signature() != self._signature:
+                return None
+        if self.journal is None:
+            return []
+        return self.journal.read_new()
+
+    @contextmanager
+    def locked(self):
+        if not self.shared:
+            yield
+            return
+        with self._lock_guard:
+            if self._lock_depth == 0:
+                if self._lock_file is None:
+                    self._lock_file = open(self.lock_path, 'a')
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def load(self) -> LoadedData:
+        """JSON dosyasını okur; günlük açıksa anlık görüntüden sonraki kayıtları da döndürür."""
+        self._signature = self._file_signature()
+        loaded = LoadedData(books=[], members=[])
+        snapshot_seq = 0
+        snapshot = None
+        if self.snapshot_path is not None and self._signature is not None:
+            snapshot = read_snapshot(self.snapshot_path, self._signature)
+        if snapshot is not None:
+            loaded = LoadedData(books=snapshot.books, members=snapshot.members, versions=snapshot.versions)
+            snapshot_seq = snapshot.journal_seq
+            logger.info("%d kitap ve %d üye ikili anlık görüntüden yüklendi.", len(loaded.books), len(loaded.members))
+        else:
+            snapshot_seq = self._load_json(loaded)
+
+        if self.journal is not None:
+            loaded.records = self.journal.replay(after_seq=snapshot_seq)
+            if loaded.records:
+                logger.info("Günlükten %d işlem yeniden uygulanacak.", len(loaded.records))
+        return loaded
+
+    def _load_json(self, loaded: LoadedData) -> int:
+        """JSON dosyasını `loaded` içine okur ve içerdiği günlük sırasını döndürür.
+        Okuma başarılıysa ikili anlık görüntü yeniden oluşturulur."""
+        snapshot_seq = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+                loaded.books = [book_from_dict(book_data) for book_data in data.get("books", [])]
+                for member_data in data.get("members", []):
+                    borrowed_isbns = member_data.pop("borrowed_isbns", [])
+                    loaded.members.append((Member(**member_data), borrowed_isbns))
+
+                loaded.versions = data.get("versions")
+                snapshot_seq = data.get("journal_seq", 0)
+                logger.info("%d kitap ve %d üye başarıyla yüklendi.", len(loaded.books), len(loaded.members))
+
+        except FileNotFoundError:
+            logger.info("Veri dosyası bulunamadı. Kütüphane boş olarak başlatılıyor.")
+            return snapshot_seq
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error("Veri dosyası okunamadı veya bozuk. Kütüphane boş olarak başlatılıyor. Hata: %s", e)
+            return snapshot_seq
+
+        self._write_snapshot(
+            loaded.books,
+            ((member.member_id, member.name, isbns) for member, isbns in loaded.members),
+            loaded.versions, snapshot_seq)
+        return snapshot_seq
+
+    def _write_snapshot(self, books, members, versions, journal_seq: int):
+        """JSON dosyasının ikili kopyasını yazar. Başarısız olursa (ör. yıl sütuna
+        sığmıyorsa) yalnızca uyarı verilir: kopya bir hızlandırmadır, JSON dosyası
+        asıl kayıttır; eski kopya imzası tutmadığından açılışta yok sayılır."""
+        if self.snapshot_path is None or self._signature is None:
+            return
+        try:
+            write_snapshot(self.snapshot_path, books, members, versions, journal_seq, self._signature)
+            size = os.path.getsize(self.snapshot_path)
+            SAVE_BYTES.observe(size, "snapshot")
+            BYTES_WRITTEN.inc("snapshot", amount=size)
+        except Exception as e:
+            logger.warning("İkili anlık görüntü yazılamadı: %s", e)
+
+    @timed("commit")
+    def commit(self, library, records: List[dict]):
+        """Günlük açıksa kayıtları tek bir fsync ile ekler (katalog boyutundan
+        bağımsız), değilse tüm dosyayı yeniden yazar."""
+        if self.journal is None:
+            self.save_all(library)
+            return
+        try:
+            self.journal.append_many(records)
+        except OSError as e:
+            self.dirty = True
+            raise IOError(f"İşlem günlüğe yazılamadı: {e}")
+        if self.journal.pending >= self.snapshot_every:
+            try:
+                self.save_all(library)
+            except IOError:
+                # Kayıtlar günlükte zaten kalıcı; tam yazma `dirty` ile sonra yeniden denenir.
+                pass
+
+    @timed("save")
+    def save_all(self, library):
+        """Kütüphanedeki tüm kitap ve üye verilerini JSON dosyasına kaydeder.
+
+        Dosya önce geçici bir dosyaya yazılıp atomik olarak yerine taşınır.
+        Günlük açıksa bu bir anlık görüntüdür: dahil edilen son günlük sırası
+        dosyaya yazılır ve ardından günlük boşaltılır. Yazma süresince Library'deki
+        değişiklikler bekletilir (tutarlı kopya); aramalar etkilenmez.
+        """
+        with library._state_lock.exclusive():
+            self._save_all(library)
+
+    def _save_all(self, library):
+        try:
+            books_data = [book_to_dict(book) for book in library._books.values()]
+
+            members_data = []
+            for member in library._members.values():
+                borrowed_isbns = [book.isbn for book in member.borrowed_books]
+                members_data.append({
+                    "name": member.name,
+                    "member_id": member.member_id,
+                    "borrowed_isbns": borrowed_isbns
+                })
+
+            data_to_save = {
+                "books": books_data,
+                "members": members_data,
+                "versions": library._versions.to_dict()
+            }
+            if self.journal is not None:
+                data_to_save["journal_seq"] = self.journal.last_seq
+
+            tmp_file = self.path + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._signature_lock:
+                os.replace(tmp_file, self.path)
+                self._signature = self._file_signature()
+            self.dirty = False
+            SAVE_BYTES.observe(self._signature[1], "json")
+            BYTES_WRITTEN.inc("json", amount=self._signature[1])
+            self._write_snapshot(
+                library._books.values(),
+                ((member.member_id, member.name, [book.isbn for book in member.borrowed_books])
+                 for member in library._members.values()),
+                data_to_save["versions"], data_to_save.get("journal_seq", 0))
+
+            if self.journal is not None:
+                self.journal.reset()
+
+        except Exception as e:
+            self.dirty = True
+            logger.exception("Veri kaydetme sırasında bir sorun oluştu: %s", e)
+            raise IOError(f"Veri dosyası yazılamadı: {e}") from e
+
+    def flush(self, library):
+        if self.dirty:
+            self.save_all(library)
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    isbn TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publication_year INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    book_type TEXT NOT NULL,
+    file_format TEXT,
+    duration_in_minutes INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_books_author ON books(author);
+CREATE INDEX IF NOT EXISTS idx_books_status ON books(status);
+CREATE TABLE IF NOT EXISTS members (
+    member_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS loans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    isbn TEXT NOT NULL UNIQUE REFERENCES books(isbn),
+    member_id INTEGER NOT NULL REFERENCES members(member_id)
+);
+CREATE INDEX IF NOT EXISTS idx_loans_member ON loans(member_id);
+CREATE TABLE IF NOT EXISTS versions (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_BOOK_COLUMNS = "isbn, title, author, publication_year, status, book_type, file_format, duration_in_minutes"
+
+
+class SQLiteStorage(StorageBackend):
+    """Kitap, üye ve ödünçleri ayrı tablolarda tutan stdlib sqlite3 katmanı.
+
+    WAL modunda çalışır; her commit() tek bir veritabanı işlemidir (transaction)
+    ve yalnızca değişen satırlara dokunur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._data_version = None
+
+    @staticmethod
+    def _book_row(book_data: dict) -> tuple:
+        return (
+            book_data["isbn"], book_data["title"], book_data["author"],
+            book_data["publication_year"], book_data["status"], book_data["book_type"],
+            book_data.get("file_format"), book_data.get("duration_in_minutes"),
+        )
+
+    @staticmethod
+    def _row_to_book(row) -> Union[Book, EBook, AudioBook]:
+        """Satırdan kitap oluşturur. Satırlar daha önce doğrulanmış modellerden
+        yazıldığı için Pydantic doğrulaması tekrar çalıştırılmaz."""
+        isbn, title, author, year, status, book_type, file_format, duration = row
+        fields = dict(title=title, author=author, publication_year=year, isbn=isbn,
+                      status=BookStatus(status))
+        if book_type == 'ebook':
+            return EBook.model_construct(file_format=file_format, **fields)
+        elif book_type == 'audiobook':
+            return AudioBook.model_construct(duration_in_minutes=duration, **fields)
+        return Book.model_construct(**fields)
+
+    def _current_data_version(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def has_external_changes(self) -> bool:
+        with self._lock:
+            return self._current_data_version() != self._data_version
+
+    def load(self) -> LoadedData:
+        """Kitapları imleç üzerinden akış halinde döndürür; tüm tablo önceden
+        belleğe alınmaz."""
+        with self._lock:
+            self._data_version = self._current_data_version()
+            loans = {}
+            for member_id, isbn in self._conn.execute("SELECT member_id, isbn FROM loans ORDER BY id"):
+                loans.setdefault(member_id, []).append(isbn)
+            members = [
+                (Member(name=name, member_id=member_id), loans.get(member_id, []))
+                for member_id, name in self._conn.execute("SELECT member_id, name FROM members ORDER BY rowid")
+            ]
+            versions = {kind: {} for kind in VERSION_KINDS}
+            for kind, key, version in self._conn.execute("SELECT kind, key, version FROM versions"):
+                if kind == "library":
+                    versions["version"] = version
+                else:
+                    versions[kind][key] = version
+        # Ayrı bir imleç; Library kitapları tükettikçe satırlar okunur.
+        cursor = self._conn.cursor()
+        cursor.execute(f"SELECT {_BOOK_COLUMNS} FROM books ORDER BY rowid")
+        books = (self._row_to_book(row) for row in cursor)
+        return LoadedData(books=books, members=members, versions=versions)
+
+    def _apply(self, record: dict):
+        op = record["op"]
+        if op == "add_book":
+            self._conn.execute(f"INSERT INTO books ({_BOOK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               self._book_row(record["book"]))
+        elif op == "delete_book":
+            self._conn.execute("DELETE FROM books WHERE isbn = ?", (record["isbn"],))
+        elif op == "register_member":
+            self._conn.execute("INSERT INTO members (member_id, name) VALUES (?, ?)",
+                               (record["member_id"], record["name"]))
+        elif op == "borrow":
+            self._conn.execute("UPDATE books SET status = ? WHERE isbn = ?",
+                               (BookStatus.BORROWED.value, record["isbn"]))
+            self._conn.execute("INSERT INTO loans (isbn, member_id) VALUES (?, ?)",
+                               (record["isbn"], record["member_id"]))
+        elif op == "return":
+            self._conn.execute("UPDATE books SET status = ? WHERE isbn = ?",
+                               (BookStatus.AVAILABLE.value, record["isbn"]))
+            self._conn.execute("DELETE FROM loans WHERE isbn = ?", (record["isbn"],))
+        else:
+            raise ValueError(f"Bilinmeyen işlem: {op}")
+        if "version" in record:
+            self._apply_versions(record)
+
+    def _apply_versions(self, record: dict):
+        version = record["version"]
+        updated, removed = record_changes(record)
+        self._conn.executemany("DELETE FROM versions WHERE kind = ? AND key = ?",
+                               [(kind, str(key)) for kind, key in removed])
+        self._conn.executemany("INSERT OR REPLACE INTO versions (kind, key, version) VALUES (?, ?, ?)",
+                               [(kind, str(key), version) for kind, key in updated])
+        self._conn.execute("INSERT OR REPLACE INTO versions (kind, key, version) VALUES ('library', '', ?)",
+                           (version,))
+
+    @timed("commit")
+    def commit(self, library, records: List[dict]):
+        """Kayıtları tek bir veritabanı işleminde uygular; hata olursa hiçbiri uygulanmaz."""
+        try:
+            with self._lock, self._conn:
+                for record in records:
+                    self._apply(record)
+        except sqlite3.Error as e:
+            raise IOError(f"Değişiklik veritabanına yazılamadı: {e}")
+
+    @timed("save")
+    def save_all(self, library):
+        """Tabloları tek bir işlemde boşaltıp Library'nin tüm durumunu yazar."""
+        try:
+            with library._state_lock.exclusive(), self._lock, self._conn:
+                self._conn.execute("DELETE FROM loans")
+                self._conn.execute("DELETE FROM members")
+                self._conn.execute("DELETE FROM books")
+                self._conn.execute("DELETE FROM versions")
+                self._conn.executemany(
+                    f"INSERT INTO books ({_BOOK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._book_row(book_to_dict(book)) for book in library._books.values()))
+                self._conn.executemany(
+                    "INSERT INTO members (member_id, name) VALUES (?, ?)",
+                    ((member.member_id, member.name) for member in library._members.values()))
+                self._conn.executemany(
+                    "INSERT INTO loans (isbn, member_id) VALUES (?, ?)",
+                    ((book.isbn, member.member_id)
+                     for member in library._members.values() for book in member.borrowed_books))
+                versions = library._versions.to_dict()
+                self._conn.execute("INSERT INTO versions (kind, key, version) VALUES ('library', '', ?)",
+                                   (versions["version"],))
+                self._conn.executemany(
+                    "INSERT INTO versions (kind, key, version) VALUES (?, ?, ?)",
+                    ((kind, key, version) for kind in VERSION_KINDS for key, version in versions[kind].items()))
+        except sqlite3.Error as e:
+            raise IOError(f"Veritabanı yazılamadı: {e}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
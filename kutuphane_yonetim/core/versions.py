@@ -0,0 +1,150 @@
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Sürümü tutulan kayıt türleri; "deleted_book" silinen kitapların, "returned_loan"
+# iade edilen ödünçlerin (ISBN'e göre) mezar taşlarıdır.
+VERSION_KINDS = ("book", "member", "deleted_book", "returned_loan")
+
+
+def record_changes(record: dict) -> Tuple[List[Tuple[str, object]], List[Tuple[str, object]]]:
+    """Bir işlem kaydının sürümünü güncellediği ve sildiği (tür, anahtar) ikililerini döndürür."""
+    op = record["op"]
+    if op == "add_book":
+        isbn = record["book"]["isbn"]
+        return [("book", isbn)], [("deleted_book", isbn)]
+    if op == "delete_book":
+        return [("deleted_book", record["isbn"])], [("book", record["isbn"])]
+    if op == "register_member":
+        return [("member", record["member_id"])], []
+    if op == "borrow":
+        return [("book", record["isbn"]), ("member", record["member_id"])], [("returned_loan", record["isbn"])]
+    if op == "return":
+        return [("book", record["isbn"]), ("member", record["member_id"]), ("returned_loan", record["isbn"])], []
+    raise ValueError(f"Bilinmeyen işlem: {op}")
+
+
+class VersionTracker:
+    """Kütüphane genelinde artan bir değişiklik sayacı ve her kaydın son değiştiği sürüm.
+
+    Her işlem kaydı bir sonraki sürüm numarasıyla damgalanır; dışa aktarım bu
+    numaralarla yalnızca belli bir sürümden sonra değişen kayıtları verebilir.
+    Sürümler depolama katmanında saklanır, böylece yeniden başlatmalarda korunur.
+    Sürümü bilinmeyen (eski dosyalardan gelen) kayıtlar 0 sayılır.
+
+    İkili anlık görüntüden gelen kitap sürümleri (ISBN listesi, sürüm dizisi)
+    sütunları olarak saklanır ve sözlüğe ilk ihtiyaç duyulduğunda dönüştürülür;
+    yalnızca okuma yapan bir açılış bu maliyeti hiç ödemez.
+
+    Birden çok iş parçacığından kullanılabilir; damgalama ve toplu okumalar bir
+    kilitle sıralanır.
+
+    `modified_at`, sürümün son değiştiği (veya verinin yüklendiği) zamandır
+    (Unix zamanı); HTTP Last-Modified başlığı için kullanılır ve saklanmaz.
+    `generation` verinin sürüm artmadan değişebildiği durumlarda (tam yeniden
+    yükleme, batch() geri alması) artan, yalnızca süreç içinde anlamlı bir sayaçtır.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self.modified_at = time.time()
+        self.generation = 0
+        self._versions: Dict[str, Dict[object, int]] = {kind: {} for kind in VERSION_KINDS}
+        self._book_columns: Optional[Tuple[Sequence[str], Sequence[int]]] = None
+
+    def _table(self, kind: str) -> Dict[object, int]:
+        if kind == "book" and self._book_columns is not None:
+            with self._lock:
+                if self._book_columns is not None:
+                    isbns, versions = self._book_columns
+                    self._versions["book"] = {isbn: version for isbn, version in zip(isbns, versions) if version}
+                    self._book_columns = None
+        return self._versions[kind]
+
+    def get(self, kind: str, key) -> int:
+        return self._table(kind).get(key, 0)
+
+    def items(self, kind: str, since: int) -> List[Tuple[object, int]]:
+        """Verilen sürümden sonra değişmiş (anahtar, sürüm) ikilileri."""
+        with self._lock:
+            return [(key, version) for key, version in self._table(kind).items() if version > since]
+
+    def stamp(self, record: dict) -> List[Tuple[str, object, Optional[int]]]:
+        """Kaydı yeni bir sürümle damgalar ve etkilediği kayıtların sürümünü günceller.
+        unstamp() için bu kayıtların önceki sürümlerini döndürür (yoksa None)."""
+        with self._lock:
+            updated, removed = record_changes(record)
+            previous = [(kind, key, self._table(kind).get(key)) for kind, key in updated + removed]
+            self.version += 1
+            record["version"] = self.version
+            self.apply(record)
+            return previous
+
+    def unstamp(self, record: dict, previous: List[Tuple[str, object, Optional[int]]]):
+        """stamp()'ı geri alır: kayıtların önceki sürümleri geri yazılır. Genel sürüm
+        yalnızca arada başka bir kayıt damgalanmadıysa geri verilir."""
+        with self._lock:
+            for kind, key, version in previous:
+                if version is None:
+                    self._table(kind).pop(key, None)
+                else:
+                    self._table(kind)[key] = version
+            if self.version == record.get("version"):
+                self.version -= 1
+
+    def apply(self, record: dict):
+        """Damgalı bir kaydı (ör. günlükten) izleyiciye uygular."""
+        version = record.get("version")
+        if version is None:
+            return
+        updated, removed = record_changes(record)
+        with self._lock:
+            self.version = max(self.version, version)
+            self.modified_at = time.time()
+            for kind, key in removed:
+                self._table(kind).pop(key, None)
+            for kind, key in updated:
+                self._table(kind)[key] = version
+
+    def bump_generation(self):
+        """Bellekteki veri sürüm damgalanmadan değişti (ör. geri alındı)."""
+        with self._lock:
+            self.generation += 1
+            self.modified_at = time.time()
+
+    def clear(self):
+        with self._lock:
+            self.version = 0
+            self.modified_at = time.time()
+            self.generation += 1
+            self._book_columns = None
+            for versions in self._versions.values():
+                versions.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            data = {"version": self.version}
+            for kind in VERSION_KINDS:
+                data[kind] = {str(key): version for key, version in self._table(kind).items()}
+            return data
+
+    def load(self, data: Optional[dict]):
+        """to_dict() çıktısını yükler; JSON'da metne dönen üye anahtarları sayıya çevrilir.
+
+        "book" değeri sözlük yerine (ISBN'ler, sürümler) sütun ikilisi de olabilir
+        (bkz. snapshot.read_snapshot); 0 sürümü "bilinmiyor" demektir.
+        """
+        self.clear()
+        if not data:
+            return
+        self.version = data.get("version", 0)
+        for kind in VERSION_KINDS:
+            values = data.get(kind, {})
+            if kind == "book" and isinstance(values, tuple):
+                self._book_columns = values
+            elif kind == "member":
+                self._versions[kind] = {int(key): version for key, version in values.items()}
+            else:
+                # Anahtarlar zaten metin; kopyalamak yeterli.
+                self._versions[kind] = dict(values)
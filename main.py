@@ -1,6 +1,7 @@
 from kutuphane_yonetim.core.library import Library
 from kutuphane_yonetim.core.models import Book, Member
 import asyncio
+import logging
 
 
 def wait_for_user_input():
@@ -24,7 +25,13 @@ def print_menu():
 
 async def main():
     library = Library(name="Proje Özel", data_file="data/library.json")
+    try:
+        await menu_loop(library)
+    finally:
+        await library.aclose()
+
 
+async def menu_loop(library: Library):
     while True:
         print_menu()
         choice = input("Lütfen bir işlem seçin (1-9): ")
@@ -106,6 +113,14 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Library işlem mesajlarını loglar; CLI'da bunlar kullanıcıya gösterilir.
+    # Yalnızca paketin logger'ı ayarlanır; kök logger'a dokunulmaz, böylece
+    # httpx gibi kütüphanelerin INFO satırları menüye karışmaz.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    package_logger = logging.getLogger("kutuphane_yonetim")
+    package_logger.addHandler(handler)
+    package_logger.setLevel(logging.INFO)
     try:
         asyncio.run(main())
 
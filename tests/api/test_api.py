@@ -1,21 +1,27 @@
 import pytest
 from fastapi.testclient import TestClient
+import json
 import os
 
+from kutuphane_yonetim.api import main
 from kutuphane_yonetim.api.main import app, get_library
 from kutuphane_yonetim.core.library import Library
 
 
-@pytest.fixture(scope="function")
-def client(tmp_path):
+@pytest.fixture(scope="function", params=[False, True], ids=["dict", "compact"])
+def client(tmp_path, request):
     """
     Her test fonksiyonu için tamamen izole bir TestClient oluşturur.
-    Her client, kendi geçici JSON dosyasıyla çalışan kendi Library nesnesine sahiptir.
+    Her client, kendi geçici JSON dosyasıyla çalışan kendi Library nesnesine sahiptir;
+    üretimdeki gibi bu nesne istekler arasında paylaşılır. Testler hem varsayılan
+    hem de kompakt katalogla çalıştırılır.
     """
     test_data_file = tmp_path / "test_data.json"
+    library = Library(name="Test API Kütüphanesi", data_file=str(test_data_file), compact=request.param)
 
     def override_get_library():
-        return Library(name="Test API Kütüphanesi", data_file=str(test_data_file))
+        library.reload_if_changed()
+        return library
 
     app.dependency_overrides[get_library] = override_get_library
     
@@ -52,10 +58,17 @@ def test_full_library_workflow(client):
     response = client.post("/borrow/", json=borrow_payload)
     assert response.status_code == 200, response.text
 
+    response = client.get(f"/books/{TEST_BOOK_ISBN}/borrower")
+    assert response.status_code == 200, response.text
+    assert response.json() == {"member_id": TEST_MEMBER_ID, "name": "Ayşe Yılmaz", "loan_count": 1}
+
     return_payload = {"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN}
     response = client.post("/return-book/", json=return_payload)
     assert response.status_code == 200, response.text
 
+    assert client.get(f"/books/{TEST_BOOK_ISBN}/borrower").status_code == 404
+    assert client.get("/books/0000000000/borrower").status_code == 404
+
     response = client.delete(f"/books/delete/{TEST_BOOK_ISBN}")
     assert response.status_code == 204
 
@@ -66,4 +79,324 @@ def test_add_duplicate_member_fails(client):
 
     response = client.post("/members/", json=TEST_MEMBER_PAYLOAD)
     assert response.status_code == 409
-    assert "zaten kayıtlı" in response.json()["detail"]
\ No newline at end of file
+    assert "zaten kayıtlı" in response.json()["detail"]
+
+def test_library_is_shared_and_reloaded_on_external_change(tmp_path, monkeypatch):
+    """Lifespan'da oluşturulan tek Library'nin paylaşıldığını ve yalnızca
+    dosya dışarıdan değiştiğinde yeniden yüklendiğini test eder."""
+    data_file = tmp_path / "shared.json"
+    monkeypatch.setattr(main, "DATA_FILE", str(data_file))
+
+    with TestClient(app) as test_client:
+        shared = app.state.library
+        response = test_client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+        assert response.status_code == 201
+        assert app.state.library is shared
+
+        loaded_before = shared.find_book(isbn=TEST_BOOK_ISBN)
+        assert test_client.get(f"/books/{TEST_BOOK_ISBN}").status_code == 200
+        assert shared.find_book(isbn=TEST_BOOK_ISBN) is loaded_before
+
+        external = {"books": [{"title": "Dune", "author": "Frank Herbert", "publication_year": 1965,
+                               "isbn": "9780441013593", "status": "mevcut", "book_type": "book"}],
+                    "members": []}
+        data_file.write_text(json.dumps(external), encoding="utf-8")
+
+        assert test_client.get("/books/9780441013593").status_code == 200
+        assert test_client.get(f"/books/{TEST_BOOK_ISBN}").status_code == 404
+
+    assert not hasattr(app.state, "library")
+
+
+def test_bulk_import_endpoint(client):
+    """CSV ve JSON Lines gövdeleriyle toplu kitap ekleme uç noktasını test eder."""
+    csv_body = (
+        "title,author,isbn,publication_year,book_type,file_format\n"
+        "Dune,Frank Herbert,9780441013593,1965,book,\n"
+        "Neuromancer,William Gibson,9780441569595,1984,ebook,EPUB\n"
+        "Hatalı,Yazar,123,2000,book,\n"
+    )
+    response = client.post("/books/bulk", content=csv_body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 3
+
+    jsonl_body = json.dumps(TEST_BOOK_PAYLOAD) + "\n" + json.dumps(TEST_BOOK_PAYLOAD) + "\n"
+    response = client.post("/books/bulk?format=jsonl", content=jsonl_body)
+    assert response.json()["imported"] == 1
+    assert "zaten mevcut" in response.json()["errors"][0]["error"]
+
+    assert client.get(f"/books/{TEST_BOOK_ISBN}").status_code == 200
+
+    response = client.post("/books/bulk", content="x", headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+def test_add_from_api_answers_warm_isbn_from_cache(client, httpx_mock):
+    """Önbellekteki bir ISBN'in Open Library'ye gidilmeden eklendiğini test eder."""
+    httpx_mock.add_response(
+        url=f"https://openlibrary.org/search.json?q={TEST_BOOK_ISBN}",
+        json={"numFound": 1, "docs": [{"title": "1984", "author_name": ["George Orwell"], "first_publish_year": 1949}]},
+    )
+
+    assert client.post(f"/books/add-from-api/{TEST_BOOK_ISBN}").status_code == 201
+    assert client.delete(f"/books/delete/{TEST_BOOK_ISBN}").status_code == 204
+    response = client.post(f"/books/add-from-api/{TEST_BOOK_ISBN}")
+
+    assert response.status_code == 201
+    assert response.json()["title"] == "1984"
+    assert len(httpx_mock.get_requests()) == 1
+    assert client.get("/cache/openlibrary").json()["memory"]["hits"] == 1
+
+
+def test_search_books_endpoint(client):
+    """Başlık/yazar üzerinde tam metin arama uç noktasını test eder."""
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    client.post("/books/add-manually/", json={
+        "title": "İstanbul Hatırası", "author": "Ahmet Ümit", "isbn": "9789750000001", "publication_year": 2010})
+
+    response = client.get("/books/search", params={"q": "ISTANBUL ahm"})
+    assert response.status_code == 200
+    assert [book["isbn"] for book in response.json()] == ["9789750000001"]
+
+    assert client.get("/books/search", params={"q": "olmayan"}).json() == []
+    assert client.get("/books/search").status_code == 422
+    assert client.get(f"/books/search/{TEST_BOOK_ISBN}").status_code == 200
+
+
+def test_list_endpoints_paginate_filter_and_project(client):
+    """Liste uç noktalarında imleçli sayfalama, filtre ve alan seçimini test eder."""
+    for i in range(5):
+        client.post("/books/add-manually/", json={
+            "title": f"Kitap {i}", "author": "Orhan Pamuk" if i % 2 else "Ayşe Kulin",
+            "isbn": f"978000000000{i}", "publication_year": 2000 + i})
+
+    response = client.get("/books/", params={"limit": 2})
+    assert [book["isbn"] for book in response.json()] == ["9780000000000", "9780000000001"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/books/", params={"limit": 2, "cursor": cursor})
+    assert [book["isbn"] for book in response.json()] == ["9780000000002", "9780000000003"]
+
+    response = client.get("/books/", params={"author": "orhan pamuk", "year_to": 2002, "fields": "isbn,title"})
+    assert response.json() == [{"title": "Kitap 1", "isbn": "9780000000001"}]
+    assert "X-Next-Cursor" not in response.headers
+    assert client.get("/books/", params={"status": "ödünç alınmış"}).json() == []
+    assert client.get("/books/", params={"fields": "isbn,password"}).status_code == 400
+    assert client.get("/books/", params={"limit": 5000}).status_code == 422
+
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+    client.post("/members/", json={"name": "Ali", "member_id": 202})
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": "9780000000001"})
+    borrowed = client.get("/books/", params={"status": "ödünç alınmış", "author": "ORHAN PAMUK", "fields": "isbn"})
+    assert borrowed.json() == [{"isbn": "9780000000001"}]
+    available = client.get("/books/", params={"status": "mevcut", "author": "Orhan Pamuk", "fields": "isbn"})
+    assert available.json() == [{"isbn": "9780000000003"}]
+
+    response = client.get("/members/", params={"limit": 1})
+    assert response.json()[0]["member_id"] == TEST_MEMBER_ID
+    assert response.headers["X-Next-Cursor"] == str(TEST_MEMBER_ID)
+
+    response = client.get("/members/summary")
+    assert response.json() == [
+        {"member_id": TEST_MEMBER_ID, "name": "Ayşe Yılmaz", "loan_count": 1},
+        {"member_id": 202, "name": "Ali", "loan_count": 0},
+    ]
+
+
+def test_export_ndjson_streams_with_since_and_gzip(client):
+    """NDJSON dışa aktarım uç noktasını, since filtresini ve gzip'i test eder."""
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+
+    response = client.get("/export/books.ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["isbn"] for r in records] == [TEST_BOOK_ISBN]
+    checkpoint = int(response.headers["X-Export-Version"])
+
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+    response = client.get("/export/loans.ndjson", params={"since": checkpoint, "gzip": True})
+    assert response.headers["content-encoding"] == "gzip"
+    assert [json.loads(line)["isbn"] for line in response.text.splitlines()] == [TEST_BOOK_ISBN]
+
+    assert client.get("/export/members.ndjson", params={"since": 10**6}).text == ""
+    assert client.get("/export/orders.ndjson").status_code == 422
+
+def test_metrics_endpoint(client):
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+    assert client.get(f"/books/{TEST_BOOK_ISBN}").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    # Yol parametreleri rota şablonuyla birleştirilir.
+    assert any(line.startswith('kutuphane_http_request_seconds_count{method="GET",route="/books/{isbn}",status="200"}')
+               for line in lines)
+    assert 'kutuphane_operation_seconds_bucket{operation="borrow",le="+Inf"}' in response.text
+    assert {"kutuphane_books 1", "kutuphane_members 1", "kutuphane_loans 1"} <= set(lines)
+    assert any(line.startswith('kutuphane_cache_hit_ratio{cache="openlibrary_memory"}') for line in lines)
+
+
+def test_write_behind_is_flushed_on_shutdown(tmp_path, monkeypatch):
+    """Arka planda yazma açıkken yanıtlar yazmayı beklemez, kapanış ise bekleyen
+    değişiklikleri diske yazar."""
+    data_file = tmp_path / "write_behind.json"
+    monkeypatch.setattr(main, "DATA_FILE", str(data_file))
+    monkeypatch.setattr(main, "USE_JOURNAL", True)
+    monkeypatch.setattr(main, "WRITE_BEHIND_MS", "60000")
+
+    with TestClient(app) as test_client:
+        assert test_client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD).status_code == 201
+        assert app.state.library.pending_writes == 1
+
+    reopened = Library(name="Kontrol", data_file=str(data_file), journal=True)
+    assert reopened.find_book(isbn=TEST_BOOK_ISBN) is not None
+
+
+def test_conditional_get_with_etags(client):
+    """Liste ve kitap uç noktalarının ETag/Last-Modified verdiğini, güncel kopya için
+    304 döndürdüğünü ve değişikliklerin ETag'i geçersiz kıldığını test eder."""
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    other = {"title": "Dune", "author": "Frank Herbert", "isbn": "9780441013593", "publication_year": 1965}
+    client.post("/books/add-manually/", json=other)
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+
+    for url in ["/books/", "/books/?fields=title", "/members/", "/members/summary", f"/books/{TEST_BOOK_ISBN}"]:
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert response.status_code == 200 and "Last-Modified" in response.headers
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304, url
+        assert cached.content == b"" and cached.headers["ETag"] == etag
+        assert client.get(url, headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": '"eski"'}).status_code == 200
+        assert client.get(url, headers={"If-Modified-Since": response.headers["Last-Modified"]}).status_code == 304
+
+    list_etag = client.get("/books/").headers["ETag"]
+    book_etag = client.get(f"/books/{TEST_BOOK_ISBN}").headers["ETag"]
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": other["isbn"]})
+
+    # Başka bir kitaptaki değişiklik listeyi geçersiz kılar, bu kitabı kılmaz.
+    assert client.get("/books/", headers={"If-None-Match": list_etag}).status_code == 200
+    assert client.get(f"/books/{TEST_BOOK_ISBN}", headers={"If-None-Match": book_etag}).status_code == 304
+    response = client.get(f"/books/{other['isbn']}", headers={"If-None-Match": book_etag})
+    assert response.status_code == 200 and response.json()["status"] == "ödünç alınmış"
+    assert client.get("/books/0000000000000", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_etags_change_when_state_changes_without_a_new_version(client):
+    """Geri alınan bir batch() ve dışarıdan yeniden yükleme sürümü artırmadan veriyi
+    değiştirir; bu durumda da eski ETag 304 almamalıdır."""
+    library = app.dependency_overrides[get_library]()
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    other = {"title": "Dune", "author": "Frank Herbert", "isbn": "9780441013593", "publication_year": 1965}
+
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            client.post("/books/add-manually/", json=other)
+            during = {url: client.get(url).headers["ETag"] for url in ["/books/", f"/books/{other['isbn']}"]}
+            raise RuntimeError("geri al")
+    for url, etag in during.items():
+        assert client.get(url, headers={"If-None-Match": etag}).status_code != 304, url
+
+    list_etag = client.get("/books/").headers["ETag"]
+    book_etag = client.get(f"/books/{TEST_BOOK_ISBN}").headers["ETag"]
+    data_file = library.storage.path
+    with open(data_file, encoding="utf-8") as f:
+        data = json.load(f)
+    data["books"][0]["title"] = "Bin Dokuz Yüz Seksen Dört"
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert client.get("/books/", headers={"If-None-Match": list_etag}).status_code == 200
+    response = client.get(f"/books/{TEST_BOOK_ISBN}", headers={"If-None-Match": book_etag})
+    assert response.status_code == 200 and response.json()["title"] == "Bin Dokuz Yüz Seksen Dört"
+
+
+def test_response_cache_serves_bytes_until_library_changes(client, monkeypatch):
+    """Liste ve kitap gövdelerinin önbellekten verildiğini, yalnızca ilgili veri
+    değişince yeniden üretildiğini ve Pydantic çıktısıyla aynı olduğunu test eder."""
+    from kutuphane_yonetim.api import response_cache as response_cache_module
+    from kutuphane_yonetim.api.schemas import BookResponse, MemberResponse
+
+    ebook = {"title": "Neuromancer", "author": "William Gibson", "isbn": "9780441569595", "publication_year": 1984}
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    client.post("/books/add-manually/", json=ebook)
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+    library = app.dependency_overrides[get_library]()
+    cache = main.response_cache(library)
+
+    first = client.get("/books/?limit=1")
+    hits = cache.hits
+    second = client.get("/books/?limit=1")
+    assert cache.hits == hits + 1
+    assert second.content == first.content and second.headers[main.NEXT_CURSOR_HEADER] == ebook["isbn"]
+    expected = [BookResponse.model_validate(book).model_dump(mode="json") for book in library.page_books(limit=1)[0]]
+    assert first.json() == expected
+    member = client.get("/members/").json()[0]
+    assert member == MemberResponse.model_validate(library.find_member(TEST_MEMBER_ID), from_attributes=True).model_dump(mode="json")
+
+    # Standart json kodlayıcısı aynı gövdeyi üretir.
+    monkeypatch.setattr(response_cache_module, "orjson", None)
+    cache.clear()
+    assert client.get("/books/?limit=1").content == first.content
+
+    client.get(f"/books/{ebook['isbn']}")
+    client.post("/return-book/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+    hits = cache.hits
+    assert client.get("/books/?limit=1").json()[0]["status"] == "mevcut"
+    assert client.get(f"/books/{ebook['isbn']}").status_code == 200
+    assert cache.hits == hits + 1  # yalnızca değişmeyen kitabın kaydı
+
+    # Geri alınan batch() değişiklikleri de önbelleği geçersiz kılar.
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            library.delete_book(isbn=ebook["isbn"])
+            assert len(client.get("/books/").json()) == 1
+            raise RuntimeError("vazgeçildi")
+    assert len(client.get("/books/").json()) == 2
+    assert client.get("/cache/responses").json()["hits"] == cache.hits
+
+
+def test_response_cache_evicts_by_size_and_validator():
+    """Yanıt önbelleğinin bayat kayıtları ıska saydığını ve bayt sınırında en eskiyi attığını test eder."""
+    from kutuphane_yonetim.api.response_cache import ResponseCache
+
+    cache = ResponseCache(max_bytes=10)
+    cache.set("a", 1, b"12345")
+    cache.set("b", 1, b"12345")
+    assert cache.get("a", 1) == (b"12345", {})
+    assert cache.get("a", 2) is None and "a" not in cache._data
+    cache.set("c", 1, b"123456")
+    assert cache.get("b", 1) is None and cache.evictions == 1
+    cache.set("big", 1, b"x" * 11)
+    assert cache.get("big", 1) is None
+
+
+def test_stats_endpoint(client):
+    """İstatistik uç noktasının sayaçları döndürdüğünü ve ETag ile 304 verdiğini test eder."""
+    client.post("/books/add-manually/", json=TEST_BOOK_PAYLOAD)
+    client.post("/members/", json=TEST_MEMBER_PAYLOAD)
+    client.post("/borrow/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+
+    response = client.get("/stats?top=5")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["by_status"] == {"mevcut": 0, "ödünç alınmış": 1, "kayıp": 0}
+    assert stats["by_year"] == {"1949": 1}
+    assert stats["top_authors"] == [{"author": "George Orwell", "books": 1}]
+    assert stats["top_borrowers"] == [{"member_id": TEST_MEMBER_ID, "loans": 1}]
+    assert client.get("/stats?top=5", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+    client.post("/return-book/", json={"member_id": TEST_MEMBER_ID, "book_isbn": TEST_BOOK_ISBN})
+    stats = client.get("/stats").json()
+    assert stats["active_loans"] == 0 and stats["loan_histogram"] == {"0": 1}
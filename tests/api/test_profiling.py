@@ -0,0 +1,88 @@
+import logging
+import os
+import pstats
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kutuphane_yonetim.api.profiling import InstrumentedRoute, ProfilingMiddleware, SlowRequestMiddleware
+from kutuphane_yonetim.core import slowlog
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, Member
+
+DUNE = "9780441013593"
+
+
+def make_app(library, profile_dir, paths=()):
+    app = FastAPI()
+    app.router.route_class = InstrumentedRoute
+
+    @app.post("/borrow/{isbn}")
+    def borrow(isbn: str, member_id: int):
+        library.borrow_book(member_id=member_id, book_isbn=isbn)
+        return {"ok": True}
+
+    @app.get("/books/{isbn}")
+    async def get_book(isbn: str):
+        return {"title": library.find_book(isbn=isbn).title}
+
+    app.add_middleware(SlowRequestMiddleware)
+    app.add_middleware(ProfilingMiddleware, directory=str(profile_dir), paths=paths)
+    return app
+
+
+def test_slow_request_breakdown_and_profile_dump(tmp_path, caplog):
+    library = Library(name="Profil", data_file=str(tmp_path / "library.json"))
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    library.register_member(Member(name="Ayşe", member_id=1))
+    profile_dir = tmp_path / "profiles"
+    client = TestClient(make_app(library, profile_dir, paths=["/borrow"]))
+
+    slowlog.configure(0)
+    try:
+        with caplog.at_level(logging.WARNING, logger="kutuphane_yonetim.slow"):
+            assert client.post(f"/borrow/{DUNE}", params={"member_id": 1}).status_code == 200
+            assert client.get(f"/books/{DUNE}").json() == {"title": "Dune"}
+    finally:
+        slowlog.configure(None)
+
+    borrow, get = [record.slow_operation for record in caplog.records]
+    assert (borrow["name"], borrow["status"]) == ("POST /borrow/{isbn}", 200)
+    assert [(phase["phase"], phase["depth"]) for phase in borrow["phases"]] == \
+        [("endpoint", 0), ("borrow", 1), ("commit", 2), ("save", 3)]
+    assert borrow["other_ms"] >= 0
+    assert get["name"] == "GET /books/{isbn}" and get["phases"][0]["phase"] == "endpoint"
+
+    # Yalnızca seçilen yol profillenir; iş parçacığı havuzundaki endpoint de profile dahildir.
+    [profile_file] = os.listdir(profile_dir)
+    assert profile_file.endswith(".prof") and "POST_borrow_isbn" in profile_file
+    functions = {name for _, _, name in pstats.Stats(str(profile_dir / profile_file)).stats}
+    assert "borrow_book" in functions
+
+
+def test_profiling_skips_thread_profiles_when_another_profiler_is_active(tmp_path, monkeypatch):
+    """Python 3.12+ davranışı: etkin bir profil varken ikincisi ValueError verir."""
+    from kutuphane_yonetim.api import profiling
+
+    class SingleProfile(profiling.cProfile.Profile):
+        active = False
+
+        def enable(self, *args, **kwargs):
+            if SingleProfile.active:
+                raise ValueError("Another profiling tool is already active")
+            SingleProfile.active = True
+            super().enable(*args, **kwargs)
+
+        def disable(self):
+            super().disable()
+            SingleProfile.active = False
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", SingleProfile)
+    library = Library(name="Profil", data_file=str(tmp_path / "library.json"))
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    library.register_member(Member(name="Ayşe", member_id=1))
+    profile_dir = tmp_path / "profiles"
+    client = TestClient(make_app(library, profile_dir))
+
+    assert client.post(f"/borrow/{DUNE}", params={"member_id": 1}).status_code == 200
+    assert len(os.listdir(profile_dir)) == 1
@@ -0,0 +1,276 @@
+import json
+import threading
+import time
+
+import pytest
+
+from kutuphane_yonetim.core.committer import GroupCommitter, WriteBehindCommitter
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, Member, BookStatus
+from kutuphane_yonetim.core.storage import JSONStorage
+
+
+def make_book(i):
+    return Book(title=f"Kitap {i}", author="Yazar", isbn=f"{i:013d}", publication_year=2000)
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(name="Toplu", data_file=str(tmp_path / "batch.json"))
+    library.add_book(make_book(0))
+    library.register_member(Member(name="Ali", member_id=1))
+    return library
+
+
+@pytest.fixture
+def commit_calls(library, monkeypatch):
+    calls = []
+    original = library.storage.commit
+
+    def counting_commit(lib, records):
+        calls.append(list(records))
+        original(lib, records)
+
+    monkeypatch.setattr(library.storage, "commit", counting_commit)
+    return calls
+
+
+def test_batch_commits_once(library, commit_calls):
+    with library.batch():
+        for i in range(1, 51):
+            library.add_book(make_book(i))
+        library.borrow_book(member_id=1, book_isbn=make_book(0).isbn)
+
+    assert len(commit_calls) == 1
+    assert len(commit_calls[0]) == 51
+    with open(library.data_file, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)["books"]) == 51
+
+
+def test_batch_rolls_back_on_exception(library, commit_calls):
+    book = library.find_book(isbn=make_book(0).isbn)
+    member = library.find_member(1)
+
+    with pytest.raises(RuntimeError):
+        with library.transaction():
+            library.add_book(make_book(1))
+            library.register_member(Member(name="Veli", member_id=2))
+            library.borrow_book(member_id=1, book_isbn=book.isbn)
+            library.return_book(member_id=1, book_isbn=book.isbn)
+            library.borrow_book(member_id=1, book_isbn=book.isbn)
+            raise RuntimeError("iptal")
+
+    assert commit_calls == []
+    assert library.find_book(isbn=make_book(1).isbn) is None
+    assert library.find_book(title="Kitap 1") is None
+    assert library.find_member(2) is None
+    assert book.status == BookStatus.AVAILABLE
+    assert member.borrowed_books == []
+
+
+def test_nested_batch_rolls_back_only_inner_block(library, commit_calls):
+    with library.batch():
+        library.add_book(make_book(1))
+        with pytest.raises(ValueError):
+            with library.batch():
+                library.add_book(make_book(2))
+                library.add_book(make_book(1))  # aynı ISBN -> ValueError
+
+    assert len(commit_calls) == 1
+    assert [r["book"]["isbn"] for r in commit_calls[0]] == [make_book(1).isbn]
+    assert library.find_book(isbn=make_book(2).isbn) is None
+
+
+@pytest.mark.parametrize("outcome", ["commit", "rollback"])
+def test_other_threads_wait_for_keys_pending_in_a_batch(tmp_path, caplog, outcome):
+    """Bir bloğun eklediği kitabı başka bir iş parçacığı blok bitmeden ödünç alamaz:
+    blok yazılırsa ödünç ondan sonra günlüğe düşer, geri alınırsa kitap bulunamaz."""
+    path = str(tmp_path / "batch.json")
+    library = Library(name="Toplu", storage=JSONStorage(path, journal=True))
+    library.register_member(Member(name="Ali", member_id=1))
+    added, release = threading.Event(), threading.Event()
+    errors = []
+
+    def batch_thread():
+        try:
+            with library.batch():
+                library.add_book(make_book(1234567890))
+                added.set()
+                release.wait(5)
+                if outcome == "rollback":
+                    raise RuntimeError("iptal")
+        except RuntimeError:
+            pass
+
+    def borrow_thread():
+        try:
+            library.borrow_book(member_id=1, book_isbn=make_book(1234567890).isbn)
+        except ValueError as e:
+            errors.append(e)
+
+    a = threading.Thread(target=batch_thread)
+    a.start()
+    assert added.wait(5)
+    b = threading.Thread(target=borrow_thread)
+    b.start()
+    b.join(0.2)
+    assert b.is_alive()  # bloğun bitmesini bekliyor
+    release.set()
+    a.join(5)
+    b.join(5)
+    library.close()
+
+    reloaded = Library(name="Toplu", storage=JSONStorage(path, journal=True))
+    assert "uygulanamadı" not in caplog.text
+    isbn = make_book(1234567890).isbn
+    if outcome == "commit":
+        assert errors == []
+        assert reloaded.current_borrower(isbn).member_id == 1
+    else:
+        assert len(errors) == 1
+        assert reloaded.find_book(isbn=isbn) is None
+        assert library.current_borrower(isbn) is None and library.find_member(1).borrowed_books == []
+        assert reloaded.find_member(1).borrowed_books == []
+
+
+def test_failed_commit_rolls_back_batch(library, monkeypatch):
+    def failing_commit(lib, records):
+        raise IOError("disk dolu")
+
+    monkeypatch.setattr(library.storage, "commit", failing_commit)
+    with pytest.raises(IOError):
+        with library.batch():
+            library.borrow_book(member_id=1, book_isbn=make_book(0).isbn)
+
+    assert library.find_book(isbn=make_book(0).isbn).status == BookStatus.AVAILABLE
+    assert library.find_member(1).borrowed_books == []
+
+
+def test_failed_commit_rolls_back_single_operation(library, monkeypatch):
+    isbn = make_book(0).isbn
+    version, book_version = library.version, library.book_version(isbn)
+    generation = library.state_token[0]
+
+    def failing_commit(lib, records):
+        raise IOError("disk dolu")
+
+    monkeypatch.setattr(library.storage, "commit", failing_commit)
+    with pytest.raises(IOError):
+        library.borrow_book(member_id=1, book_isbn=isbn)
+    with pytest.raises(IOError):
+        library.add_book(make_book(1))
+
+    assert library.find_book(isbn=isbn).status == BookStatus.AVAILABLE
+    assert library.find_member(1).borrowed_books == []
+    assert library.current_borrower(isbn) is None
+    assert library.find_book(isbn=make_book(1).isbn) is None
+    assert (library.version, library.book_version(isbn)) == (version, book_version)
+    assert library.state_token[0] > generation
+
+
+def test_group_committer_shares_commits_between_threads():
+    committed = []
+
+    def slow_commit(records):
+        time.sleep(0.01)
+        committed.extend(records)
+
+    committer = GroupCommitter(slow_commit, window=0.005)
+    threads = [threading.Thread(target=committer.submit, args=([{"n": i}],)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(r["n"] for r in committed) == list(range(40))
+    assert committer.commits < 40
+
+
+def test_group_committer_propagates_errors_to_group():
+    def failing_commit(records):
+        raise IOError("yazılamadı")
+
+    committer = GroupCommitter(failing_commit)
+    with pytest.raises(IOError):
+        committer.submit([{"n": 1}])
+
+
+def test_write_behind_committer_coalesces_and_flushes():
+    committed = []
+    committer = WriteBehindCommitter(lambda records: committed.append(list(records)), delay=0.05)
+    for i in range(20):
+        committer.submit([{"n": i}])
+    assert committer.pending == 20 and committed == []
+
+    committer.flush()
+    assert [r["n"] for group in committed for r in group] == list(range(20))
+    assert committer.commits < 20 and committer.pending == 0
+    committer.close()
+
+
+def test_write_behind_committer_writes_after_max_pending():
+    written = threading.Event()
+    committer = WriteBehindCommitter(lambda records: written.set(), delay=60, max_pending=5)
+    committer.submit([{"n": i} for i in range(5)])
+    assert written.wait(timeout=5)
+    committer.close()
+
+
+def test_write_behind_committer_retries_failed_writes():
+    committed, failures = [], []
+
+    def flaky_commit(records):
+        if not failures:
+            failures.append(records)
+            raise IOError("disk dolu")
+        committed.extend(records)
+
+    committer = WriteBehindCommitter(flaky_commit, delay=0, retry_interval=0.01)
+    committer.submit([{"n": 1}])
+    with pytest.raises(IOError):
+        committer.flush()
+    committer.submit([{"n": 2}])
+    committer.flush()
+    assert [r["n"] for r in committed] == [1, 2]
+    committer.close()
+
+
+def test_failed_save_surfaces_through_flush_and_commit(tmp_path, monkeypatch):
+    """Günlük kapalıyken her commit tam yazmadır; yazılamayan değişiklik sessizce
+    kaybolmaz: arka plan yazıcısında flush(), doğrudan yazmada işlemin kendisi hata verir."""
+    from kutuphane_yonetim.core import storage
+
+    data_file = str(tmp_path / "write_behind.json")
+    library = Library(name="Arka Plan", data_file=data_file, write_behind=60)
+    library.add_book(make_book(0))
+
+    def failing_book_to_dict(book):
+        raise OSError("disk dolu")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(storage, "book_to_dict", failing_book_to_dict)
+        with pytest.raises(IOError, match="Veri dosyası yazılamadı"):
+            library.flush()
+    library.close()
+    assert Library(name="Arka Plan", data_file=data_file).find_book(isbn=make_book(0).isbn) is not None
+
+    direct = Library(name="Doğrudan", data_file=str(tmp_path / "direct.json"))
+    monkeypatch.setattr(storage, "book_to_dict", failing_book_to_dict)
+    with pytest.raises(IOError):
+        direct.add_book(make_book(1))
+    assert direct.find_book(isbn=make_book(1).isbn) is None
+
+
+def test_write_behind_library_is_durable_after_close(tmp_path):
+    data_file = str(tmp_path / "write_behind.json")
+    library = Library(name="Arka Plan", data_file=data_file, journal=True, write_behind=60)
+    library.add_book(make_book(0))
+    library.register_member(Member(name="Ali", member_id=1))
+    library.borrow_book(member_id=1, book_isbn=make_book(0).isbn)
+    assert library.pending_writes == 3
+    library.close()
+    assert library.pending_writes == 0
+
+    reopened = Library(name="Arka Plan", data_file=data_file, journal=True)
+    assert reopened.find_book(isbn=make_book(0).isbn).status == BookStatus.BORROWED
+    assert reopened.version == library.version
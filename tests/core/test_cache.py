@@ -0,0 +1,83 @@
+import pytest
+
+from kutuphane_yonetim.core.cache import DiskCache, MetadataCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    cache.set("a", 1, ttl=10)
+    clock.now += 11
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disk_cache_survives_reopen_and_expires(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "cache.sqlite")
+    cache = DiskCache(path, clock=clock)
+    cache.set("isbn", {"found": True, "title": "Dune"}, ttl=100)
+    cache.close()
+
+    reopened = DiskCache(path, clock=clock)
+    value, remaining = reopened.get("isbn")
+    assert value["title"] == "Dune"
+    assert remaining == 100
+
+    clock.now += 101
+    assert reopened.get("isbn") is None
+
+
+def test_disk_cache_prunes_to_max_entries(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=3, prune_every=5, clock=clock)
+    for i in range(5):
+        clock.now += 1
+        cache.set(str(i), {"n": i}, ttl=60)
+
+    assert cache.stats()["size"] == 3
+    assert cache.stats()["evictions"] == 2
+    assert cache.get("0") is None and cache.get("4") is not None
+
+
+def test_metadata_cache_uses_shorter_ttl_for_not_found(tmp_path):
+    cache = MetadataCache(ttl=1000, negative_ttl=5, disk=DiskCache(str(tmp_path / "c.sqlite")))
+    cache.set("found", {"found": True, "title": "Dune"})
+    cache.set("missing", {"found": False})
+
+    assert cache.disk.get("found")[1] > 900
+    assert cache.disk.get("missing")[1] <= 5
+
+
+def test_metadata_cache_promotes_disk_hits(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    MetadataCache(disk=DiskCache(path)).set("isbn", {"found": True, "title": "Dune"})
+
+    cache = MetadataCache(disk=DiskCache(path))
+    assert cache.get("isbn")["title"] == "Dune"
+    assert cache.get("isbn")["title"] == "Dune"
+    assert cache.stats()["disk"]["hits"] == 1
+    assert cache.stats()["memory"]["hits"] == 1
@@ -0,0 +1,91 @@
+import copy
+
+import pytest
+
+from kutuphane_yonetim.core.compact import BookView, CompactCatalogue
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import AudioBook, Book, BookStatus, EBook, Member
+
+DUNE = "9780441013593"
+NEUROMANCER = "9780441569595"
+ORWELL = "9780451524935"
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(name="Kompakt", data_file=str(tmp_path / "library.json"), compact=True)
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    library.add_book(EBook(title="Neuromancer", author="William Gibson", isbn=NEUROMANCER,
+                           publication_year=1984, file_format="EPUB"))
+    library.add_book(AudioBook(title="1984", author="George Orwell", isbn=ORWELL,
+                               publication_year=1949, duration_in_minutes=660))
+    library.register_member(Member(name="Ayşe", member_id=101))
+    return library
+
+
+def test_views_expose_book_interface(library):
+    book = library.find_book(isbn=NEUROMANCER)
+    assert isinstance(book, BookView)
+    assert (book.title, book.author, book.publication_year, book.file_format) == (
+        "Neuromancer", "William Gibson", 1984, "EPUB")
+    assert library.find_book(title="1984").duration_in_minutes == 660
+    assert "[Format: EPUB]" in book.display_info()
+
+    model = copy.deepcopy(book)
+    assert isinstance(model, EBook) and model.file_format == "EPUB"
+    assert library.find_book(isbn="0000000000") is None
+
+
+def test_borrow_return_and_delete_keep_semantics(library, tmp_path):
+    library.borrow_book(member_id=101, book_isbn=DUNE)
+    assert library.find_book(isbn=DUNE).status == BookStatus.BORROWED
+    assert library.find_member(101).borrowed_books == [library.find_book(isbn=DUNE)]
+    with pytest.raises(ValueError):
+        library.borrow_book(member_id=101, book_isbn=DUNE)
+    with pytest.raises(ValueError):
+        library.delete_book(DUNE)
+
+    library.return_book(member_id=101, book_isbn=DUNE)
+    assert library.find_book(isbn=DUNE).status == BookStatus.AVAILABLE
+    assert library.find_member(101).borrowed_books == []
+
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            library.delete_book(DUNE)
+            raise RuntimeError("iptal")
+    assert library.find_book(isbn=DUNE).title == "Dune"
+
+    library.delete_book(NEUROMANCER)
+    assert library.find_book(isbn=ORWELL).duration_in_minutes == 660
+    library.borrow_book(member_id=101, book_isbn=ORWELL)
+    library.close()
+
+    reloaded = Library(name="Yeniden", data_file=str(tmp_path / "library.json"), compact=True)
+    assert sorted(reloaded._books) == [DUNE, ORWELL]
+    assert reloaded.find_book(isbn=ORWELL).status == BookStatus.BORROWED
+    assert [book.isbn for book in reloaded.find_member(101).borrowed_books] == [ORWELL]
+
+
+def test_catalogue_delete_moves_last_row_and_keeps_order():
+    catalogue = CompactCatalogue()
+    for i in range(5):
+        catalogue[f"978000000000{i}"] = Book(title=f"K{i}", author="Aynı Yazar",
+                                             isbn=f"978000000000{i}", publication_year=2000 + i)
+    del catalogue["9780000000001"]
+    assert list(catalogue) == ["9780000000000", "9780000000002", "9780000000003", "9780000000004"]
+    assert catalogue["9780000000004"].publication_year == 2004
+    assert catalogue["9780000000002"].author is catalogue["9780000000003"].author
+    with pytest.raises(KeyError):
+        catalogue["9780000000001"]
+
+
+def test_catalogue_rejects_unstorable_year_without_misaligning_columns(library):
+    catalogue = library._books
+    library.add_book(Book(title="Uzak Gelecek", author="Yazar", isbn="9780000070000", publication_year=70000))
+    assert library.find_book(isbn="9780000070000").publication_year == 70000
+
+    with pytest.raises(ValueError, match="saklanamaz"):
+        library.add_book(Book(title="Taşan", author="Yazar", isbn="9780000000099", publication_year=2 ** 40))
+    assert "9780000000099" not in catalogue
+    assert len(catalogue._isbns) == len(catalogue._titles) == len(catalogue._years) == len(catalogue)
+    assert [book.title for book in catalogue.values()][-1] == "Uzak Gelecek"
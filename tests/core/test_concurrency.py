@@ -0,0 +1,226 @@
+import random
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.locks import SharedExclusiveLock
+from kutuphane_yonetim.core.models import Book, BookStatus, Member
+from kutuphane_yonetim.core.storage import JSONStorage, SQLiteStorage
+
+THREADS = 16
+BOOKS = 24
+MEMBERS = 12
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """İş parçacıklarının daha sık yer değiştirmesi yarışları görünür kılar."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, count=THREADS, background=()):
+    """target(i)'yi `count` iş parçacığında çalıştırır; `background` işlevleri
+    bunlar bitene kadar döngüde çalışır. Herhangi birindeki hata testi bozar."""
+    errors, stop = [], threading.Event()
+
+    def guarded(function, *args):
+        try:
+            function(*args)
+        except BaseException as e:
+            errors.append(e)
+
+    def loop(function):
+        while not stop.is_set():
+            function()
+
+    threads = [threading.Thread(target=guarded, args=(target, i)) for i in range(count)]
+    loopers = [threading.Thread(target=guarded, args=(loop, function)) for function in background]
+    for thread in loopers + threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    for thread in loopers:
+        thread.join()
+    assert errors == []
+
+
+def assert_loans_consistent(library):
+    holders = Counter()
+    for member in library._members.values():
+        for book in member.borrowed_books:
+            holders[book.isbn] += 1
+            assert library._borrowers[book.isbn] == member.member_id
+    assert all(count == 1 for count in holders.values())
+    assert set(holders) == set(library._borrowers)
+    for isbn, book in library._books.items():
+        assert (book.status == BookStatus.BORROWED) == (isbn in library._borrowers)
+
+
+def loan_state(library):
+    return sorted(library._borrowers.items())
+
+
+@pytest.fixture(params=["journal", "json", "sqlite", "compact"])
+def make_library(request, tmp_path):
+    def make():
+        if request.param == "sqlite":
+            storage = SQLiteStorage(str(tmp_path / "library.db"))
+        else:
+            # Sık anlık görüntü: tam yazmalar değişikliklerle aynı anda yapılır.
+            storage = JSONStorage(str(tmp_path / "library.json"), journal=request.param != "json",
+                                  snapshot_every=25)
+        return Library(name="Eşzamanlı", storage=storage, group_commit_window=0,
+                       compact=request.param == "compact")
+    return make
+
+
+def test_concurrent_borrow_and_return_keep_invariants(make_library):
+    library = make_library()
+    isbns = [f"978000000{i:04d}" for i in range(BOOKS)]
+    with library.batch():
+        for i, isbn in enumerate(isbns):
+            library.add_book(Book(title=f"Kitap {i}", author="Yazar", isbn=isbn, publication_year=2000))
+        for member_id in range(1, MEMBERS + 1):
+            library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+
+    lent = Counter()
+    lent_lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(150):
+            isbn, member_id = rng.choice(isbns), rng.randint(1, MEMBERS)
+            try:
+                if rng.random() < 0.5:
+                    library.borrow_book(member_id=member_id, book_isbn=isbn)
+                    delta = 1
+                else:
+                    library.return_book(member_id=member_id, book_isbn=isbn)
+                    delta = -1
+            except ValueError:
+                continue
+            with lent_lock:
+                lent[isbn] += delta
+
+    run_threads(worker)
+
+    # Hiçbir kitap iki kez ödünç verilmedi ve her başarılı iade bir ödünce karşılık geldi.
+    assert all(lent[isbn] in (0, 1) for isbn in isbns)
+    assert {isbn for isbn in isbns if lent[isbn]} == set(library._borrowers)
+    assert_loans_consistent(library)
+
+    library.flush()
+    reloaded = make_library()
+    assert loan_state(reloaded) == loan_state(library)
+    assert reloaded.version == library.version
+    assert_loans_consistent(reloaded)
+
+
+def test_batches_and_single_operations_interleave_safely(make_library):
+    """Bloklar dokundukları kayıtları sonuna kadar tutar; tek işlemlerle ve geri
+    alınan bloklarla karışık çalışmada kilitlenme olmaz, ödünçler tutarlı kalır."""
+    library = make_library()
+    isbns = [f"978000000{i:04d}" for i in range(BOOKS)]
+    with library.batch():
+        for i, isbn in enumerate(isbns):
+            library.add_book(Book(title=f"Kitap {i}", author="Yazar", isbn=isbn, publication_year=2000))
+        for member_id in range(1, MEMBERS + 1):
+            library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+
+    def toggle(rng):
+        isbn, member_id = rng.choice(isbns), rng.randint(1, MEMBERS)
+        try:
+            if rng.random() < 0.5:
+                library.borrow_book(member_id=member_id, book_isbn=isbn)
+            else:
+                library.return_book(member_id=member_id, book_isbn=isbn)
+        except ValueError:
+            pass
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(40):
+            if seed % 2:
+                toggle(rng)
+                continue
+            try:
+                with library.batch():
+                    for _ in range(rng.randint(1, 4)):
+                        toggle(rng)
+                    if rng.random() < 0.3:
+                        raise RuntimeError("iptal")
+            except RuntimeError:
+                pass
+
+    run_threads(worker, count=8)
+    assert_loans_consistent(library)
+
+    library.flush()
+    reloaded = make_library()
+    assert loan_state(reloaded) == loan_state(library)
+    assert_loans_consistent(reloaded)
+
+
+def test_same_isbn_added_concurrently_only_once(make_library):
+    library = make_library()
+    added = []
+
+    def worker(i):
+        try:
+            library.add_book(Book(title=f"Yarış {i}", author="Yazar", isbn="9780000009999", publication_year=2001))
+            added.append(i)
+        except ValueError:
+            pass
+
+    run_threads(worker)
+    assert len(added) == 1
+    assert library.total_books == 1
+
+
+def test_reads_during_concurrent_writes(make_library):
+    library = make_library()
+    library.find_book(title="ısınma")  # indeksler kurulu olsun
+
+    def reader():
+        library.search("kitap")
+        library.page_books(limit=10)
+        list(library.iter_export("books"))
+        list(library.iter_export("loans"))
+
+    def writer(i):
+        for j in range(20):
+            isbn = f"97810{i:03d}{j:05d}"
+            library.add_book(Book(title=f"Kitap {i}-{j}", author="Yazar", isbn=isbn, publication_year=2000))
+            if j % 2:
+                library.delete_book(isbn)
+
+    run_threads(writer, count=8, background=[reader, reader])
+
+    assert library.total_books == 8 * 10
+    assert len(library.search("kitap", limit=1000)) == 80
+    assert len(library.page_books(limit=1000)[0]) == 80
+
+
+def test_exclusive_waits_for_shared_sections():
+    lock = SharedExclusiveLock()
+    events = []
+
+    def exclusive():
+        with lock.exclusive():
+            events.append("exclusive")
+
+    with lock.shared():
+        thread = threading.Thread(target=exclusive)
+        thread.start()
+        thread.join(0.05)
+        # Paylaşımlı bölüm sürerken özel bölüme girilemez.
+        assert events == []
+    thread.join(1)
+    assert events == ["exclusive"]
@@ -0,0 +1,119 @@
+import gzip
+import json
+
+import pytest
+
+from kutuphane_yonetim.core.export import gzip_chunks, iter_ndjson
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, EBook, Member
+from kutuphane_yonetim.core.storage import JSONStorage, SQLiteStorage
+
+DUNE = "9780441013593"
+NEUROMANCER = "9780441569595"
+ORWELL = "9780451524935"
+
+
+def fill(library):
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    library.add_book(EBook(title="Neuromancer", author="William Gibson", isbn=NEUROMANCER,
+                           publication_year=1984, file_format="EPUB"))
+    library.register_member(Member(name="Ayşe", member_id=101))
+    library.borrow_book(member_id=101, book_isbn=NEUROMANCER)
+
+
+@pytest.fixture(params=["json", "journal", "sqlite"])
+def make_library(request, tmp_path):
+    def make():
+        if request.param == "sqlite":
+            storage = SQLiteStorage(str(tmp_path / "library.db"))
+        else:
+            storage = JSONStorage(str(tmp_path / "library.json"), journal=request.param == "journal")
+        return Library(name="Dışa Aktarım", storage=storage)
+    return make
+
+
+def test_full_export(make_library):
+    library = make_library()
+    fill(library)
+    books = list(library.iter_export("books"))
+    assert [b["isbn"] for b in books] == [DUNE, NEUROMANCER]
+    assert books[1]["book_type"] == "ebook" and books[1]["status"] == "ödünç alınmış"
+    assert list(library.iter_export("members")) == [{"member_id": 101, "name": "Ayşe", "version": 4}]
+    assert list(library.iter_export("loans")) == [{"member_id": 101, "isbn": NEUROMANCER, "version": 4}]
+    with pytest.raises(ValueError):
+        list(library.iter_export("orders"))
+
+
+def test_export_does_not_skip_books_when_one_is_deleted_mid_stream(make_library):
+    library = make_library()
+    isbns = [f"978{i:010d}" for i in range(6)]
+    for isbn in isbns:
+        library.add_book(Book(title="Kitap", author="Yazar", isbn=isbn, publication_year=2000))
+
+    exported = []
+    for record in library.iter_export("books"):
+        exported.append(record["isbn"])
+        if record["isbn"] == isbns[2]:
+            # Aktarılmış bir kitabın silinmesi sıradakini atlatmamalı.
+            library.delete_book(isbns[0])
+    assert exported == isbns
+
+
+def test_since_filter_survives_restart(make_library):
+    library = make_library()
+    fill(library)
+    checkpoint = library.version
+    assert list(library.iter_export("books", since=checkpoint)) == []
+
+    library.add_book(Book(title="1984", author="George Orwell", isbn=ORWELL, publication_year=1949))
+    library.return_book(member_id=101, book_isbn=NEUROMANCER)
+    library.delete_book(DUNE)
+    library.close()
+
+    reopened = make_library()
+    assert reopened.version == checkpoint + 3
+    changed = list(reopened.iter_export("books", since=checkpoint))
+    assert [(r["isbn"], r.get("deleted", False)) for r in changed] == [
+        (NEUROMANCER, False), (ORWELL, False), (DUNE, True)]
+    assert list(reopened.iter_export("loans", since=checkpoint)) == [
+        {"isbn": NEUROMANCER, "deleted": True, "version": checkpoint + 2}]
+    assert list(reopened.iter_export("members", since=checkpoint))[0]["member_id"] == 101
+
+    # Yeniden eklenen kitabın mezar taşı kalkar.
+    reopened.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    assert [r.get("deleted", False) for r in reopened.iter_export("books", since=checkpoint)
+            if r["isbn"] == DUNE] == [False]
+
+
+def test_returned_loans_are_exported_as_tombstones(make_library):
+    library = make_library()
+    fill(library)
+    library.add_book(Book(title="1984", author="George Orwell", isbn=ORWELL, publication_year=1949))
+    library.borrow_book(member_id=101, book_isbn=ORWELL)
+    checkpoint = library.version
+    assert [r["isbn"] for r in library.iter_export("loans", since=checkpoint - 1)] == [ORWELL]
+
+    library.return_book(member_id=101, book_isbn=NEUROMANCER)
+    library.close()
+    reopened = make_library()
+    assert list(reopened.iter_export("loans", since=checkpoint)) == [
+        {"isbn": NEUROMANCER, "deleted": True, "version": checkpoint + 1}]
+    # Tam aktarımda mezar taşı yoktur; yalnızca süren ödünçler listelenir.
+    assert [r["isbn"] for r in reopened.iter_export("loans")] == [ORWELL]
+
+    # Kitap yeniden ödünç verilince mezar taşı kalkar, yeni ödünç görünür.
+    reopened.register_member(Member(name="Can", member_id=102))
+    reopened.borrow_book(member_id=102, book_isbn=NEUROMANCER)
+    assert [(r["isbn"], r.get("member_id")) for r in reopened.iter_export("loans", since=checkpoint)] == [
+        (NEUROMANCER, 102)]
+
+
+def test_ndjson_and_gzip_encoding_stream_in_chunks():
+    records = ({"n": i, "ad": "Ayşe"} for i in range(2500))
+    chunks = list(iter_ndjson(records, lines_per_chunk=1000))
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert json.loads(lines[-1]) == {"n": 2499, "ad": "Ayşe"}
+
+    compressed = b"".join(gzip_chunks(iter(chunks)))
+    assert gzip.decompress(compressed) == b"".join(chunks)
@@ -0,0 +1,104 @@
+import io
+import json
+
+import pytest
+
+from kutuphane_yonetim.core.importer import StreamParser, read_rows
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, EBook, AudioBook
+
+CSV_DATA = """title,author,isbn,publication_year,book_type,file_format,duration_in_minutes
+Dune,Frank Herbert,9780441013593,1965,book,,
+Neuromancer,William Gibson,9780441569595,1984,ebook,EPUB,
+1984,George Orwell,9780451524935,1949,audiobook,,660
+Tekrar,Yazar,9780441013593,1990,book,,
+Eski,Yazar,1234567890,1200,book,,
+Garip,Yazar,1234567891,2000,dergi,,
+"Başlık, virgüllü",Yazar,1234567892,2001,book,,
+"""
+
+
+@pytest.fixture
+def library(tmp_path):
+    return Library(name="İçe Aktarma", data_file=str(tmp_path / "import.json"))
+
+
+def test_import_csv_rows(library):
+    report = library.import_books(read_rows(io.StringIO(CSV_DATA), "csv"))
+
+    assert report.total_rows == 7
+    assert report.imported == 4
+    assert report.failed == 3
+    assert [e["row"] for e in report.errors] == [4, 5, 6]
+    assert "zaten mevcut" in report.errors[0]["error"]
+    assert isinstance(library.find_book(isbn="9780441569595"), EBook)
+    assert library.find_book(isbn="9780451524935").duration_in_minutes == 660
+    assert library.find_book(title="Başlık, virgüllü") is not None
+
+
+def test_import_jsonl_rejects_duplicates_of_existing_books(library):
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+    lines = "\n".join([
+        json.dumps({"title": "Dune", "author": "F. H.", "isbn": "9780441013593", "publication_year": 1965}),
+        "{bozuk json",
+        json.dumps({"title": "Yeni", "author": "Yazar", "isbn": "1111111111", "publication_year": 2020}),
+    ])
+    report = library.import_books(read_rows(io.StringIO(lines), "jsonl"))
+
+    assert report.imported == 1
+    assert [e["row"] for e in report.errors] == [1, 2]
+    assert report.rows_per_second > 0
+
+
+def test_import_rejects_only_the_row_added_concurrently(library, monkeypatch):
+    """Denetimden sonra başka bir istekle eklenen ISBN yalnızca o satırı reddeder."""
+    original = library._insert_book
+
+    def racing_insert(book):
+        if book.isbn == "2222222222" and library.find_book(isbn=book.isbn) is None:
+            original(Book(title="Araya giren", author="Başka", isbn=book.isbn, publication_year=2001))
+        return original(book)
+
+    monkeypatch.setattr(library, "_insert_book", racing_insert)
+    rows = [{"title": f"Kitap {i}", "author": "Yazar", "isbn": f"{i}" * 10, "publication_year": 2000}
+            for i in range(1, 4)]
+    report = library.import_books(rows)
+
+    assert report.imported == 2
+    assert report.errors == [{"row": 2, "isbn": "2222222222", "error": "ISBN 2222222222 zaten mevcut."}]
+    assert library.find_book(isbn="1111111111") is not None and library.find_book(isbn="3333333333") is not None
+    assert library.find_book(isbn="2222222222").title == "Araya giren"
+
+
+def test_import_persists_once_per_chunk(library, monkeypatch):
+    calls = []
+    original = library.storage.commit
+    monkeypatch.setattr(library.storage, "commit", lambda lib, records: (calls.append(len(records)), original(lib, records)))
+
+    rows = ({"title": f"Kitap {i}", "author": "Yazar", "isbn": f"{i:013d}", "publication_year": 2000}
+            for i in range(250))
+    report = library.import_books(rows, chunk_size=100)
+
+    assert report.imported == 250
+    assert calls == [100, 100, 50]
+    assert Library(name="Yeniden", data_file=library.data_file).total_books == 250
+
+
+def test_import_error_details_are_bounded(library):
+    rows = ({"title": "Hatalı", "author": "Yazar", "isbn": "kısa", "publication_year": 2000} for _ in range(50))
+    report = library.import_books(rows, max_errors=5)
+
+    assert report.failed == 50
+    assert len(report.errors) == 5
+
+
+def test_stream_parser_handles_split_chunks():
+    data = 'title,author,isbn,publication_year\n"Çok\nsatırlı",Yazar,1234567890,2000\nİkinci,Yazar,1234567891,2001'.encode("utf-8")
+    parser = StreamParser("csv")
+    rows = []
+    for i in range(0, len(data), 3):
+        rows.extend(parser.feed(data[i:i + 3]))
+    rows.extend(parser.close())
+
+    assert [row["title"] for row in rows] == ["Çok\nsatırlı", "İkinci"]
+    assert rows[1]["isbn"] == "1234567891"
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, Member, BookStatus
+
+
+def make_book(i):
+    return Book(title=f"Kitap {i}", author="Yazar", isbn=f"{i:013d}", publication_year=2000)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "journal_library.json")
+
+
+def journal_lines(library):
+    with open(library.storage.journal.path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_mutations_append_one_record_each(data_file):
+    """Her değişikliğin ana dosyayı yeniden yazmadan günlüğe tek satır eklediğini test eder."""
+    library = Library(name="Günlük", data_file=data_file, journal=True)
+    library.add_book(make_book(1))
+    library.register_member(Member(name="Ali", member_id=1))
+    library.borrow_book(member_id=1, book_isbn=make_book(1).isbn)
+    library.return_book(member_id=1, book_isbn=make_book(1).isbn)
+    library.delete_book(make_book(1).isbn)
+
+    assert not os.path.exists(data_file)
+    records = journal_lines(library)
+    assert [r["op"] for r in records] == ["add_book", "register_member", "borrow", "return", "delete_book"]
+    assert [r["seq"] for r in records] == [1, 2, 3, 4, 5]
+
+
+def test_replay_restores_state(data_file):
+    library = Library(name="Günlük", data_file=data_file, journal=True)
+    library.add_book(make_book(1))
+    library.add_book(make_book(2))
+    library.register_member(Member(name="Ali", member_id=1))
+    library.borrow_book(member_id=1, book_isbn=make_book(2).isbn)
+
+    reloaded = Library(name="Günlük", data_file=data_file, journal=True)
+    book = reloaded.find_book(isbn=make_book(2).isbn)
+    assert reloaded.total_books == 2
+    assert book.status == BookStatus.BORROWED
+    assert reloaded.find_member(1).borrowed_books == [book]
+
+
+def test_snapshot_compacts_journal(data_file):
+    library = Library(name="Günlük", data_file=data_file, journal=True, snapshot_every=3)
+    for i in range(4):
+        library.add_book(make_book(i))
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert len(snapshot["books"]) == 3
+    assert snapshot["journal_seq"] == 3
+    assert [r["seq"] for r in journal_lines(library)] == [4]
+
+    reloaded = Library(name="Günlük", data_file=data_file, journal=True)
+    assert reloaded.total_books == 4
+
+
+def test_crash_between_snapshot_and_journal_reset_loses_nothing(data_file):
+    """Anlık görüntü yazılıp günlük boşaltılmadan çökülürse kayıtların
+    ne kaybolduğunu ne de iki kez uygulandığını test eder."""
+    library = Library(name="Günlük", data_file=data_file, journal=True)
+    library.add_book(make_book(1))
+    library.register_member(Member(name="Ali", member_id=1))
+    library.borrow_book(member_id=1, book_isbn=make_book(1).isbn)
+
+    stale_journal = data_file + ".stale"
+    shutil.copy(library.storage.journal.path, stale_journal)
+    library.compact()
+    library.storage.journal.close()
+    shutil.copy(stale_journal, library.storage.journal.path)
+
+    reloaded = Library(name="Günlük", data_file=data_file, journal=True)
+    assert reloaded.total_books == 1
+    assert len(reloaded.find_member(1).borrowed_books) == 1
+
+    reloaded.add_book(make_book(2))
+    assert Library(name="Günlük", data_file=data_file, journal=True).total_books == 2
+
+
+def test_torn_last_record_is_discarded(data_file):
+    library = Library(name="Günlük", data_file=data_file, journal=True)
+    library.add_book(make_book(1))
+    library.storage.journal.close()
+    with open(library.storage.journal.path, 'ab') as f:
+        f.write(b'{"op":"add_book","bo')
+
+    reloaded = Library(name="Günlük", data_file=data_file, journal=True)
+    assert reloaded.total_books == 1
+    reloaded.add_book(make_book(2))
+
+    assert Library(name="Günlük", data_file=data_file, journal=True).total_books == 2
+
+
+def test_record_size_does_not_depend_on_catalogue_size(tmp_path):
+    def borrow_cost(size):
+        library = Library(name="Boyut", data_file=str(tmp_path / f"{size}.json"), journal=True,
+                          snapshot_every=10**9)
+        for i in range(size):
+            library.add_book(make_book(i))
+        library.register_member(Member(name="Ali", member_id=1))
+        before = os.path.getsize(library.storage.journal.path)
+        library.borrow_book(member_id=1, book_isbn=make_book(0).isbn)
+        return os.path.getsize(library.storage.journal.path) - before
+
+    # Sıra numaraları aynı basamak sayısında kalsın diye 10 ve 90 seçildi.
+    assert borrow_cost(10) == borrow_cost(90)
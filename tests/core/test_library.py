@@ -1,5 +1,6 @@
 import pytest
 import json
+import httpx
 from kutuphane_yonetim.core.library import Library
 from kutuphane_yonetim.core.models import Book, Member, BookStatus, EBook, AudioBook
 
@@ -18,7 +19,7 @@ def library_with_data(empty_library):
     member = Member(name="Ayşe Yılmaz", member_id=101)
     
 
-    library._books.append(book)
+    library.add_book(book)
     library.register_member(member)
     
     return library, book, member
@@ -118,7 +119,7 @@ async def test_add_duplicate_isbn_from_api_fails(empty_library):
     test_isbn = "1234567890"
 
     existing_book = Book(title="Mevcut Kitap", author="Yazar", isbn=test_isbn, publication_year=2020)
-    library._books.append(existing_book)
+    library.add_book(existing_book)
     
     with pytest.raises(ValueError, match="zaten mevcut"):
         await library.add_book_from_api(test_isbn)
@@ -190,7 +191,284 @@ def test_load_subclass_books_correctly(tmp_path):
     library = Library(name="Subclass Test", data_file=str(test_file))
     
     assert len(library._books) == 1
-    loaded_book = library._books[0]
+    loaded_book = library.find_book(isbn="9780441569595")
     
     assert isinstance(loaded_book, EBook)
-    assert loaded_book.file_format == "EPUB"
\ No newline at end of file
+    assert loaded_book.file_format == "EPUB"
+
+#İndeks Testleri
+
+
+def test_title_lookup_is_case_insensitive(library_with_data):
+    library, book, member = library_with_data
+    assert library.find_book(title="dUNE") is book
+    assert library.find_book(title="Olmayan Kitap") is None
+
+def test_indexes_stay_consistent_after_delete(library_with_data):
+    library, book, member = library_with_data
+    library.delete_book(isbn=book.isbn)
+
+    assert library.find_book(isbn=book.isbn) is None
+    assert library.find_book(title=book.title) is None
+
+    library.add_book(book)
+    assert library.find_book(title="dune") is book
+
+def test_indexes_rebuilt_on_load(library_with_data):
+    library, book, member = library_with_data
+    library.borrow_book(member_id=member.member_id, book_isbn=book.isbn)
+
+    reloaded = Library(name="Yeniden Yükleme", data_file=library.data_file)
+    loaded_book = reloaded.find_book(title="Dune")
+    loaded_member = reloaded.find_member(member.member_id)
+
+    assert loaded_book is reloaded.find_book(isbn=book.isbn)
+    assert loaded_member.borrowed_books == [loaded_book]
+
+    reloaded.return_book(member_id=member.member_id, book_isbn=book.isbn)
+    assert reloaded.find_book(isbn=book.isbn).status == BookStatus.AVAILABLE
+
+def test_lookup_time_does_not_grow_with_catalogue(tmp_path):
+    """ISBN ve üye aramalarının katalog büyüdükçe yavaşlamadığını test eder."""
+    import time
+
+    def build(size):
+        library = Library(name=f"Boyut {size}", data_file=str(tmp_path / f"{size}.json"))
+        for i in range(size):
+            library._index_book(Book(title=f"Kitap {i}", author="Yazar", isbn=f"{i:013d}", publication_year=2000))
+            library._members[i] = Member(name=f"Üye {i}", member_id=i)
+        return library
+
+    def measure(library, size):
+        probes = [f"{i:013d}" for i in range(size - 1, size - 2001, -1)]
+        start = time.perf_counter()
+        for _ in range(5):
+            for isbn in probes:
+                library.find_book(isbn=isbn)
+                library.find_member(int(isbn))
+        return time.perf_counter() - start
+
+    small, large = build(2_000), build(100_000)
+    small_time = min(measure(small, 2_000) for _ in range(3))
+    large_time = min(measure(large, 100_000) for _ in range(3))
+
+    # Doğrusal tarama 50 kat yavaşlardı; sabit zamanlı aramada oran 1'e yakın kalmalı.
+    assert large_time < small_time * 5
+
+
+#Toplu Open Library Testleri
+
+
+def search_url(isbn):
+    return f"https://openlibrary.org/search.json?q={isbn}"
+
+def search_result(title):
+    return {"numFound": 1, "docs": [{"title": title, "author_name": ["Yazar"], "first_publish_year": 2000}]}
+
+
+@pytest.mark.asyncio
+async def test_add_books_from_api_reports_each_isbn_and_saves_once(empty_library, httpx_mock, monkeypatch):
+    library = empty_library
+    library.open_library.backoff = 0
+    library.add_book(Book(title="Mevcut", author="Yazar", isbn="1111111111", publication_year=2000))
+
+    httpx_mock.add_response(url=search_url("2222222222"), json=search_result("Bir"))
+    httpx_mock.add_response(url=search_url("3333333333"), json={"numFound": 0, "docs": []})
+    httpx_mock.add_response(url=search_url("4444444444"), status_code=503)
+    httpx_mock.add_response(url=search_url("4444444444"), status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(url=search_url("4444444444"), json=search_result("Üç Deneme"))
+    httpx_mock.add_response(url=search_url("5555555555"), status_code=404)
+
+    commits = []
+    original = library.storage.commit
+    monkeypatch.setattr(library.storage, "commit", lambda lib, records: (commits.append(len(records)), original(lib, records)))
+
+    isbns = ["1111111111", "2222222222", "3333333333", "4444444444", "5555555555", "2222222222"]
+    results = await library.add_books_from_api(isbns, concurrency=2)
+
+    assert [(r.isbn, r.status) for r in results] == [
+        ("1111111111", "duplicate"), ("2222222222", "added"), ("3333333333", "not_found"),
+        ("4444444444", "added"), ("5555555555", "error"),
+    ]
+    assert commits == [2]
+    assert library.find_book(isbn="4444444444").title == "Üç Deneme"
+
+
+@pytest.mark.asyncio
+async def test_add_books_from_api_skips_isbn_added_meanwhile_off_the_event_loop(empty_library, httpx_mock, monkeypatch):
+    import threading
+    library = empty_library
+
+    def added_meanwhile(request):
+        # Yanıt beklenirken aynı ISBN başka bir istekle eklenir.
+        library.add_book(Book(title="Yarış", author="Yazar", isbn="2222222222", publication_year=2000))
+        return httpx.Response(200, json=search_result("Bir"))
+
+    httpx_mock.add_callback(added_meanwhile, url=search_url("2222222222"))
+    httpx_mock.add_response(url=search_url("3333333333"), json=search_result("İki"))
+
+    threads = []
+    original = library._insert_book
+    monkeypatch.setattr(library, "_insert_book", lambda book: (threads.append(threading.get_ident()), original(book)))
+
+    results = await library.add_books_from_api(["2222222222", "3333333333"])
+
+    assert [(r.isbn, r.status) for r in results] == [("2222222222", "duplicate"), ("3333333333", "added")]
+    assert "zaten mevcut" in results[0].detail and results[0].book is None
+    assert library.find_book(isbn="2222222222").title == "Yarış"
+    assert library.find_book(isbn="3333333333").title == "İki"
+    # İlk çağrı geri çağrıdaki add_book'tur; toplu ekleme olay döngüsünün dışında yürür.
+    assert len(threads) == 3 and threading.get_ident() not in threads[1:]
+
+
+@pytest.mark.asyncio
+async def test_add_books_from_api_bounds_concurrency_and_reuses_client(empty_library, httpx_mock, monkeypatch):
+    import asyncio
+    from kutuphane_yonetim.core import openlibrary
+
+    created = []
+    original_factory = openlibrary.create_http_client
+    monkeypatch.setattr(openlibrary, "create_http_client", lambda: created.append(1) or original_factory())
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_response(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=search_result("Bağış"))
+
+    httpx_mock.add_callback(slow_response, is_reusable=True)
+
+    isbns = [f"{i:010d}" for i in range(1, 21)]
+    results = await empty_library.add_books_from_api(isbns, concurrency=4)
+    await empty_library.add_book_from_api("9999999999")
+
+    assert all(r.status == "added" for r in results)
+    assert peak <= 4
+    assert len(created) == 1
+    assert empty_library.total_books == 21
+
+
+@pytest.mark.asyncio
+async def test_add_book_from_api_uses_cache_for_warm_isbn(empty_library, httpx_mock):
+    """Önbellekteki bir ISBN için (bulundu ya da bulunamadı) ağa çıkılmadığını test eder."""
+    library = empty_library
+    httpx_mock.add_response(url=search_url("2222222222"), json=search_result("Önbellek"))
+    httpx_mock.add_response(url=search_url("3333333333"), json={"numFound": 0, "docs": []})
+
+    await library.add_book_from_api("2222222222")
+    library.delete_book("2222222222")
+    await library.add_book_from_api("2222222222")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="arama sonucu bulunamadı"):
+            await library.add_book_from_api("3333333333")
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert library.open_library.cache.stats()["memory"]["hits"] == 2
+
+
+def test_close_closes_own_http_client_after_event_loop_ends(empty_library, httpx_mock):
+    """asyncio.run bittikten sonra çağrılan close() kütüphanenin kendi istemcisini kapatır."""
+    import asyncio
+
+    httpx_mock.add_response(url=search_url("2222222222"), json=search_result("Kapanış"))
+    asyncio.run(empty_library.add_book_from_api("2222222222"))
+    client = empty_library.open_library._client
+
+    empty_library.close()
+    assert client.is_closed
+    assert empty_library.open_library._client is None
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_own_http_client_but_not_a_shared_one(empty_library, httpx_mock, tmp_path):
+    httpx_mock.add_response(url=search_url("2222222222"), json=search_result("Kapanış"), is_reusable=True)
+    await empty_library.add_book_from_api("2222222222")
+    client = empty_library.open_library._client
+
+    await empty_library.aclose()
+    assert client.is_closed
+
+    async with httpx.AsyncClient() as shared:
+        library = Library(name="Paylaşılan", data_file=str(tmp_path / "shared.json"), http_client=shared)
+        await library.add_book_from_api("2222222222")
+        await library.aclose()
+        assert not shared.is_closed
+
+
+def test_page_books_uses_stable_isbn_cursor_and_filters(empty_library):
+    """Kitap sayfalamasının ISBN imleciyle ve filtrelerle çalıştığını test eder."""
+    library = empty_library
+    for i in range(25):
+        book_cls, extra = Book, {}
+        if i % 5 == 0:
+            book_cls, extra = EBook, {"file_format": "PDF"}
+        library.add_book(book_cls(title=f"Kitap {i}", author="Orhan Pamuk" if i % 2 else "Ayşe Kulin",
+                                  isbn=f"97800000000{i:02d}", publication_year=1990 + i, **extra))
+
+    page, cursor = library.page_books(limit=10)
+    assert [b.isbn for b in page] == [f"97800000000{i:02d}" for i in range(10)]
+    assert cursor == "9780000000009"
+
+    # Sayfalar arasında yapılan ekleme/silme, sonraki sayfayı kaydırmaz.
+    library.delete_book("9780000000003")
+    library.add_book(Book(title="Yeni", author="X", isbn="978000000000", publication_year=2000))
+    page, cursor = library.page_books(limit=10, after=cursor)
+    assert page[0].isbn == "9780000000010"
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = library.page_books(limit=4, after=cursor, author="ORHAN PAMUK", year_from=1995)
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert [b.publication_year for b in seen] == [1990 + i for i in range(5, 25, 2)]
+    assert len(library.page_books(limit=100, book_type="ebook")[0]) == 5
+    assert library.page_books(limit=100, status=BookStatus.BORROWED) == ([], None)
+
+
+def test_page_members(empty_library):
+    library = empty_library
+    for member_id in (30, 10, 20):
+        library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+    page, cursor = library.page_members(limit=2)
+    assert [m.member_id for m in page] == [10, 20] and cursor == 20
+    assert library.page_members(limit=2, after=cursor) == ([library.find_member(30)], None)
+
+def test_loan_table_tracks_current_borrower(library_with_data, tmp_path):
+    library, book, member = library_with_data
+    library.register_member(Member(name="Can", member_id=102))
+    assert library.current_borrower(book.isbn) is None
+
+    library.borrow_book(member_id=101, book_isbn=book.isbn)
+    assert library.current_borrower(book.isbn) is member
+    with pytest.raises(ValueError, match="ödünç almamış"):
+        library.return_book(member_id=102, book_isbn=book.isbn)
+    assert library.current_borrower(book.isbn) is member
+
+    reloaded = Library(name="Yeniden", data_file=library.data_file)
+    assert reloaded.current_borrower(book.isbn).member_id == 101
+
+    library.return_book(member_id=101, book_isbn=book.isbn)
+    assert library.current_borrower(book.isbn) is None
+
+def test_return_from_member_with_many_loans(empty_library):
+    library = empty_library
+    library.register_member(Member(name="Kurum", member_id=1))
+    with library.batch():
+        for i in range(3000):
+            library.add_book(Book(title=f"Kitap {i}", author="Yazar", isbn=f"{i:013d}", publication_year=2000))
+            library.borrow_book(member_id=1, book_isbn=f"{i:013d}")
+
+    member = library.find_member(1)
+    library.return_book(member_id=1, book_isbn=f"{1500:013d}")
+    assert len(member.borrowed_books) == 2999
+    assert f"{1500:013d}" not in member.borrowed_books.isbns()
+    # Ödünç alma sırası korunur.
+    assert [b.isbn for b in member.borrowed_books][1499:1501] == [f"{1499:013d}", f"{1501:013d}"]
+    assert library.current_borrower(f"{1501:013d}") is member
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+
+from kutuphane_yonetim.core import slowlog
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.metrics import OPERATION_SECONDS, Registry, timed
+from kutuphane_yonetim.core.models import Book, Member
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("test_seconds", "Test süresi.", ["operation"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, "oku")
+    histogram.observe(0.5, "oku")
+    histogram.observe(3, "oku")
+    counter = registry.counter("test_total", 'Tırnaklı "etiket".', ["file"])
+    counter.inc('a"b', amount=2)
+
+    assert registry.render().splitlines() == [
+        "# HELP test_seconds Test süresi.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{operation="oku",le="0.1"} 1',
+        'test_seconds_bucket{operation="oku",le="1"} 2',
+        'test_seconds_bucket{operation="oku",le="+Inf"} 3',
+        'test_seconds_sum{operation="oku"} 3.55',
+        'test_seconds_count{operation="oku"} 3',
+        '# HELP test_total Tırnaklı \\"etiket\\".',
+        "# TYPE test_total counter",
+        'test_total{file="a\\"b"} 2',
+    ]
+
+
+def test_timed_records_sync_async_and_failing_calls():
+    @timed("test_sync")
+    def fail():
+        raise ValueError
+
+    @timed("test_async")
+    async def fetch():
+        return 42
+
+    before = OPERATION_SECONDS.count("test_sync"), OPERATION_SECONDS.count("test_async")
+    try:
+        fail()
+    except ValueError:
+        pass
+    assert asyncio.run(fetch()) == 42
+    assert (OPERATION_SECONDS.count("test_sync"), OPERATION_SECONDS.count("test_async")) == \
+        (before[0] + 1, before[1] + 1)
+
+
+def test_library_operations_are_timed(tmp_path):
+    before = {op: OPERATION_SECONDS.count(op) for op in ("load", "add_book", "borrow", "return", "commit")}
+    library = Library(name="Ölçüm", data_file=str(tmp_path / "library.json"), journal=True)
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+    library.register_member(Member(name="Ayşe", member_id=1))
+    library.borrow_book(member_id=1, book_isbn="9780441013593")
+    library.return_book(member_id=1, book_isbn="9780441013593")
+
+    after = {op: OPERATION_SECONDS.count(op) for op in before}
+    assert after == {"load": before["load"] + 1, "add_book": before["add_book"] + 1,
+                     "borrow": before["borrow"] + 1, "return": before["return"] + 1,
+                     "commit": before["commit"] + 4}
+
+
+def test_slow_library_calls_are_logged_with_phases(tmp_path, caplog):
+    library = Library(name="Ölçüm", data_file=str(tmp_path / "library.json"))
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+    slowlog.configure(0)
+    try:
+        with caplog.at_level(logging.WARNING, logger="kutuphane_yonetim.slow"):
+            library.register_member(Member(name="Ayşe", member_id=1))
+    finally:
+        slowlog.configure(None)
+
+    [record] = [record.slow_operation for record in caplog.records]
+    assert (record["kind"], record["name"]) == ("library", "register_member")
+    assert [(phase["phase"], phase["depth"]) for phase in record["phases"]] == \
+        [("register_member", 0), ("commit", 1), ("save", 2)]
+    assert json.loads(caplog.records[0].getMessage()) == record
+
+    # Eşik kapalıyken hiçbir şey kaydedilmez.
+    caplog.clear()
+    library.borrow_book(member_id=1, book_isbn="9780441013593")
+    assert not [record for record in caplog.records if record.name == "kutuphane_yonetim.slow"]
@@ -1,4 +1,5 @@
 import pytest
+import dataclasses
 from kutuphane_yonetim.core.models import Book, Member, BookStatus
 
 #Book Testleri
@@ -56,4 +57,21 @@ def test_member_creation():
     
     assert member.name == "Ali Veli"
     assert member.member_id == 101
-    assert member.borrowed_books == []
\ No newline at end of file
+    assert member.borrowed_books == []
+
+
+def test_borrowed_books_behaves_like_a_list():
+    dune = Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965)
+    orwell = Book(title="1984", author="George Orwell", isbn="9780451524935", publication_year=1949)
+    member = Member(name="Ayşe", member_id=1, borrowed_books=[dune])
+    member.borrowed_books.append(orwell)
+
+    assert member.borrowed_books == [dune, orwell]
+    assert member.borrowed_books.get(orwell.isbn) is orwell and len(member.borrowed_books) == 2
+    with pytest.raises(TypeError):
+        member.borrowed_books[0]
+    member.borrowed_books.remove(dune)
+    assert dune not in member.borrowed_books
+    with pytest.raises(ValueError):
+        member.borrowed_books.remove(dune)
+    assert dataclasses.asdict(member)["borrowed_books"] == [orwell]
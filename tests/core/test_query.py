@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import AudioBook, Book, BookStatus, EBook, Member
+
+AUTHORS = ["Orhan Pamuk", "Ursula K. Le Guin", "İhsan Oktay Anar", "Sabahattin Ali"]
+FILTERS = [
+    {"author": "ursula k. le guin"},
+    {"status": BookStatus.AVAILABLE, "book_type": "audiobook", "year_from": 1950, "year_to": 1980},
+    {"status": BookStatus.BORROWED},
+    {"author": "İHSAN OKTAY ANAR", "year_from": 1990},
+    {"year_to": 1949},
+    {"book_type": "ebook", "status": BookStatus.LOST},
+]
+
+
+def make_book(rng: random.Random, i: int):
+    fields = dict(title=f"Kitap {i}", author=rng.choice(AUTHORS), isbn=f"978{i:010d}",
+                  publication_year=rng.randint(1940, 2000))
+    kind = rng.randrange(3)
+    if kind == 1:
+        return EBook(file_format="PDF", **fields)
+    if kind == 2:
+        return AudioBook(duration_in_minutes=90, **fields)
+    return Book(**fields)
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["dict", "compact"])
+def test_query_matches_full_scan_across_status_changes(tmp_path, compact):
+    """query() sonuçlarının her planda ISBN sırasıyla taramayla aynı olduğunu test eder."""
+    rng = random.Random(3)
+    library = Library(name="Sorgu", data_file=str(tmp_path / "query.json"), journal=True,
+                      compact=compact)
+    for i in range(300):
+        library.add_book(make_book(rng, i))
+    for member_id in range(1, 6):
+        library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+
+    def check():
+        for filters in FILTERS:
+            expected = list(library.iter_books(**filters))
+            assert [b.isbn for b in library.query(**filters)] == [b.isbn for b in expected]
+            assert [b.isbn for b in library.query(limit=7, after=expected[0].isbn if expected else None,
+                                                  **filters)] == [b.isbn for b in expected[1:8]]
+
+    check()
+    isbns = list(library._books)
+    for isbn in rng.sample(isbns, 120):
+        library.borrow_book(member_id=rng.randint(1, 5), book_isbn=isbn)
+    for isbn in rng.sample(list(library._borrowers), 40):
+        library.return_book(member_id=library._borrowers[isbn], book_isbn=isbn)
+    for isbn in rng.sample([isbn for isbn in isbns if isbn not in library._borrowers], 30):
+        library.delete_book(isbn)
+    check()
+
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            isbn = next(isbn for isbn in library._books if isbn not in library._borrowers)
+            library.borrow_book(member_id=1, book_isbn=isbn)
+            raise RuntimeError("vazgeçildi")
+    check()
+
+
+def test_planner_starts_from_most_selective_index(tmp_path):
+    library = Library(name="Plan", data_file=str(tmp_path / "plan.json"), journal=True)
+    for i in range(200):
+        author = "Sabahattin Ali" if i < 5 else "Orhan Pamuk"
+        library.add_book(Book(title=f"Kitap {i}", author=author, isbn=f"978{i:010d}", publication_year=1900 + i % 50))
+
+    plan = library.explain(author="SABAHATTİN ALİ", status=BookStatus.AVAILABLE, year_from=1900, year_to=1930)
+    assert (plan.index, plan.estimate) == ("author", 5)
+    assert plan.filters == ["publication_year", "status"]
+    assert library.explain(year_from=1949).index == "publication_year"
+    assert library.explain(book_type="ebook").index == "empty"
+    # Neredeyse her kitap eşleşiyorsa ilk sayfa için sıralı tarama daha ucuzdur.
+    assert library.explain(limit=10, status=BookStatus.AVAILABLE).index == "scan"
+    assert library.explain(status=BookStatus.AVAILABLE).index == "scan"
+
+    library.register_member(Member(name="Okur", member_id=1))
+    library.borrow_book(member_id=1, book_isbn=f"978{3:010d}")
+    assert [b.isbn for b in library.query(status=BookStatus.BORROWED)] == [f"978{3:010d}"]
+    plan = library.explain(status=BookStatus.BORROWED)
+    assert (plan.index, plan.estimate) == ("status", 1)
+    assert len(library.query(author="Sabahattin Ali", status=BookStatus.AVAILABLE)) == 4
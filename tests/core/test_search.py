@@ -0,0 +1,98 @@
+import time
+
+import pytest
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book
+from kutuphane_yonetim.core.search import SearchIndex, fold
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(name="Arama Kütüphanesi", data_file=str(tmp_path / "library.json"))
+    library.add_book(Book(title="İstanbul Hatırası", author="Ahmet Ümit", isbn="9789750000001", publication_year=2010))
+    library.add_book(Book(title="Şişli'de Bir Gece", author="Ayşe Kulin", isbn="9789750000002", publication_year=2005))
+    library.add_book(Book(title="Kırmızı Saçlı Kadın", author="Orhan Pamuk", isbn="9789750000003", publication_year=2016))
+    library.add_book(Book(title="Istanbul: Memories and the City", author="Orhan Pamuk", isbn="9789750000004", publication_year=2003))
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+    return library
+
+
+def isbns(books):
+    return [book.isbn for book in books]
+
+
+def test_fold_follows_turkish_casing():
+    assert fold("İSTANBUL") == fold("istanbul") == "istanbul"
+    assert fold("ŞİŞLİ") == "şişli"
+    assert fold("KIRMIZI") == fold("kırmızı")
+
+
+def test_search_is_case_and_dotted_i_insensitive(library):
+    assert set(isbns(library.search("istanbul"))) == {"9789750000001", "9789750000004"}
+    assert isbns(library.search("ŞİŞLİ")) == ["9789750000002"]
+    assert isbns(library.search("KIRMIZI")) == ["9789750000003"]
+
+
+def test_multi_term_queries_are_and_with_prefixes(library):
+    assert isbns(library.search("orhan ist")) == ["9789750000004"]
+    assert isbns(library.search("pam kır")) == ["9789750000003"]
+    assert library.search("orhan dune") == []
+    assert library.search("   ") == []
+
+
+def test_title_matches_rank_above_author_matches(tmp_path):
+    library = Library(name="Sıralama", data_file=str(tmp_path / "library.json"))
+    library.add_book(Book(title="Başka Bir Kitap", author="Herbert Kaya", isbn="9789750000010", publication_year=2000))
+    library.add_book(Book(title="Herbert'in Günlüğü", author="Can Yücel", isbn="9789750000011", publication_year=2000))
+    library.add_book(Book(title="Herbertçiler", author="Can Yücel", isbn="9789750000012", publication_year=2000))
+
+    # Başlıkta tam eşleşme > başlıkta önek eşleşmesi > yazarda tam eşleşme
+    assert isbns(library.search("herbert")) == ["9789750000011", "9789750000012", "9789750000010"]
+    assert len(library.search("herbert", limit=1)) == 1
+
+
+def test_index_is_updated_on_add_and_delete(library, tmp_path):
+    assert library.search("neuromancer") == []
+    library.add_book(Book(title="Neuromancer", author="William Gibson", isbn="9780441569595", publication_year=1984))
+    assert isbns(library.search("neuro")) == ["9780441569595"]
+
+    library.delete_book("9780441569595")
+    assert library.search("neuromancer") == []
+    assert library.search("gibson") == []
+
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            library.add_book(Book(title="Solaris", author="Stanisław Lem", isbn="9780156027601", publication_year=1961))
+            raise RuntimeError("iptal")
+    assert library.search("solaris") == []
+
+    reloaded = Library(name="Yeniden", data_file=str(tmp_path / "library.json"))
+    assert isbns(reloaded.search("dune")) == ["9780441013593"]
+
+
+def test_search_index_vocabulary_shrinks_on_remove():
+    index = SearchIndex()
+    index.add("1", "Tek Kelime", "Yazar")
+    index.add("1", "Başka Başlık", "Yazar")
+    assert index.search("kelime") == []
+    index.remove("1")
+    assert len(index) == 0
+    assert len(index._vocabulary) == 0 and index._postings == {}
+
+
+def test_search_stays_fast_on_large_index():
+    """Büyük bir indekste seçici sorguların hızlı kaldığını test eder."""
+    index = SearchIndex()
+    for i in range(100_000):
+        index.add(f"{i:013d}", f"Kitap {i} Cilt {i % 50}", f"Yazar{i % 1000} Soyad{i % 97}")
+
+    queries = ["yazar123 soyad5", "kitap 4242", "yazar999"]
+    for query in queries:
+        assert index.search(query)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for query in queries:
+            index.search(query)
+    per_query = (time.perf_counter() - start) / (20 * len(queries))
+    assert per_query < 0.005
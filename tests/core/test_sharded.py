@@ -0,0 +1,160 @@
+import os
+
+import pytest
+
+from kutuphane_yonetim.admin import reshard
+from kutuphane_yonetim.core import sharded
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import AudioBook, Book, BookStatus, EBook, Member
+from kutuphane_yonetim.core.sharded import ShardedStorage, member_shard_of, shard_name, shard_of
+from kutuphane_yonetim.core.storage import JSONStorage, book_type_of
+
+
+def fill(library, books=40):
+    for i in range(books):
+        isbn = f"978{i:010d}"
+        if i % 3 == 1:
+            library.add_book(EBook(title=f"E-Kitap {i}", author="Yazar", isbn=isbn, publication_year=2000,
+                                   file_format="EPUB"))
+        elif i % 3 == 2:
+            library.add_book(AudioBook(title=f"Sesli {i}", author="Yazar", isbn=isbn, publication_year=2001,
+                                       duration_in_minutes=i))
+        else:
+            library.add_book(Book(title=f"Kitap {i}", author="Yazar", isbn=isbn, publication_year=1999))
+    library.register_member(Member(name="Ayşe", member_id=1))
+    library.register_member(Member(name="Ali", member_id=2))
+    library.borrow_book(member_id=1, book_isbn="9780000000004")
+    library.borrow_book(member_id=2, book_isbn="9780000000005")
+    library.borrow_book(member_id=1, book_isbn="9780000000001")
+    library.return_book(member_id=2, book_isbn="9780000000005")
+    library.delete_book("9780000000007")
+
+
+def state(library):
+    books = sorted((book.isbn, book.title, book.status, book_type_of(book)) for book in library._books.values())
+    members = {member.member_id: [book.isbn for book in member.borrowed_books] for member in library._members.values()}
+    return books, members, library._versions.to_dict()
+
+
+@pytest.mark.parametrize("journal", [False, True], ids=["direct", "journal"])
+@pytest.mark.parametrize("compact", [False, True], ids=["dict", "compact"])
+def test_sharded_round_trip(tmp_path, journal, compact):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=4, journal=journal, snapshot_every=10))
+    fill(library)
+    library.close()
+
+    reloaded = Library(name="Parçalı", storage=ShardedStorage(path, journal=journal), compact=compact)
+    assert state(reloaded) == state(library)
+    assert reloaded.find_book(isbn="9780000000004").status == BookStatus.BORROWED
+    assert reloaded.find_book(isbn="9780000000007") is None
+    assert reloaded.storage.shards == 4
+
+
+def test_save_rewrites_only_changed_shards(tmp_path):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=8))
+    fill(library)
+    before = set(os.listdir(path))
+
+    library.borrow_book(member_id=2, book_isbn="9780000000010")
+    after = set(os.listdir(path))
+    changed = {name.split(".")[0] for name in after - before if name != "manifest.json"}
+    # Yalnızca kitabın ve üyenin parçaları; tüm ödünçleri tutan bir dosya yoktur.
+    assert changed == {shard_name(shard_of("9780000000010", 8)), shard_name(member_shard_of(2, 8))}
+    # Eski dosyalar manifest değiştikten sonra silinir.
+    assert len(after) == len(before) == 8 + 2
+
+
+def test_parallel_load_matches_serial(tmp_path, monkeypatch):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=4))
+    fill(library, books=200)
+
+    monkeypatch.setattr(sharded, "PARALLEL_MIN_BYTES", 0)
+    parallel = Library(name="Paralel", storage=ShardedStorage(path, workers=2), compact=True)
+    assert state(parallel) == state(library)
+
+
+def test_journal_records_reach_shards_before_reset(tmp_path):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=4, journal=True, snapshot_every=1000))
+    fill(library)
+    library.storage.close()
+
+    # Günlükten yeniden uygulanan değişiklikler sonraki tam yazmada parçalara yazılır.
+    replayed = Library(name="Parçalı", storage=ShardedStorage(path, journal=True))
+    replayed.compact()
+    replayed.close()
+    assert os.path.getsize(os.path.join(path, "journal")) == 0
+    assert state(Library(name="Parçalı", storage=ShardedStorage(path))) == state(library)
+
+
+def test_reshard_from_json_and_in_place(tmp_path):
+    json_file = str(tmp_path / "library.json")
+    source = Library(name="JSON", storage=JSONStorage(json_file, journal=True))
+    fill(source)
+    source.close()
+
+    path = str(tmp_path / "shards")
+    reshard(json_file, path, shards=3)
+    assert state(Library(name="Parçalı", storage=ShardedStorage(path))) == state(source)
+    with pytest.raises(ValueError, match="zaten parçalı veri"):
+        reshard(json_file, path, shards=3)
+
+    reshard(path, path, shards=5)
+    reloaded = Library(name="Parçalı", storage=ShardedStorage(path))
+    assert reloaded.storage.shards == 5
+    assert state(reloaded) == state(source)
+    assert len([name for name in os.listdir(path) if name.startswith("books-")]) == 5
+
+
+def test_corrupt_shard_stops_loading(tmp_path):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=2))
+    fill(library)
+    shard_file = next(name for name in os.listdir(path) if name.startswith("books-001"))
+    with open(os.path.join(path, shard_file), "w", encoding="utf-8") as f:
+        f.write('{"books": [{"title": "Eksik"}]}')
+
+    with pytest.raises(ValueError, match="Parça dosyası okunamadı"):
+        Library(name="Parçalı", storage=ShardedStorage(path))
+
+
+def test_shard_years_use_wide_column_and_overflow_is_reported(tmp_path):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=2))
+    library.add_book(Book(title="Uzak Gelecek", author="Yazar", isbn="9780000070000", publication_year=70000))
+    reloaded = Library(name="Parçalı", storage=ShardedStorage(path), compact=True)
+    assert reloaded.find_book(isbn="9780000070000").publication_year == 70000
+
+    library.add_book(Book(title="Taşan", author="Yazar", isbn="9780000000099", publication_year=2 ** 40))
+    with pytest.raises(ValueError, match="Parça dosyası okunamadı"):
+        Library(name="Parçalı", storage=ShardedStorage(path))
+
+
+def test_format_1_loans_file_is_read_and_moved_into_shards(tmp_path):
+    path = str(tmp_path / "shards")
+    library = Library(name="Parçalı", storage=ShardedStorage(path, shards=4))
+    fill(library)
+
+    # 1. biçim: ödünçler ve üye sürümleri tek bir loans dosyasında.
+    files = library.storage._files
+    shard_data = [sharded._read_json(os.path.join(path, files[shard_name(index)])) for index in range(4)]
+    loans = {"loans": [[member.member_id, book.isbn]
+                       for member in library._members.values() for book in member.borrowed_books],
+             "member_versions": {}}
+    for index, data in enumerate(shard_data):
+        loans["member_versions"].update(data.pop("member_versions"))
+        data.pop("loans")
+        sharded._write_json(os.path.join(path, files[shard_name(index)]), data)
+    sharded._write_json(os.path.join(path, "loans.1.json"), loans)
+    manifest = sharded._read_json(os.path.join(path, "manifest.json"))
+    manifest["format"], manifest["files"]["loans"] = 1, "loans.1.json"
+    sharded._write_json(os.path.join(path, "manifest.json"), manifest)
+
+    old = Library(name="Parçalı", storage=ShardedStorage(path))
+    assert state(old) == state(library)
+    old.compact()
+    assert not [name for name in os.listdir(path) if name.startswith("loans")]
+    assert state(Library(name="Parçalı", storage=ShardedStorage(path))) == state(library)
@@ -0,0 +1,137 @@
+import multiprocessing
+import random
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, BookStatus, Member
+from kutuphane_yonetim.core.storage import JSONStorage
+
+DUNE = "9780441013593"
+ORWELL = "9780451524935"
+PROCESSES = 4
+BOOKS = 6
+
+
+def open_worker(path, snapshot_every=1000):
+    storage = JSONStorage(str(path), journal=True, snapshot_every=snapshot_every, shared=True)
+    return Library(name="İşçi", storage=storage)
+
+
+def fill(library):
+    with library.batch():
+        library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+        library.add_book(Book(title="1984", author="George Orwell", isbn=ORWELL, publication_year=1949))
+        library.register_member(Member(name="Ayşe", member_id=1))
+        library.register_member(Member(name="Can", member_id=2))
+
+
+def test_worker_applies_only_new_records(tmp_path):
+    path = tmp_path / "library.json"
+    first, second = open_worker(path), open_worker(path)
+    fill(first)
+
+    assert second.reload_if_changed()
+    assert second.total_books == 2 and second.version == first.version
+    dune = second.find_book(isbn=DUNE)
+
+    first.borrow_book(member_id=1, book_isbn=DUNE)
+    assert second.reload_if_changed()
+    # Artımlı güncelleme: mevcut nesneler korunur, yalnızca yeni kayıt uygulanır.
+    assert second.find_book(isbn=DUNE) is dune
+    assert dune.status == BookStatus.BORROWED
+    assert second.current_borrower(DUNE).member_id == 1
+    assert not second.reload_if_changed()
+
+
+def test_conflicting_borrow_across_workers_is_rejected(tmp_path):
+    path = tmp_path / "library.json"
+    first, second = open_worker(path), open_worker(path)
+    fill(first)
+    second.reload_if_changed()
+
+    first.borrow_book(member_id=1, book_isbn=DUNE)
+    # İkinci işçi eski durumu görse de yazmadan önce güncellenir.
+    with pytest.raises(ValueError, match="ödünç alınamaz"):
+        second.borrow_book(member_id=2, book_isbn=DUNE)
+    with pytest.raises(ValueError, match="ödünç almamış"):
+        second.return_book(member_id=2, book_isbn=DUNE)
+
+    second.return_book(member_id=1, book_isbn=DUNE)
+    second.borrow_book(member_id=2, book_isbn=DUNE)
+    first.reload_if_changed()
+    assert first.current_borrower(DUNE).member_id == 2
+    assert first.version == second.version
+
+
+def test_snapshot_by_another_worker_triggers_full_reload(tmp_path):
+    path = tmp_path / "library.json"
+    first, second = open_worker(path, snapshot_every=3), open_worker(path, snapshot_every=3)
+    fill(first)
+    first.borrow_book(member_id=1, book_isbn=ORWELL)
+    second.delete_book(DUNE)
+    second.compact()
+
+    first.register_member(Member(name="Deniz", member_id=3))
+    assert first.find_book(isbn=DUNE) is None
+    second.reload_if_changed()
+    assert sorted(second._members) == [1, 2, 3]
+    assert second.current_borrower(ORWELL).member_id == 1
+
+
+def _loan_worker(path, seed, results):
+    library = open_worker(path, snapshot_every=40)
+    rng = random.Random(seed)
+    lent, versions = {}, []
+    for _ in range(60):
+        isbn, member_id = f"978000000{rng.randrange(BOOKS):04d}", rng.randint(1, 3)
+        try:
+            if rng.random() < 0.5:
+                library.borrow_book(member_id=member_id, book_isbn=isbn)
+                lent[isbn] = lent.get(isbn, 0) + 1
+            else:
+                library.return_book(member_id=member_id, book_isbn=isbn)
+                lent[isbn] = lent.get(isbn, 0) - 1
+            versions.append(library.version)
+        except ValueError:
+            pass
+    library.close()
+    results.put((lent, versions))
+
+
+def test_concurrent_workers_keep_loans_consistent(tmp_path):
+    path = tmp_path / "library.json"
+    library = open_worker(path)
+    with library.batch():
+        for i in range(BOOKS):
+            library.add_book(Book(title=f"Kitap {i}", author="Yazar", isbn=f"978000000{i:04d}",
+                                  publication_year=2000))
+        for member_id in (1, 2, 3):
+            library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+    library.close()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_loan_worker, args=(str(path), seed, results))
+               for seed in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    totals, all_versions = {}, []
+    for lent, versions in outcomes:
+        for isbn, delta in lent.items():
+            totals[isbn] = totals.get(isbn, 0) + delta
+        # Her işçinin gördüğü nesil numarası artar ve hiçbir sürüm iki kez verilmez.
+        assert versions == sorted(set(versions))
+        all_versions.extend(versions)
+    assert len(all_versions) == len(set(all_versions))
+
+    reloaded = open_worker(path)
+    assert all(count in (0, 1) for count in totals.values())
+    assert {isbn for isbn, count in totals.items() if count} == set(reloaded._borrowers)
+    for isbn, book in reloaded._books.items():
+        assert (book.status == BookStatus.BORROWED) == (isbn in reloaded._borrowers)
+    assert reloaded.version == max(all_versions)
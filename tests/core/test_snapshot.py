@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import AudioBook, Book, BookStatus, EBook, Member
+from kutuphane_yonetim.core.snapshot import BookColumns, read_snapshot, write_snapshot
+from kutuphane_yonetim.core.storage import JSONStorage
+
+DUNE = "9780441013593"
+NEUROMANCER = "9780441569595"
+ORWELL = "9780451524935"
+
+
+def fill(library):
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965))
+    library.add_book(EBook(title="Neuromancer", author="William Gibson", isbn=NEUROMANCER,
+                           publication_year=1984, file_format="EPUB"))
+    library.add_book(AudioBook(title="1984", author="George Orwell", isbn=ORWELL,
+                               publication_year=1949, duration_in_minutes=660))
+    library.register_member(Member(name="Ayşe", member_id=101))
+    library.borrow_book(member_id=101, book_isbn=NEUROMANCER)
+
+
+def open_library(path, compact=False, journal=False):
+    return Library(name="Anlık Görüntü", storage=JSONStorage(str(path), journal=journal), compact=compact)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_library_reloads_from_snapshot(tmp_path, caplog, compact):
+    caplog.set_level(logging.INFO)
+    path = tmp_path / "library.json"
+    fill(open_library(path))
+    assert os.path.exists(str(path) + ".snap")
+    caplog.clear()
+
+    library = open_library(path, compact=compact)
+    assert "ikili anlık görüntüden" in caplog.text
+    assert list(library._books) == [DUNE, NEUROMANCER, ORWELL]
+    ebook = library.find_book(isbn=NEUROMANCER)
+    assert ebook.status == BookStatus.BORROWED and ebook.file_format == "EPUB"
+    assert library.find_book(isbn=ORWELL).duration_in_minutes == 660
+    member = library.find_member(101)
+    assert [book.isbn for book in member.borrowed_books] == [NEUROMANCER]
+    assert member.borrowed_books.get(NEUROMANCER).status == BookStatus.BORROWED
+
+    # Sürümler ve türetilmiş indeksler de korunur.
+    assert library.version == 5
+    assert [isbn for isbn, _ in library._versions.items("book", 3)] == [NEUROMANCER]
+    assert [book.isbn for book in library.search("herbert")] == [DUNE]
+
+    library.return_book(member_id=101, book_isbn=NEUROMANCER)
+    assert library.version == 6
+    assert open_library(path, compact=compact).find_book(isbn=NEUROMANCER).status == BookStatus.AVAILABLE
+
+
+def test_externally_edited_json_makes_snapshot_stale(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    path = tmp_path / "library.json"
+    fill(open_library(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["books"] = data["books"][:1]
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    caplog.clear()
+
+    library = open_library(path)
+    assert "ikili anlık görüntüden" not in caplog.text
+    assert list(library._books) == [DUNE]
+    # Bayat kopya JSON'dan yeniden yazıldı.
+    assert open_library(path).total_books == 1
+    assert "ikili anlık görüntüden" in caplog.text
+
+
+def test_corrupt_snapshot_falls_back_to_json(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    path = tmp_path / "library.json"
+    fill(open_library(path))
+    snap = str(path) + ".snap"
+    with open(snap, "r+b") as f:
+        f.seek(-5, os.SEEK_END)
+        f.write(b"\x00\xff\x00\xff\x00")
+    caplog.clear()
+
+    library = open_library(path)
+    assert "ikili anlık görüntüden" not in caplog.text
+    assert library.total_books == 3
+
+    with open(snap, "wb") as f:
+        f.write(b"kesik")
+    assert read_snapshot(snap, (0, 0)) is None
+    assert open_library(path).total_books == 3
+
+
+def test_journal_is_replayed_on_top_of_snapshot(tmp_path):
+    path = tmp_path / "library.json"
+    library = open_library(path, journal=True)
+    fill(library)
+    library.compact()
+    library.return_book(member_id=101, book_isbn=NEUROMANCER)
+    library.delete_book(DUNE)
+
+    reloaded = open_library(path, compact=True, journal=True)
+    assert sorted(reloaded._books) == [NEUROMANCER, ORWELL]
+    assert reloaded.find_book(isbn=NEUROMANCER).status == BookStatus.AVAILABLE
+    assert reloaded.version == library.version
+    assert [isbn for isbn, _ in reloaded._versions.items("deleted_book", 0)] == [DUNE]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_large_publication_year_survives_snapshot(tmp_path, caplog, compact):
+    caplog.set_level(logging.INFO)
+    path = tmp_path / "library.json"
+    library = open_library(path, compact=compact, journal=True)
+    library.add_book(Book(title="Uzak Gelecek", author="Yazar", isbn=DUNE, publication_year=70000))
+    library.compact()
+    caplog.clear()
+
+    reloaded = open_library(path, compact=compact, journal=True)
+    assert "ikili anlık görüntüden" in caplog.text
+    assert reloaded.find_book(isbn=DUNE).publication_year == 70000
+
+
+def test_snapshot_failure_does_not_fail_the_save(tmp_path, caplog):
+    path = tmp_path / "library.json"
+    library = open_library(path, journal=True)
+    library.add_book(Book(title="Taşan", author="Yazar", isbn=DUNE, publication_year=2 ** 40))
+    library.compact()
+
+    # Yıl sütuna sığmaz; JSON yine de yazılır ve günlük sıfırlanır.
+    assert "İkili anlık görüntü yazılamadı" in caplog.text
+    assert not library.storage.dirty
+    assert os.path.getsize(str(path) + ".journal") == 0
+    library.close()
+    assert open_library(path, journal=True).find_book(isbn=DUNE).publication_year == 2 ** 40
+
+
+def test_write_and_read_columns(tmp_path):
+    path = str(tmp_path / "test.snap")
+    books = [Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965),
+             EBook(title="Neuromancer", author="William Gibson", isbn=NEUROMANCER,
+                   publication_year=1984, file_format="PDF")]
+    write_snapshot(path, books, [(7, "Can", [DUNE])], {"version": 3, "book": {DUNE: 2}}, 4, (1, 2))
+
+    assert read_snapshot(path, (1, 3)) is None
+    snapshot = read_snapshot(path, (1, 2))
+    assert isinstance(snapshot.books, BookColumns) and len(snapshot.books) == 2
+    assert list(snapshot.books) == books
+    assert snapshot.journal_seq == 4
+    member, isbns = snapshot.members[0]
+    assert (member.member_id, member.name, isbns) == (7, "Can", [DUNE])
+    isbn_column, versions = snapshot.versions["book"]
+    assert list(zip(isbn_column, versions)) == [(DUNE, 2), (NEUROMANCER, 0)]
+
+
+def test_columns_build_models_without_revalidating(tmp_path, monkeypatch):
+    path = str(tmp_path / "test.snap")
+    books = [Book(title="Dune", author="Frank Herbert", isbn=DUNE, publication_year=1965),
+             AudioBook(title="1984", author="George Orwell", isbn=ORWELL,
+                       publication_year=1949, duration_in_minutes=660)]
+    write_snapshot(path, books, [], {"version": 2}, 0, (1, 2))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("anlık görüntü satırları yeniden doğrulanmamalı")
+    for model in (Book, EBook, AudioBook):
+        monkeypatch.setattr(model, "model_validate", fail)
+    loaded = list(read_snapshot(path, (1, 2)).books)
+    monkeypatch.undo()
+
+    assert loaded == books and [type(book) for book in loaded] == [Book, AudioBook]
+    assert loaded[1].model_dump() == books[1].model_dump()
+    assert loaded[0].model_fields_set == books[0].model_fields_set | {"status"}
+    loaded[0].borrow_book()
+    assert loaded[0].status == BookStatus.BORROWED and books[0].status == BookStatus.AVAILABLE
@@ -0,0 +1,40 @@
+import random
+
+from kutuphane_yonetim.core.sortedkeys import SortedKeys
+
+
+def test_sorted_keys_iterates_in_order_across_merges():
+    keys = SortedKeys()
+    values = random.Random(7).sample(range(100_000), 5_000)
+    for value in values:
+        keys.add(value)
+    keys.add(values[0])
+    for value in values[::3]:
+        keys.discard(value)
+
+    expected = sorted(set(values) - set(values[::3]))
+    assert list(keys) == expected
+    assert len(keys) == len(expected)
+    assert list(keys.irange(after=expected[100]))[:2] == expected[101:103]
+    assert values[0] not in keys and expected[0] in keys
+
+
+def test_sorted_keys_iteration_survives_changes_and_merges():
+    keys = SortedKeys(range(0, 4000, 2))
+    seen = []
+    for key in keys:
+        seen.append(key)
+        if key == 100:
+            keys.discard(0)
+            keys.discard(102)
+            # Yeni anahtarlar birleştirmeyi tetikler; önceki olanlar tekrar dönmemeli.
+            for odd in range(1, 4000, 2):
+                keys.add(odd)
+    assert seen == list(range(0, 101, 2)) + [101] + list(range(103, 4000))
+
+
+def test_sorted_keys_prefix_lookup():
+    keys = SortedKeys(["kitap", "kitaplık", "kira", "defter"])
+    keys.add("kitabe")
+    assert sorted(keys.prefixed("kita")) == ["kitabe", "kitap", "kitaplık"]
+    assert keys.prefixed("z") == []
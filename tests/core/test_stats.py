@@ -0,0 +1,100 @@
+import random
+from collections import Counter
+
+import pytest
+
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import AudioBook, Book, BookStatus, EBook, Member
+from kutuphane_yonetim.core.stats import RankedCounter
+from kutuphane_yonetim.core.storage import book_type_of
+
+AUTHORS = ["Frank Herbert", "George Orwell", "Ursula K. Le Guin", "William Gibson", "Yaşar Kemal"]
+
+
+def make_book(rng: random.Random, i: int):
+    fields = dict(title=f"Kitap {i}", author=rng.choice(AUTHORS), isbn=f"{i:013d}",
+                  publication_year=rng.randint(1950, 1955))
+    kind = rng.randrange(3)
+    if kind == 1:
+        return EBook(file_format="EPUB", **fields)
+    if kind == 2:
+        return AudioBook(duration_in_minutes=60, **fields)
+    return Book(**fields)
+
+
+def recount(library: Library, top: int) -> dict:
+    """stats() çıktısını kitap ve üyelerin tamamını dolaşarak yeniden hesaplar."""
+    books = list(library._books.values())
+    members = list(library._members.values())
+    authors = Counter(book.author for book in books)
+    loans = {member.member_id: len(member.borrowed_books) for member in members if member.borrowed_books}
+    return {
+        "total_books": len(books),
+        "by_status": {status.value: sum(book.status == status for book in books) for status in BookStatus},
+        "by_type": {book_type: sum(book_type_of(book) == book_type for book in books)
+                    for book_type in ("book", "ebook", "audiobook")},
+        "by_year": dict(sorted(Counter(book.publication_year for book in books).items())),
+        "top_authors": [{"author": author, "books": count}
+                        for author, count in sorted(authors.items(), key=lambda item: (-item[1], item[0]))[:top]],
+        "total_members": len(members),
+        "active_loans": sum(loans.values()),
+        "members_with_loans": len(loans),
+        "loan_histogram": dict(sorted(Counter([0] * (len(members) - len(loans)) + list(loans.values())).items())),
+        "top_borrowers": [{"member_id": member_id, "loans": count}
+                          for member_id, count in sorted(loans.items(), key=lambda item: (-item[1], item[0]))[:top]],
+    }
+
+
+def test_ranked_counter_top_and_histogram():
+    counter = RankedCounter()
+    for key in "abracadabra":
+        counter.add(key)
+    counter.add("r", -2)
+    assert counter.top(3) == [("a", 5), ("b", 2), ("c", 1)]
+    assert counter.get("r") == 0 and len(counter) == 4
+    assert counter.histogram() == {5: 1, 2: 1, 1: 2}
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["dict", "compact"])
+def test_stats_match_full_recount_after_random_operations(tmp_path, compact):
+    rng = random.Random(7)
+    data_file = str(tmp_path / "stats.json")
+    library = Library(name="İstatistik", data_file=data_file, journal=True, compact=compact)
+    for i in range(40):
+        library.add_book(make_book(rng, i))
+    for member_id in range(1, 9):
+        library.register_member(Member(name=f"Üye {member_id}", member_id=member_id))
+    assert library.stats(top=3) == recount(library, top=3)
+
+    next_isbn = 40
+    for _ in range(400):
+        isbns = list(library._books)
+        op = rng.random()
+        try:
+            if op < 0.4:
+                library.borrow_book(member_id=rng.randint(1, 8), book_isbn=rng.choice(isbns))
+            elif op < 0.7:
+                isbn = rng.choice(list(library._borrowers) or isbns)
+                library.return_book(member_id=library._borrowers.get(isbn, 1), book_isbn=isbn)
+            elif op < 0.85:
+                library.add_book(make_book(rng, next_isbn))
+                next_isbn += 1
+            else:
+                library.delete_book(isbn=rng.choice(isbns))
+        except ValueError:
+            pass
+    assert library.stats(top=3) == recount(library, top=3)
+
+    # Geri alınan batch() değişiklikleri sayaçlardan da geri alınır.
+    with pytest.raises(RuntimeError):
+        with library.batch():
+            library.add_book(make_book(rng, next_isbn))
+            library.borrow_book(member_id=1, book_isbn=f"{next_isbn:013d}")
+            raise RuntimeError("vazgeçildi")
+    expected = recount(library, top=5)
+    assert library.stats(top=5) == expected
+    assert expected["by_status"]["ödünç alınmış"] == expected["active_loans"] > 0
+
+    library.close()
+    reopened = Library(name="İstatistik", data_file=data_file, journal=True, compact=compact)
+    assert reopened.stats(top=5) == expected
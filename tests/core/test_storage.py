@@ -0,0 +1,88 @@
+import json
+import sqlite3
+
+import pytest
+
+from kutuphane_yonetim.admin import migrate_json_to_sqlite
+from kutuphane_yonetim.core.library import Library
+from kutuphane_yonetim.core.models import Book, EBook, AudioBook, Member, BookStatus
+from kutuphane_yonetim.core.storage import SQLiteStorage
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "library.db")
+
+
+def open_sqlite(db_file):
+    return Library(name="SQLite", storage=SQLiteStorage(db_file))
+
+
+def test_sqlite_round_trip(db_file):
+    library = open_sqlite(db_file)
+    library.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+    library.add_book(EBook(title="Neuromancer", author="William Gibson", isbn="9780441569595",
+                           publication_year=1984, file_format="EPUB"))
+    library.add_book(AudioBook(title="1984", author="George Orwell", isbn="9780451524935",
+                               publication_year=1949, duration_in_minutes=660))
+    library.register_member(Member(name="Ayşe", member_id=101))
+    library.borrow_book(member_id=101, book_isbn="9780441569595")
+    library.close()
+
+    reloaded = open_sqlite(db_file)
+    ebook = reloaded.find_book(isbn="9780441569595")
+    audiobook = reloaded.find_book(isbn="9780451524935")
+    assert reloaded.total_books == 3
+    assert isinstance(ebook, EBook) and ebook.file_format == "EPUB"
+    assert isinstance(audiobook, AudioBook) and audiobook.duration_in_minutes == 660
+    assert ebook.status == BookStatus.BORROWED
+    assert reloaded.find_member(101).borrowed_books == [ebook]
+
+    reloaded.return_book(member_id=101, book_isbn="9780441569595")
+    reloaded.delete_book("9780441013593")
+    reloaded.close()
+
+    final = open_sqlite(db_file)
+    assert final.total_books == 2
+    assert final.find_book(isbn="9780441569595").status == BookStatus.AVAILABLE
+    assert final.find_member(101).borrowed_books == []
+
+
+def test_sqlite_uses_wal_and_indexes(db_file):
+    open_sqlite(db_file).close()
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_books_author", "idx_books_status", "idx_loans_member"} <= indexes
+
+
+def test_sqlite_detects_external_changes(db_file):
+    library = open_sqlite(db_file)
+    assert library.reload_if_changed() is False
+
+    other = open_sqlite(db_file)
+    other.add_book(Book(title="Dune", author="Frank Herbert", isbn="9780441013593", publication_year=1965))
+
+    assert library.reload_if_changed() is True
+    assert library.find_book(isbn="9780441013593") is not None
+
+
+def test_migrate_json_to_sqlite(tmp_path, db_file):
+    json_file = tmp_path / "library.json"
+    sample_data = {
+        "books": [
+            {"title": "Dune", "author": "Frank Herbert", "publication_year": 1965, "isbn": "9780441013593",
+             "status": "ödünç alınmış", "book_type": "book"},
+            {"title": "Neuromancer", "author": "William Gibson", "publication_year": 1984, "isbn": "9780441569595",
+             "status": "mevcut", "book_type": "ebook", "file_format": "PDF"},
+        ],
+        "members": [{"name": "Ali", "member_id": 7, "borrowed_isbns": ["9780441013593"]}],
+    }
+    json_file.write_text(json.dumps(sample_data), encoding="utf-8")
+
+    migrate_json_to_sqlite(str(json_file), db_file)
+
+    library = open_sqlite(db_file)
+    assert library.total_books == 2
+    assert library.find_member(7).borrowed_books == [library.find_book(isbn="9780441013593")]
+    assert library.find_book(isbn="9780441569595").file_format == "PDF"